@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the cost of defining `model` classes, per class and per field,
+with and without computing their compiled plans, and the time to import
+booby.
+
+Run it from the repository root::
+
+    python -m benchmarks.definition --classes 500 --fields 20
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+
+from booby import base, fields, models
+
+# Field factories cycled through to build the benchmarked `models`.
+FIELDS = (
+    lambda: fields.StringField(required=True),
+    lambda: fields.IntegerField(min_value=1, max_value=100),
+    lambda: fields.FloatField(),
+    lambda: fields.BooleanField(default=False),
+    lambda: fields.EmailField(),
+    lambda: fields.StringField(choices=['admin', 'user']),
+    lambda: fields.DateTimeField(),
+    lambda: fields.ListField(fields.StringField),
+)
+
+
+def define(classes, fields_per_class, finalize=False):
+    """Defines `classes` model classes with `fields_per_class` fields each,
+    and returns them.
+
+    """
+
+    result = []
+    for index in xrange(classes):
+        attrs = dict(('field{}'.format(i), FIELDS[i % len(FIELDS)]())
+            for i in xrange(fields_per_class))
+
+        model = base.ModelMeta('Model{}'.format(index), (models.Model,), attrs)
+        if finalize:
+            base.finalize(model)
+        result.append(model)
+    return result
+
+
+def first_use(classes):
+    """Builds and serializes an instance of every given class, which
+    computes their deferred plans.
+
+    """
+
+    for model in classes:
+        model().to_plain()
+
+
+def import_time(repeat):
+    """Returns the best time to import booby in a new interpreter, minus
+    the interpreter startup time.
+
+    """
+
+    def best(code):
+        timings = []
+        for _ in xrange(repeat):
+            start = time.time()
+            subprocess.check_call([sys.executable, '-c', code])
+            timings.append(time.time() - start)
+        return min(timings)
+
+    return best('import booby') - best('pass')
+
+
+def _timed(function, *args, **kwargs):
+    start = time.time()
+    result = function(*args, **kwargs)
+    return time.time() - start, result
+
+
+def run(classes, fields_per_class, repeat):
+    total_fields = classes * fields_per_class
+
+    deferred, defined = _timed(define, classes, fields_per_class)
+    used, _ = _timed(first_use, defined)
+    finalized, _ = _timed(define, classes, fields_per_class, finalize=True)
+
+    print('classes: {}, fields per class: {}'.format(classes,
+        fields_per_class))
+    for name, seconds in (('define (deferred)', deferred),
+            ('first use', used),
+            ('define (finalized)', finalized)):
+        print('{:<20} {:>10.3f} ms {:>10.1f} us/class {:>8.2f} us/field'
+            .format(name, seconds * 1e3, seconds / classes * 1e6,
+                seconds / total_fields * 1e6))
+
+    print('{:<20} {:>10.3f} ms'.format('import booby',
+        import_time(repeat) * 1e3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--classes', type=int, default=500)
+    parser.add_argument('--fields', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.classes, args.fields, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
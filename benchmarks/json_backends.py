@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""Compares the registered json backends encoding and decoding the
+benchmark model shapes.
+
+Run it from the repository root::
+
+    python -m benchmarks.json_backends --records 1000
+"""
+
+import timeit
+import argparse
+
+from booby import serializers
+
+from benchmarks.shapes import SHAPES
+
+
+def run(records, repeat):
+    print('{:<10} {:<12} {:>12} {:>12} {:>12}'.format(
+        'shape', 'backend', 'to_json', 'to_json_b', 'from_json'))
+
+    for shape, model, plain in SHAPES:
+        objs = model.from_plain_many(plain(i) for i in range(records))
+
+        for name in serializers.available_backends():
+            model.json_backend = name
+            try:
+                docs = [obj.to_json_bytes() for obj in objs]
+
+                timings = [
+                    _best(lambda: [obj.to_json() for obj in objs], repeat),
+                    _best(lambda: [obj.to_json_bytes() for obj in objs],
+                        repeat),
+                    _best(lambda: [model.from_json(doc) for doc in docs],
+                        repeat)
+                ]
+            finally:
+                model.json_backend = None
+
+            print('{:<10} {:<12} {:>12} {:>12} {:>12}'.format(
+                shape, name, *[_rate(records, timing) for timing in timings]))
+
+
+def _best(function, repeat):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def _rate(records, seconds):
+    return '{:.0f}/s'.format(records / seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.records, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
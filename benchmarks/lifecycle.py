@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the throughput and the memory of the `model` lifecycle
+operations over the benchmark model shapes, and compares them against a
+stored baseline.
+
+Run it from the repository root::
+
+    python -m benchmarks.lifecycle --save benchmarks/baseline.json
+    python -m benchmarks.lifecycle --check benchmarks/baseline.json
+
+With ``--check`` the script exits with a non-zero status if any operation
+is slower, or allocates more memory, than the baseline beyond the given
+``--tolerance``. Throughputs are compared relative to a calibration loop
+timed alongside every operation, so a baseline stays useful when the
+machine load or the CPU frequency change.
+
+Memory is measured as the peak bytes allocated by every operation with
+`tracemalloc`, available from Python 3.4. Under Python 2 it's measured
+instead as the bytes of the new objects the operation returns, walking
+them with :func:`sys.getsizeof`. Results record how their memory was
+measured, and ``--check`` only compares memory measured the same way.
+The committed ``benchmarks/baseline.json`` was saved under Python 2.
+"""
+
+import gc
+import sys
+import json
+import timeit
+import argparse
+
+from benchmarks.shapes import SHAPES
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+DEFAULT_TOLERANCE = 0.3
+
+
+def _operations(model, records):
+    """Returns the benchmarked operations over the given plain `records`
+    of the `model` class, as `(name, function)` tuples.
+
+    """
+
+    objs = model.from_plain_many(records)
+    kwargs = [dict((name, getattr(obj, name)) for name in model._fields)
+        for obj in objs]
+    docs = [obj.to_json() for obj in objs]
+
+    def validate():
+        # Models cache their validation results, so they are discarded
+        # to time the validators again and not the cache.
+        for obj in objs:
+            obj.clear_validation()
+            obj.validate()
+
+    return (
+        ('construct', lambda: [model(**values) for values in kwargs]),
+        ('from_plain_dict',
+            lambda: [model.from_plain_dict(plain) for plain in records]),
+        ('from_json', lambda: [model.from_json(doc) for doc in docs]),
+        ('validate', validate),
+        ('to_plain', lambda: [obj.to_plain() for obj in objs]),
+        ('to_dict', lambda: [obj.to_dict() for obj in objs]),
+        ('to_json', lambda: [obj.to_json() for obj in objs]),
+    )
+
+
+def _calibration():
+    result = {}
+    for i in range(20000):
+        result[i & 0xff] = str(i)
+
+
+def _measure(function, repeat):
+    """Returns the best time of `function` and the median ratio of the
+    calibration loop time to the `function` time, timing `function`
+    `repeat` times between two calibration loops. Pairing every run
+    with the loops around it keeps the ratio stable when the machine
+    speed changes between runs.
+
+    """
+
+    timings, ratios = [], []
+    calibration = timeit.timeit(_calibration, number=1)
+    for _ in range(repeat):
+        seconds = timeit.timeit(function, number=1)
+        following = timeit.timeit(_calibration, number=1)
+        timings.append(seconds)
+        ratios.append((calibration + following) / 2 / seconds)
+        calibration = following
+    return min(timings), sorted(ratios)[len(ratios) // 2]
+
+
+def run(records, repeat):
+    """Returns the results of every operation over every shape, as a
+    `dict` of `{shape: {operation: {'rate': ..., 'relative': ...,
+    'peak': ..., 'memory': ...}}}`, where `rate` are records per second,
+    `relative` the records processed in the time of a calibration loop
+    and `peak` the bytes per record measured with `memory`, either
+    ``'tracemalloc'`` or ``'getsizeof'``.
+
+    """
+
+    results = {}
+    for shape, model, plain in SHAPES:
+        results[shape] = shape_results = {}
+        for name, function in _operations(model,
+                [plain(i) for i in range(records)]):
+            seconds, ratio = _measure(function, repeat)
+            shape_results[name] = {
+                'rate': records / seconds,
+                'relative': records * ratio,
+                'peak': _peak(function, records),
+                'memory': MEMORY
+            }
+    return results
+
+
+MEMORY = 'getsizeof' if tracemalloc is None else 'tracemalloc'
+
+
+def _peak(function, records):
+    if tracemalloc is None:
+        return _new_size(function) / float(records)
+
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / float(records)
+    finally:
+        tracemalloc.stop()
+
+
+def _new_size(function):
+    """Returns the bytes of the objects returned by `function` that weren't
+    reachable before calling it, like the built `models` and their new
+    values, but not the plain values they share with the records.
+
+    """
+
+    gc.collect()
+    reachable = {}
+    try:
+        _walk(gc.get_objects(), reachable)
+        return _walk([function()], reachable)
+    finally:
+        # It holds this frame, so it would be walked by the next call.
+        reachable.clear()
+
+
+def _walk(pending, seen):
+    """Returns the bytes of the objects reachable from `pending` that
+    aren't in `seen`, adding them. `seen` maps ids to the objects, so
+    they stay alive and their ids aren't reused.
+
+    """
+
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen[id(obj)] = obj
+        total += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return total
+
+
+def regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Returns a `list` of messages describing the operations in `results`
+    slower, or with a higher peak memory, than in `baseline` beyond the
+    given `tolerance` ratio. Throughputs are compared by their `relative`
+    rates.
+
+    """
+
+    found = []
+    for shape, operations in sorted(results.items()):
+        for name, result in sorted(operations.items()):
+            expected = baseline.get(shape, {}).get(name)
+            if expected is None:
+                continue
+
+            if result['relative'] < expected['relative'] * (1 - tolerance):
+                found.append('{} {}: {:.2f}, baseline {:.2f} records per '
+                    'calibration loop'.format(shape, name,
+                        result['relative'], expected['relative']))
+
+            if (result['memory'] == expected.get('memory') and
+                    result['peak'] > expected['peak'] * (1 + tolerance)):
+                found.append('{} {}: {:.0f} B/record, baseline {:.0f} '
+                    'B/record'.format(shape, name, result['peak'],
+                        expected['peak']))
+    return found
+
+
+def report(results):
+    print('{:<10} {:<16} {:>12} {:>14}'.format(
+        'shape', 'operation', 'rate', 'peak'))
+
+    for shape, _, _ in SHAPES:
+        for name, result in sorted(results[shape].items()):
+            print('{:<10} {:<16} {:>10.0f}/s {:>8.0f} B/rec'.format(shape,
+                name, result['rate'], result['peak']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', metavar='PATH',
+        help='write the results as the baseline at PATH')
+    parser.add_argument('--check', metavar='PATH',
+        help='fail on regressions against the baseline at PATH')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    results = run(args.records, args.repeat)
+    report(results)
+
+    if args.save:
+        with open(args.save, 'w') as fileobj:
+            json.dump(results, fileobj, indent=2, sort_keys=True,
+                separators=(',', ': '))
+            fileobj.write('\n')
+
+    if args.check:
+        with open(args.check) as fileobj:
+            baseline = json.load(fileobj)
+
+        found = regressions(results, baseline, args.tolerance)
+        for message in found:
+            print('REGRESSION {}'.format(message))
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
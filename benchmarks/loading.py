@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the cost of loading plain dicts of the benchmark model shapes,
+including the ones with embedded `models`, lists and dicts of `models`,
+as time and Python function calls per record.
+
+Run it from the repository root::
+
+    python -m benchmarks.loading --records 1000
+
+Calls are counted with :func:`sys.setprofile`, so unlike times they don't
+depend on the machine, and show how much of the loading runs in Python
+frames, like the ones of every embedded `model`.
+"""
+
+import sys
+import timeit
+import argparse
+
+from benchmarks.shapes import SHAPES
+
+
+def _operations(model, records):
+    return (
+        ('from_plain_dict',
+            lambda: [model.from_plain_dict(plain) for plain in records]),
+        ('from_plain_many', lambda: model.from_plain_many(records)),
+    )
+
+
+def _calls(function):
+    """Returns the number of Python function calls made by `function`."""
+
+    count = [0]
+
+    def profile(frame, event, arg):
+        if event == 'call':
+            count[0] += 1
+
+    sys.setprofile(profile)
+    try:
+        function()
+    finally:
+        sys.setprofile(None)
+    return count[0]
+
+
+def run(records, repeat):
+    """Returns the results of every loading operation over every shape, as
+    a `dict` of `{shape: {operation: {'seconds': ..., 'calls': ...}}}`
+    with the best time and the Python calls per record.
+
+    """
+
+    results = {}
+    for shape, model, plain in SHAPES:
+        results[shape] = shape_results = {}
+        for name, function in _operations(model,
+                [plain(i) for i in range(records)]):
+            seconds = min(timeit.repeat(function, number=1, repeat=repeat))
+            shape_results[name] = {
+                'seconds': seconds / records,
+                'calls': _calls(function) / float(records)
+            }
+    return results
+
+
+def report(results):
+    print('{:<10} {:<16} {:>14} {:>12}'.format(
+        'shape', 'operation', 'time', 'calls'))
+
+    for shape, _, _ in SHAPES:
+        for name, result in sorted(results[shape].items()):
+            print('{:<10} {:<16} {:>11.2f} us {:>6.1f}/rec'.format(shape,
+                name, result['seconds'] * 1e6, result['calls']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    report(run(args.records, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
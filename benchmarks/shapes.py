@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""Model shapes shared by the benchmarks, with a function that builds the
+plain dicts of every shape.
+"""
+
+import datetime
+
+from booby import fields, models
+
+
+class Token(models.Model):
+    key = fields.StringField(required=True)
+    secret = fields.StringField(required=True)
+
+
+class User(models.Model):
+    login = fields.StringField(required=True)
+    name = fields.StringField()
+    email = fields.EmailField(required=True)
+    karma = fields.IntegerField(min_value=0)
+    score = fields.FloatField()
+    is_active = fields.BooleanField(default=False)
+    role = fields.StringField(choices=['admin', 'moderator', 'user'])
+
+
+class Repo(models.Model):
+    name = fields.StringField(required=True)
+    created = fields.DateTimeField()
+    owner = fields.EmbeddedField(User, required=True)
+    tokens = fields.ListField(Token)
+    collaborators = fields.DictField(value=User)
+
+
+class Leaf(models.Model):
+    name = fields.StringField(required=True)
+    value = fields.IntegerField()
+
+
+class Branch(models.Model):
+    name = fields.StringField(required=True)
+    child = fields.EmbeddedField(Leaf, required=True)
+
+
+class Trunk(models.Model):
+    name = fields.StringField(required=True)
+    child = fields.EmbeddedField(Branch, required=True)
+
+
+class Tree(models.Model):
+    name = fields.StringField(required=True)
+    child = fields.EmbeddedField(Trunk, required=True)
+
+
+class Team(models.Model):
+    name = fields.StringField(required=True)
+    members = fields.ListField(User)
+
+
+class Directory(models.Model):
+    name = fields.StringField(required=True)
+    users = fields.DictField(value=User)
+
+
+class Event(models.Model):
+    name = fields.StringField(required=True)
+    created = fields.DateTimeField()
+    updated = fields.DateTimeField()
+    started = fields.DateTimeField()
+    finished = fields.DateTimeField()
+    expires = fields.DateTimeField()
+
+
+def plain_user(index):
+    return {
+        'login': u'user{}'.format(index),
+        'name': u'User {}'.format(index),
+        'email': u'user{}@example.com'.format(index),
+        'karma': index,
+        'score': index / 3.0,
+        'is_active': index % 2 == 0,
+        'role': 'user'
+    }
+
+
+def plain_repo(index, items=10):
+    created = datetime.datetime(2013, 1, 1) + datetime.timedelta(hours=index)
+
+    return {
+        'name': u'repo{}'.format(index),
+        'created': created.strftime('%Y-%m-%d %H:%M:%S'),
+        'owner': plain_user(index),
+        'tokens': [{'key': u'key{}'.format(i), 'secret': u'secret{}'.format(i)}
+            for i in range(items)],
+        'collaborators': dict((u'user{}'.format(i), plain_user(i))
+            for i in range(items))
+    }
+
+
+def plain_tree(index):
+    plain = {'name': u'leaf{}'.format(index), 'value': index}
+    for level in ('branch', 'trunk', 'tree'):
+        plain = {'name': u'{}{}'.format(level, index), 'child': plain}
+    return plain
+
+
+def plain_team(index, items=50):
+    return {
+        'name': u'team{}'.format(index),
+        'members': [plain_user(i) for i in range(items)]
+    }
+
+
+def plain_directory(index, items=50):
+    return {
+        'name': u'directory{}'.format(index),
+        'users': dict((u'user{}'.format(i), plain_user(i))
+            for i in range(items))
+    }
+
+
+def plain_event(index):
+    start = datetime.datetime(2013, 1, 1) + datetime.timedelta(minutes=index)
+
+    plain = {'name': u'event{}'.format(index)}
+    for hours, name in enumerate(
+            ('created', 'updated', 'started', 'finished', 'expires')):
+        value = start + datetime.timedelta(hours=hours)
+        plain[name] = value.strftime('%Y-%m-%d %H:%M:%S')
+    return plain
+
+
+#: The benchmarked shapes, as `(name, model, plain)` tuples, where `plain`
+#: builds the plain dict of the record with the given index.
+SHAPES = (
+    ('flat', User, plain_user),
+    ('nested', Repo, plain_repo),
+    ('deep', Tree, plain_tree),
+    ('list', Team, plain_team),
+    ('dict', Directory, plain_directory),
+    ('datetimes', Event, plain_event),
+)
@@ -15,10 +15,10 @@
 # limitations under the License.
 
 
-from booby.models import Model
+from booby.models import Model, CompactModel
 from booby.fields import (StringField, IntegerField, FloatField, BooleanField,
     EmbeddedField, EmailField, ListField, DateTimeField, DictField)
 
-__all__ = ['Model', 'StringField', 'IntegerField', 'FloatField',
-    'BooleanField', 'EmbeddedField', 'EmailField', 'ListField',
+__all__ = ['Model', 'CompactModel', 'StringField', 'IntegerField',
+    'FloatField', 'BooleanField', 'EmbeddedField', 'EmailField', 'ListField',
     'DateTimeField', 'DictField']
@@ -1,3 +1,7 @@
+import types
+import struct
+
+from booby import errors
 from booby import validators as builtin_validators
 
 
@@ -12,6 +16,10 @@ class Field(object):
 
     """
 
+    #: The :mod:`struct` format character used to pack this field values,
+    #: or :keyword:`None` if they can't be packed. See :class:`StructLayout`.
+    struct_format = None
+
     def __init__(self, *validators, **kwargs):
         self.options = kwargs
 
@@ -20,12 +28,14 @@ class Field(object):
         # Setup field validators
         self.validators = []
         if kwargs.get('required'):
-            self.validators.append(builtin_validators.Required())
+            self.validators.append(
+                builtin_validators.shared(builtin_validators.Required))
 
         choices = kwargs.get('choices')
 
         if choices:
-            self.validators.append(builtin_validators.In(choices))
+            self.validators.append(
+                builtin_validators.shared(builtin_validators.In, choices))
 
         self.validators.extend(validators)
 
@@ -37,6 +47,15 @@ class Field(object):
     def __set__(self, instance, value):
         instance._data[self] = value
 
+        changed = instance._changed
+        if changed is None:
+            instance._changed = set([self])
+        else:
+            changed.add(self)
+
+        if instance._source is not None:
+            _invalidate(instance, self)
+
     def to_plain(self, value):
         """Returns a serializable value"""
         return value
@@ -49,18 +68,562 @@ class Field(object):
         for validator in self.validators:
             validator.validate(value)
 
+    def collect_errors(self, value, path, result):
+        """Validates the given `value` and appends `(path, error)` tuples
+        to the `result` list for every found error, including the errors
+        of embedded `models`. Returns `True` if the `value` doesn't
+        validate.
 
-class ModelMeta(type):
-    def __new__(cls, name, bases, attrs):
-        attrs['_fields'] = {}
+        """
+
+        if _inherits(self, 'validate'):
+            return builtin_validators.collect_errors(self.validators, value,
+                path, result)
+
+        try:
+            self.validate(value)
+        except errors.ValidationError as error:
+            result.append((path, error))
+            return True
+        return False
+
+
+class LazyValue(object):
+    """A plain value stored by a lazy :class:`LazyField` until the field
+    is accessed for the first time.
+
+    """
+
+    __slots__ = ('plain',)
+
+    def __init__(self, plain):
+        self.plain = plain
+
+    def __reduce__(self):
+        return LazyValue, (self.plain,)
+
+
+class LazyField(Field):
+    """Base class for fields whose plain values can be expensive to load,
+    like embedded `models`. If the field is declared with `lazy=True` the
+    plain values are stored as they are when loading a `model` with
+    :func:`models.Model.from_plain_dict` and only loaded the first time the
+    field is accessed. Until then, :func:`to_plain` returns the original
+    plain value.
+
+    Subclasses implement :func:`load` instead of :func:`to_python`, and
+    their :func:`to_plain` should return `value.plain` for
+    :class:`LazyValue` values.
+
+    :param lazy: If `True` plain values are loaded on first access.
+
+    """
+
+    def __init__(self, *validators, **kwargs):
+        super(LazyField, self).__init__(*validators, **kwargs)
+
+        self.lazy = kwargs.get('lazy', False)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        value = instance._data.get(self, self.default)
+        if type(value) is LazyValue:
+            plain = value.plain
+            value = instance._data[self] = self.load(plain)
+            if not _adopt(instance, self, value, plain):
+                _invalidate(instance, self)
+        return value
+
+    def to_python(self, value):
+        if self.lazy and value is not None:
+            return LazyValue(value)
+        return self.load(value)
+
+    def load(self, value):
+        """Converts plain value to python value"""
+        return value
+
+
+# Marks the `models` loaded from dicts whose keys aren't exactly their
+# field names in their `_stale` sets.
+_OTHER_KEYS = object()
+
+
+def _invalidate(model, field):
+    """Marks the value of the `field` of the loaded `model` as no longer
+    matching its plain value, and the fields holding `model` in the
+    `models` it was loaded within.
+
+    """
+
+    while True:
+        stale = model._stale
+        if stale is None:
+            model._stale = set([field])
+        elif field in stale:
+            # The fields holding `model` were marked already.
+            return
+        else:
+            stale.add(field)
+
+        parent = model._parent
+        if type(parent) is not tuple:
+            if parent is None:
+                return
+            # `models` loaded within lists and dicts are linked to them.
+            parent = parent._owner
+            if parent is None:
+                return
+        model, field = parent
+
+
+def _adopt(model, field, value, plain):
+    """Links the `models` and containers within `value`, loaded from
+    `plain` as the value of the `field` of `model`, to `model`, so their
+    changes invalidate it. Returns `True` if `value` still serializes to
+    `plain`.
+
+    """
+
+    if type(value) is LazyValue:
+        return True
+
+    if isinstance(type(value), ModelMeta):
+        value._parent = (model, field)
+        return value._source is plain and not value._stale
+
+    if isinstance(value, (_TrackedList, _TrackedDict)):
+        # The `models` within were linked to it while loading.
+        value._owner = (model, field)
+        return not value._stale
+
+    # Empty lists and dicts serialize as None.
+    return value is plain and (plain is None or bool(plain))
+
+
+def _tracking(method):
+    def mutate(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        owner = self._owner
+        if owner is not None:
+            _invalidate(*owner)
+        return result
+
+    mutate.__name__ = method.__name__
+    return mutate
+
+
+class _TrackedList(list):
+    """A `list` of loaded values that invalidates the `model` owning it
+    when it's modified. Pickles and copies as a plain `list`.
+
+    """
+
+    __slots__ = ('_owner', '_stale')
+
+    def __init__(self, *args):
+        super(_TrackedList, self).__init__(*args)
+        self._owner = None
+        # Whether some of the values won't serialize to the plain ones.
+        self._stale = False
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+class _TrackedDict(dict):
+    """Like :class:`_TrackedList`, for dicts."""
+
+    __slots__ = ('_owner', '_stale')
+
+    def __init__(self, *args, **kwargs):
+        super(_TrackedDict, self).__init__(*args, **kwargs)
+        self._owner = None
+        self._stale = False
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+for _name in ('__setitem__', '__delitem__', '__setslice__', '__delslice__',
+        '__iadd__', '__imul__', 'append', 'extend', 'insert', 'pop',
+        'remove', 'reverse', 'sort'):
+    if hasattr(list, _name):
+        setattr(_TrackedList, _name, _tracking(getattr(list, _name)))
 
-        for base in bases:
-            for k, v in base.__dict__.iteritems():
-                if isinstance(v, Field):
-                    attrs['_fields'][k] = v
+for _name in ('__setitem__', '__delitem__', 'clear', 'pop', 'popitem',
+        'setdefault', 'update'):
+    setattr(_TrackedDict, _name, _tracking(getattr(dict, _name)))
 
-        for k, v in attrs.iteritems():
+
+def _defined_by(field, name):
+    for klass in type(field).__mro__:
+        if name in klass.__dict__:
+            return klass
+
+
+def _inherits(field, name):
+    """Returns `True` if the `field` class doesn't override the
+    :class:`Field` method called `name`.
+
+    """
+
+    return _defined_by(field, name) is Field
+
+
+def _reads_data(field, lazy_values=False):
+    """Returns `True` if the `field` value can be read from the model
+    `_data` without going through the field descriptor. If `lazy_values`
+    is `True` reading a :class:`LazyValue` is fine too.
+
+    """
+
+    klass = _defined_by(field, '__get__')
+    if klass is LazyField:
+        return lazy_values or not field.lazy
+    return klass is Field
+
+
+def _validation_checks(field):
+    """Returns a tuple with two tuples of callables: the checks to run
+    when the `field` value is :keyword:`None` and the checks to run for
+    any other value.
+
+    Validators decorated with :func:`validators.nullable` are unwrapped,
+    so they don't pay the wrapper call, and they are left out from the
+    checks for :keyword:`None` values, where they never fail. The order
+    of the validators is preserved, so the first raised error is the same
+    that :func:`Field.validate` would raise.
+
+    """
+
+    if not _inherits(field, 'validate'):
+        checks = (field.validate,)
+        return checks, checks
+
+    none_checks, value_checks = [], []
+    for validator in field.validators:
+        validate = validator.validate
+        if (isinstance(validate, types.MethodType) and
+                getattr(validate.__func__, 'nullable', False)):
+            value_checks.append(
+                validate.__func__.__wrapped__.__get__(validator))
+        else:
+            none_checks.append(validate)
+            value_checks.append(validate)
+    return tuple(none_checks), tuple(value_checks)
+
+
+def _collects_errors(field):
+    """Returns `True` if the `field` needs its :func:`Field.collect_errors`
+    method to collect the errors of its values, because it holds `models`
+    or other nested values.
+
+    """
+
+    if not _inherits(field, 'collect_errors'):
+        return True
+    return any(getattr(type(validator), 'collect_errors', None) is not None
+        for validator in field.validators)
+
+
+def _compile_validation_plan(fields):
+    """Builds the flat validation plan used by :func:`models.Model.validate`.
+    The plan is a tuple of
+    `(name, field, direct, none_checks, value_checks, collect_errors)`
+    tuples, where `direct` means that the field value can be read from the
+    model `_data` without going through the field descriptor and
+    `collect_errors` is :keyword:`None` for fields whose errors can be
+    collected running their checks.
+
+    """
+
+    plan = []
+    for name, field in fields.iteritems():
+        none_checks, value_checks = _validation_checks(field)
+        if _collects_errors(field):
+            collect_errors = field.collect_errors
+        else:
+            collect_errors = None
+        plan.append((name, field, _reads_data(field),
+            none_checks, value_checks, collect_errors))
+    return tuple(plan)
+
+
+def _compile_serialization_plan(fields):
+    """Builds the serialization plan used by :func:`models.Model.to_plain`
+    and :func:`models.Model.to_dict`. The plan is a tuple of
+    `(name, field, direct, to_plain)` tuples, where `to_plain` is
+    :keyword:`None` for fields that return their values unchanged. Values
+    read directly may be not yet loaded :class:`LazyValue` values.
+
+    """
+
+    plan = []
+    for name, field in fields.iteritems():
+        if _inherits(field, 'to_plain'):
+            to_plain = None
+        else:
+            to_plain = field.to_plain
+        plan.append((name, field, _reads_data(field, lazy_values=True),
+            to_plain))
+    return tuple(plan)
+
+
+def _compile_loading_plan(fields):
+    """Builds the loading plan used by
+    :func:`models.Model.from_plain_dict`. The plan is a `dict` that maps
+    each field name to a `(field, direct, to_python, adopts)` tuple, where
+    `direct` means that the value can be stored in the model `_data`
+    without going through the field descriptor, `to_python` is
+    :keyword:`None` for fields that load plain values unchanged and
+    `adopts` means that the loaded values may hold `models` or containers
+    to be linked with :func:`_adopt`.
+
+    """
+
+    plan = {}
+    for name, field in fields.iteritems():
+        if _inherits(field, 'to_python'):
+            to_python = None
+        else:
+            to_python = field.to_python
+        plan[name] = (field, _inherits(field, '__set__'), to_python,
+            isinstance(field, LazyField))
+    return plan
+
+
+# Formats of the null bitmasks of the struct layouts, by number of fields.
+_MASK_FORMATS = ((8, 'B'), (16, 'H'), (32, 'I'), (64, 'Q'))
+
+
+class StructLayout(object):
+    """The fixed binary layout of a flat `model` class, whose fields all
+    have a :attr:`Field.struct_format`. Records are packed as a little
+    endian :class:`struct.Struct`: a bitmask with the fields whose value is
+    :keyword:`None` followed by the field values, sorted by field name.
+
+    """
+
+    def __init__(self, fields):
+        names = sorted(fields)
+        count = len(names)
+        mask_format = [fmt for size, fmt in _MASK_FORMATS if count <= size][0]
+
+        self.names = tuple(names)
+        self.fields = tuple(fields[name] for name in names)
+        self.struct = struct.Struct('<' + mask_format + ''.join(
+            field.struct_format for field in self.fields))
+        self.size = self.struct.size
+
+        self._plan = tuple((1 << bit, field, _reads_data(field), name,
+            False if field.struct_format == '?' else 0)
+            for bit, (name, field) in enumerate(zip(names, self.fields)))
+
+    def pack(self, model):
+        """Returns the given `model` packed as bytes. Raises
+        :class:`errors.BoobyError` if a value doesn't fit its format.
+
+        """
+
+        try:
+            return self.struct.pack(*self._values(model))
+        except struct.error as error:
+            raise self._pack_error(model, error)
+
+    def pack_into(self, buf, offset, model):
+        """Packs the given `model` into the writable `buf` at `offset`."""
+
+        try:
+            self.struct.pack_into(buf, offset, *self._values(model))
+        except struct.error as error:
+            raise self._pack_error(model, error)
+
+    def _pack_error(self, model, error):
+        return errors.BoobyError("Can't pack '{}' model: {}".format(
+            type(model).__name__, error))
+
+    def _values(self, model):
+        data = model._data
+        mask = 0
+        values = [0]
+        for bit, field, direct, name, placeholder in self._plan:
+            if direct:
+                value = data.get(field, field.default)
+            else:
+                value = getattr(model, name)
+
+            if value is None:
+                mask |= bit
+                value = placeholder
+            values.append(value)
+        values[0] = mask
+        return values
+
+    def unpack(self, model, buf, offset=0):
+        """Returns a new instance of the `model` class unpacked from `buf`
+        at `offset`.
+
+        """
+
+        return self.build(model, self.struct.unpack_from(buf, offset))
+
+    def iter_unpack(self, model, buf, offset=0, count=None):
+        """Yields new instances of the `model` class unpacked from the
+        consecutive records in `buf`, starting at `offset`. If `count` is
+        :keyword:`None` all the records until the end of `buf` are read.
+
+        """
+
+        size = self.size
+        if count is None:
+            count = (len(buf) - offset) // size
+        end = offset + count * size
+
+        if hasattr(self.struct, 'iter_unpack'):
+            records = self.struct.iter_unpack(memoryview(buf)[offset:end])
+        else:
+            unpack_from = self.struct.unpack_from
+            records = (unpack_from(buf, pos)
+                for pos in xrange(offset, end, size))
+
+        for values in records:
+            yield self.build(model, values)
+
+    def build(self, model, values):
+        """Returns a new instance of the `model` class with the given
+        unpacked `values`.
+
+        """
+
+        obj = model()
+        data = obj._data = dict(zip(self.fields, values[1:]))
+
+        mask = values[0]
+        if mask:
+            for bit, field, _, _, _ in self._plan:
+                if mask & bit:
+                    data[field] = None
+
+        obj._changed = None
+        return obj
+
+
+def _compile_struct_layout(fields):
+    """Returns the :class:`StructLayout` of the given `fields`, or
+    :keyword:`None` if some of them can't be packed.
+
+    """
+
+    if not fields or len(fields) > _MASK_FORMATS[-1][0]:
+        return None
+    if any(field.struct_format is None for field in fields.itervalues()):
+        return None
+    return StructLayout(fields)
+
+
+class _BinarySchema(object):
+    """The encoding tables of a `model` class, used by :mod:`binary`."""
+
+    def __init__(self, fields):
+        self.encoding = []
+        self.decoding = []
+
+        for index, name in enumerate(sorted(fields)):
+            field = fields[name]
+            self.encoding.append((index, name, field, _reads_data(field)))
+            self.decoding.append((name, field, _inherits(field, '__set__'),
+                getattr(field, 'key_model', None),
+                getattr(field, 'value_model', None) or
+                getattr(field, 'model', None)))
+
+
+def _collect_fields(model):
+    """Returns a `dict` with the fields declared by the `model` class and
+    its direct bases.
+
+    """
+
+    fields = {}
+    for klass in model.__bases__ + (model,):
+        for k, v in klass.__dict__.iteritems():
             if isinstance(v, Field):
-                attrs['_fields'][k] = v
+                fields[k] = v
+    return fields
+
+
+# A function called with the name, the `model` class and the value of
+# every computed :class:`_Deferred` attribute, that returns the value to
+# use instead. Set by :mod:`booby.instrument` to wrap the compiled plans.
+_plan_hook = None
+
+
+class _Deferred(object):
+    """A class attribute of the `model` classes that is computed the first
+    time it's read, and then replaces itself in the class with the
+    computed value.
+
+    """
+
+    def __init__(self, name, compile):
+        self.name = name
+        self.compile = compile
+
+    def __get__(self, instance, owner):
+        value = self.compile(owner)
+        if _plan_hook is not None:
+            value = _plan_hook(self.name, owner, value)
+        setattr(owner, self.name, value)
+        return value
+
+
+# The fields map and the compiled plans of the `model` classes, in the
+# order they are computed by :func:`finalize`.
+_DEFERRED = (
+    _Deferred('_fields', _collect_fields),
+    _Deferred('_validation_plan',
+        lambda model: _compile_validation_plan(model._fields)),
+    _Deferred('_serialization_plan',
+        lambda model: _compile_serialization_plan(model._fields)),
+    _Deferred('_loading_plan',
+        lambda model: _compile_loading_plan(model._fields)),
+    _Deferred('_struct_layout',
+        lambda model: _compile_struct_layout(model._fields)),
+    _Deferred('_binary_schema', lambda model: _BinarySchema(model._fields)),
+)
+
+
+def finalize(model):
+    """Computes the fields map and the compiled plans of the given `model`
+    class. :class:`ModelMeta` defers them until they are first needed,
+    which makes defining `models` cheap, but they can be computed upfront,
+    for example before forking worker processes that share them.
+
+    """
+
+    for deferred in _DEFERRED:
+        getattr(model, deferred.name)
+
+
+def _reset(model):
+    """Discards the fields map and the compiled plans of the given `model`
+    class, so they are computed again when needed.
+
+    """
+
+    for deferred in _DEFERRED:
+        setattr(model, deferred.name, deferred)
+
+
+class ModelMeta(type):
+    def __new__(cls, name, bases, attrs):
+        if '__slots__' not in attrs and any(
+                getattr(base, '_compact', False) for base in bases):
+            attrs['__slots__'] = ()
+
+        for deferred in _DEFERRED:
+            attrs[deferred.name] = deferred
 
         return super(ModelMeta, cls).__new__(cls, name, bases, attrs)
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Jaime Gil de Sagredo Luna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The `batch` module contains the :class:`ModelBatch`, a columnar
+container for large collections of `models` of the same class.
+
+Instead of keeping one `model` object per record, a batch keeps one
+column per field. The values of :class:`fields.IntegerField`,
+:class:`fields.FloatField` and :class:`fields.BooleanField` are stored in
+compact :mod:`array` columns, any other value is stored in a `list`::
+
+    users = ModelBatch(User, records)
+
+    users.validate()
+    karmas = users.column('karma')
+    first = users[0]
+    print first.login
+"""
+
+import array
+
+from booby import errors, validators
+from booby.base import _inherits, _reads_data
+from booby.fields import IntegerField, FloatField, BooleanField
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Python types and array typecodes of the fields stored in typed columns.
+TYPED_FIELDS = (
+    (BooleanField, (bool,), 'B'),
+    (IntegerField, (int, long), 'l'),
+    (FloatField, (float,), 'd'),
+)
+
+
+class ModelBatch(object):
+    """A columnar container of records of the given `model` class.
+
+    Items are row views: instances of the `model` class whose field values
+    are read from and written to the batch columns, so they can be used
+    as any other `model`.
+
+    :param model: A subclass of :class:`models.Model`.
+    :param records: An iterable of `models` or plain dicts, which are
+        loaded with :func:`models.Model.from_plain_dict`.
+
+    """
+
+    def __init__(self, model, records=()):
+        self.model = model
+        self._columns = {}
+        self._columns_by_field = {}
+        self._length = 0
+
+        for name, field in model._fields.iteritems():
+            column = _Column(field)
+            self._columns[name] = column
+            self._columns_by_field[field] = column
+
+        self.extend(records)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('batch index out of range')
+
+        return self._row(index)
+
+    def __iter__(self):
+        for index in xrange(self._length):
+            yield self._row(index)
+
+    def _row(self, index):
+        row = self.model.__new__(self.model)
+        row._data = _RowData(self._columns_by_field, index)
+        return row
+
+    def append(self, record):
+        """Appends the given `model` or plain dict to this batch."""
+
+        self.extend((record,))
+
+    def extend(self, records):
+        """Appends all the `models` or plain dicts in the given iterable
+        to this batch.
+
+        """
+
+        # Lazy fields are read through their descriptor, so the columns
+        # hold loaded values instead of lazy ones.
+        plan = [(name, field, _reads_data(field), self._columns[name].append)
+            for name, field in self.model._fields.iteritems()]
+
+        for record in records:
+            if not isinstance(record, self.model):
+                record = self.model.from_plain_dict(record)
+
+            data = record._data
+            for name, field, direct, append in plan:
+                if direct:
+                    append(data.get(field, field.default))
+                else:
+                    append(getattr(record, name))
+            self._length += 1
+
+    def column(self, name):
+        """Returns the column of the field called `name`. Typed columns
+        are :class:`array.array` objects with `0` in place of
+        :keyword:`None` values, any other column is a `list`.
+
+        """
+
+        return self._column(name).values
+
+    def to_numpy(self, name):
+        """Returns the column of the field called `name` as a `numpy`
+        array. Typed columns are returned as views over the column
+        buffer, without copying it. Requires `numpy` to be installed.
+
+        """
+
+        if numpy is None:
+            raise errors.BoobyError('numpy is required to use to_numpy')
+
+        column = self._column(name)
+        if not column.is_typed:
+            return numpy.array(column.tolist(), dtype=object)
+
+        values = numpy.frombuffer(column.values, dtype=column.values.typecode)
+        if column.types == (bool,):
+            values = values.astype(bool)
+        return values
+
+    def _column(self, name):
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise errors.FieldError("'{}' model has no field '{}'".format(
+                self.model.__name__, name))
+
+    def validate(self):
+        """Validates all the records in this batch, one column at a time.
+        Unlike :func:`models.Model.validate`, this method doesn't raise
+        but returns a `list` of `(index, name, error)` tuples, sorted by
+        record index, with the first :class:`errors.ValidationError` of
+        every invalid field of every record.
+
+        """
+
+        result = []
+        for name in sorted(self._columns):
+            for index, error in self._columns[name].validate():
+                result.append((index, name, error))
+
+        result.sort(key=lambda item: item[0])
+        return result
+
+    def to_plain(self):
+        """Returns a `list` with the plain dicts of all the records in this
+        batch. See :func:`models.Model.to_plain`.
+
+        """
+
+        names, columns = [], []
+        for name, _, _, to_plain in self.model._serialization_plan:
+            values = self._columns[name].tolist()
+            if to_plain is not None:
+                values = [to_plain(value) for value in values]
+
+            names.append(name)
+            columns.append(values)
+
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+class _RowData(object):
+    """The fields values storage of a batch row view."""
+
+    __slots__ = ('columns', 'index')
+
+    def __init__(self, columns, index):
+        self.columns = columns
+        self.index = index
+
+    def get(self, field, default=None):
+        return self.columns[field].get(self.index)
+
+    def __setitem__(self, field, value):
+        self.columns[field].set(self.index, value)
+
+
+class _Column(object):
+    """The values of a field in a :class:`ModelBatch`. A typed column keeps
+    its values in an :class:`array.array` and the positions of its
+    :keyword:`None` values in a `set`. When a value that doesn't fit in
+    the array is stored the column falls back to a `list`.
+
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.types = None
+        self.nulls = set()
+        self.values = []
+
+        for field_class, types, typecode in TYPED_FIELDS:
+            if isinstance(field, field_class):
+                self.types = types
+                self.values = array.array(typecode)
+                break
+
+    @property
+    def is_typed(self):
+        return isinstance(self.values, array.array)
+
+    def append(self, value):
+        if self.is_typed:
+            if value is None:
+                self.nulls.add(len(self.values))
+                value = 0
+            elif type(value) not in self.types:
+                self._untype()
+            else:
+                try:
+                    self.values.append(value)
+                    return
+                except OverflowError:
+                    self._untype()
+        self.values.append(value)
+
+    def set(self, index, value):
+        if self.is_typed:
+            if value is None:
+                self.nulls.add(index)
+                value = 0
+            elif type(value) not in self.types:
+                self._untype()
+            else:
+                try:
+                    self.values[index] = value
+                    self.nulls.discard(index)
+                    return
+                except OverflowError:
+                    self._untype()
+        self.values[index] = value
+
+    def get(self, index):
+        if self.is_typed:
+            if index in self.nulls:
+                return None
+            if self.types == (bool,):
+                return bool(self.values[index])
+        return self.values[index]
+
+    def tolist(self):
+        if not self.is_typed:
+            return self.values
+
+        values = self.values.tolist()
+        if self.types == (bool,):
+            values = [bool(value) for value in values]
+        for index in self.nulls:
+            values[index] = None
+        return values
+
+    def _untype(self):
+        self.values = self.tolist()
+        self.nulls = set()
+
+    def validate(self):
+        """Returns a `list` of `(index, error)` tuples with the first
+        error of every invalid value in this column. Values are checked
+        with :func:`validators.validate_many`, one validator at a time.
+
+        """
+
+        field = self.field
+        if _inherits(field, 'validate'):
+            checks = field.validators
+        else:
+            checks = [_FieldCheck(field)]
+
+        # Typed columns without nulls are validated straight from the
+        # array, which the builtin validators check at once.
+        if self.is_typed and not self.nulls and self.types != (bool,):
+            values = self.values
+        else:
+            values = self.tolist()
+
+        failed = {}
+        for check in checks:
+            for index, message in validators.validate_many(check, values):
+                if index not in failed:
+                    failed[index] = errors.ValidationError(message)
+
+        return sorted(failed.iteritems())
+
+
+class _FieldCheck(object):
+    """Adapts a field with a custom `validate` method to the validators
+    interface.
+
+    """
+
+    def __init__(self, field):
+        self.validate = field.validate
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Jaime Gil de Sagredo Luna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The `binary` module contains a compact binary codec for `models`, used
+by :func:`models.Model.to_bytes` and :func:`models.Model.from_bytes`.
+
+Values are encoded as a type tag followed by their payload, in a format
+similar to `MessagePack`. Integers are encoded as variable length
+integers, floats as 8 bytes doubles and datetimes as the number of
+microseconds since the epoch, so they are never formatted as text.
+
+`Models` are encoded as `(index, value)` pairs, where `index` is the
+position of the field name in the sorted field names of the `model` class,
+instead of the field names. Fields with their default value are left out.
+So both the encoding and the decoding sides should use the same `model`
+declarations::
+
+    data = user.to_bytes()
+    user = User.from_bytes(data)
+"""
+
+import struct
+import datetime
+
+from booby import errors
+from booby.base import ModelMeta
+
+VERSION = 1
+
+NONE = 0x00
+FALSE = 0x01
+TRUE = 0x02
+INTEGER = 0x03
+FLOAT = 0x04
+BYTES = 0x05
+TEXT = 0x06
+LIST = 0x07
+DICT = 0x08
+DATETIME = 0x09
+DATE = 0x0a
+MODEL = 0x0b
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+_DOUBLE = struct.Struct('>d')
+
+
+def dumps(model):
+    """Returns the given `model` encoded as bytes."""
+
+    buf = bytearray((VERSION,))
+    _encode_model(buf, model)
+    return bytes(buf)
+
+
+def loads(model, data):
+    """Returns a new instance of the `model` class decoded from the given
+    bytes. Raises :class:`errors.DecodeError` if `data` isn't valid.
+
+    """
+
+    data = bytearray(data)
+    if not data or data[0] != VERSION:
+        raise errors.DecodeError('Unknown binary format version')
+
+    try:
+        obj, pos = _decode_model(data, 1, model)
+    except errors.DecodeError:
+        raise
+    except (IndexError, struct.error, UnicodeDecodeError, OverflowError):
+        raise errors.DecodeError('Truncated or invalid binary data')
+    except (TypeError, ValueError, errors.BoobyError) as error:
+        # Decoded values the `model` fields or `datetime` reject.
+        raise errors.DecodeError('Invalid binary data: {}'.format(error))
+
+    if pos != len(data):
+        raise errors.DecodeError('Unexpected data after the encoded model')
+    return obj
+
+
+def _encode_varint(buf, value):
+    if value < 0x80:
+        buf.append(value)
+        return
+    while value > 0x7f:
+        buf.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _encode_model(buf, model):
+    data = model._data
+    values = []
+    for index, name, field, direct in type(model)._binary_schema.encoding:
+        if direct:
+            value = data.get(field, field.default)
+        else:
+            value = getattr(model, name)
+
+        if value is not field.default:
+            values.append((index, value))
+
+    buf.append(MODEL)
+    _encode_varint(buf, len(values))
+    for index, value in values:
+        _encode_varint(buf, index)
+        _encode_value(buf, value)
+
+
+def _encode_value(buf, value):
+    encode = _ENCODERS.get(type(value))
+    if encode is not None:
+        encode(buf, value)
+    elif isinstance(type(value), ModelMeta):
+        _encode_model(buf, value)
+    else:
+        for kind, encode in _SUBCLASS_ENCODERS:
+            if isinstance(value, kind):
+                encode(buf, value)
+                return
+        raise errors.BoobyError(
+            "Can't encode values of type {}".format(type(value).__name__))
+
+
+def _encode_none(buf, value):
+    buf.append(NONE)
+
+
+def _encode_bool(buf, value):
+    buf.append(TRUE if value else FALSE)
+
+
+def _encode_integer(buf, value):
+    buf.append(INTEGER)
+    _encode_varint(buf, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def _encode_float(buf, value):
+    buf.append(FLOAT)
+    buf.extend(_DOUBLE.pack(value))
+
+
+def _encode_text(buf, value):
+    value = value.encode('utf-8')
+    buf.append(TEXT)
+    _encode_varint(buf, len(value))
+    buf.extend(value)
+
+
+def _encode_bytes(buf, value):
+    buf.append(BYTES)
+    _encode_varint(buf, len(value))
+    buf.extend(value)
+
+
+def _encode_list(buf, value):
+    buf.append(LIST)
+    _encode_varint(buf, len(value))
+    for item in value:
+        _encode_value(buf, item)
+
+
+def _encode_dict(buf, value):
+    buf.append(DICT)
+    _encode_varint(buf, len(value))
+    for key, item in value.iteritems():
+        _encode_value(buf, key)
+        _encode_value(buf, item)
+
+
+def _encode_datetime(buf, value):
+    if value.tzinfo is not None:
+        raise errors.BoobyError(
+            "Can't encode datetimes with timezone: {!r}".format(value))
+
+    delta = value - EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1000000 + \
+        delta.microseconds
+    buf.append(DATETIME)
+    _encode_varint(buf, micros << 1 if micros >= 0 else (-micros << 1) - 1)
+
+
+def _encode_date(buf, value):
+    buf.append(DATE)
+    _encode_varint(buf, value.toordinal())
+
+
+_ENCODERS = {
+    type(None): _encode_none,
+    bool: _encode_bool,
+    int: _encode_integer,
+    long: _encode_integer,
+    float: _encode_float,
+    unicode: _encode_text,
+    str: _encode_bytes,
+    list: _encode_list,
+    tuple: _encode_list,
+    dict: _encode_dict,
+    datetime.datetime: _encode_datetime,
+    datetime.date: _encode_date,
+}
+
+# Encoders of the subclasses of the types above, in lookup order.
+_SUBCLASS_ENCODERS = (
+    (bool, _encode_bool),
+    ((int, long), _encode_integer),
+    (float, _encode_float),
+    (unicode, _encode_text),
+    (str, _encode_bytes),
+    ((list, tuple), _encode_list),
+    (dict, _encode_dict),
+    (datetime.datetime, _encode_datetime),
+    (datetime.date, _encode_date),
+)
+
+
+def _decode_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _decode_signed(data, pos):
+    value, pos = _decode_varint(data, pos)
+    if value & 1:
+        return -((value + 1) >> 1), pos
+    return value >> 1, pos
+
+
+def _decode_model(data, pos, model):
+    if data[pos] != MODEL:
+        raise errors.DecodeError('Expected an encoded model')
+
+    decoding = model._binary_schema.decoding
+    obj = model()
+    obj_data = obj._data
+
+    count, pos = _decode_varint(data, pos + 1)
+    for _ in xrange(count):
+        index, pos = _decode_varint(data, pos)
+        if index >= len(decoding):
+            raise errors.DecodeError(
+                'Unknown field index {} for {}'.format(index, model.__name__))
+
+        name, field, direct, key_model, value_model = decoding[index]
+        value, pos = _decode_value(data, pos, key_model, value_model)
+        if direct:
+            obj_data[field] = value
+        else:
+            setattr(obj, name, value)
+
+    obj._changed = None
+    return obj, pos
+
+
+def _decode_value(data, pos, key_model=None, model=None):
+    tag = data[pos]
+    if tag == NONE:
+        return None, pos + 1
+    if tag == FALSE:
+        return False, pos + 1
+    if tag == TRUE:
+        return True, pos + 1
+    if tag == INTEGER:
+        return _decode_signed(data, pos + 1)
+    if tag == FLOAT:
+        return _DOUBLE.unpack_from(data, pos + 1)[0], pos + 1 + _DOUBLE.size
+    if tag == TEXT or tag == BYTES:
+        size, pos = _decode_varint(data, pos + 1)
+        end = pos + size
+        if end > len(data):
+            raise IndexError(end)
+        value = bytes(data[pos:end])
+        if tag == TEXT:
+            value = value.decode('utf-8')
+        return value, end
+    if tag == LIST:
+        count, pos = _decode_varint(data, pos + 1)
+        result = []
+        for _ in xrange(count):
+            item, pos = _decode_value(data, pos, None, model)
+            result.append(item)
+        return result, pos
+    if tag == DICT:
+        count, pos = _decode_varint(data, pos + 1)
+        result = {}
+        for _ in xrange(count):
+            key, pos = _decode_value(data, pos, None, key_model)
+            item, pos = _decode_value(data, pos, None, model)
+            result[key] = item
+        return result, pos
+    if tag == DATETIME:
+        micros, pos = _decode_signed(data, pos + 1)
+        return EPOCH + datetime.timedelta(microseconds=micros), pos
+    if tag == DATE:
+        ordinal, pos = _decode_varint(data, pos + 1)
+        return datetime.date.fromordinal(ordinal), pos
+    if tag == MODEL:
+        if model is None:
+            raise errors.DecodeError('Encoded model for a field without model')
+        return _decode_model(data, pos, model)
+
+    raise errors.DecodeError('Unknown type tag {:#x}'.format(tag))
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Jaime Gil de Sagredo Luna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The `datetimes` module contains the datetime parsers and formatters
+used by :class:`fields.DateTimeField`.
+
+:func:`datetime.datetime.strptime` and :func:`datetime.datetime.strftime`
+are slow, so the default ``'%Y-%m-%d %H:%M:%S'`` format and its ISO 8601
+variants, with a ``T`` separator and with microseconds, are parsed with a
+fixed regular expression and formatted slicing their ISO 8601 strings. Any other
+format, and any value the fast paths don't handle, like dates that aren't
+zero padded, goes through `strptime` and `strftime`, so the results and
+the raised errors are always the same::
+
+    parse = parser('%Y-%m-%dT%H:%M:%S')
+    parse('2013-01-19T14:30:55')
+
+    format_many([datetime.datetime.now()] * 3)
+"""
+
+import re
+import datetime
+import threading
+import collections
+
+DEFAULT_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_datetime = datetime.datetime
+_strptime = datetime.datetime.strptime
+_isoformat = datetime.datetime.isoformat
+
+
+def _fast_parser(format, pattern):
+    """Returns a parser for the given `format` that matches the values
+    with the regular expression `pattern`, whose groups are the fields of
+    the `datetime`, and falls back to `strptime` if they don't match.
+
+    """
+
+    match = re.compile(pattern).match
+
+    def parse(value):
+        matched = match(value)
+        if matched is not None:
+            try:
+                return _datetime(*map(int, matched.groups()))
+            except ValueError:
+                pass
+        return _strptime(value, format)
+    return parse
+
+
+def _fast_formatter(format, separator):
+    """Returns a formatter for the given `format` that slices the ISO 8601
+    string of the values, with the given date and time `separator`.
+
+    """
+
+    micros = format.endswith('%f')
+
+    def format_(value):
+        # Dates and datetime subclasses have other ISO strings, and
+        # strftime doesn't support years before 1900 in every platform,
+        # so those are left to it.
+        if type(value) is not _datetime or value.year < 1900:
+            return value.strftime(format)
+
+        # The microseconds and the UTC offset are left out of the ISO
+        # string, or appended to it, depending on the value.
+        result = _isoformat(value, separator)
+        if not micros:
+            return result[:19]
+        if value.microsecond:
+            return result[:26]
+        return result[:19] + '.000000'
+    return format_
+
+
+_SECONDS_PATTERN = r'(\d{4})-(\d\d)-(\d\d)%s(\d\d):(\d\d):(\d\d)'
+
+# The patterns of the fast parsers and the date and time separators of the
+# fast formatters, by format.
+_PATTERNS = {
+    '%Y-%m-%d %H:%M:%S': _SECONDS_PATTERN % ' ' + r'\Z',
+    '%Y-%m-%dT%H:%M:%S': _SECONDS_PATTERN % 'T' + r'\Z',
+    '%Y-%m-%d %H:%M:%S.%f': _SECONDS_PATTERN % ' ' + r'\.(\d{6})\Z',
+    '%Y-%m-%dT%H:%M:%S.%f': _SECONDS_PATTERN % 'T' + r'\.(\d{6})\Z',
+}
+
+_SEPARATORS = {
+    '%Y-%m-%d %H:%M:%S': ' ',
+    '%Y-%m-%dT%H:%M:%S': 'T',
+    '%Y-%m-%d %H:%M:%S.%f': ' ',
+    '%Y-%m-%dT%H:%M:%S.%f': 'T',
+}
+
+
+def parser(format=DEFAULT_FORMAT, cache_size=None):
+    """Returns a function that parses strings in the given `format` as
+    :class:`datetime.datetime` values.
+
+    :param format: A :func:`datetime.datetime.strptime` format.
+    :param cache_size: If given, the parsed values of the last
+        `cache_size` distinct strings are kept in a LRU cache, which pays
+        off when the same timestamps are loaded again and again.
+
+    """
+
+    if format in _PATTERNS:
+        parse = _fast_parser(format, _PATTERNS[format])
+    else:
+        parse = lambda value: _strptime(value, format)
+
+    if cache_size:
+        parse = _cached(parse, cache_size)
+    return parse
+
+
+def formatter(format=DEFAULT_FORMAT):
+    """Returns a function that formats :class:`datetime.datetime` values
+    as strings in the given `format`.
+
+    """
+
+    if format in _SEPARATORS:
+        return _fast_formatter(format, _SEPARATORS[format])
+    return lambda value: value.strftime(format)
+
+
+def parse_many(values, format=DEFAULT_FORMAT, cache_size=None):
+    """Returns a `list` with the given strings parsed as
+    :class:`datetime.datetime` values in the given `format`, as
+    :func:`fields.DateTimeField.to_python` does. `datetime` values are
+    returned as they are and empty values as :keyword:`None`. See
+    :func:`parser` for the `cache_size` parameter.
+
+    """
+
+    parse = parser(format, cache_size)
+    return [value if isinstance(value, _datetime) else
+        (parse(value) if value else None) for value in values]
+
+
+def format_many(values, format=DEFAULT_FORMAT):
+    """Returns a `list` with the given :class:`datetime.datetime` values
+    formatted as strings in the given `format`, as
+    :func:`fields.DateTimeField.to_plain` does. Empty values are returned
+    as they are.
+
+    """
+
+    format_ = formatter(format)
+    return [format_(value) if value else value for value in values]
+
+
+def _cached(parse, size):
+    """Returns `parse` with a LRU cache of `size` entries. The cache is
+    shared by the threads calling it, like the ones loading `models` with
+    the same field, so it's updated under a lock.
+
+    """
+
+    cache = collections.OrderedDict()
+    lock = threading.Lock()
+
+    def cached(value):
+        with lock:
+            try:
+                result = cache.pop(value)
+            except KeyError:
+                result = parse(value)
+                if len(cache) >= size:
+                    cache.popitem(last=False)
+            cache[value] = result
+        return result
+    return cached
@@ -39,3 +39,12 @@ class ValidationError(BoobyError):
     """
 
     pass
+
+
+class DecodeError(BoobyError):
+    """This exception is raised when encoded `models` can't be decoded.
+    See :mod:`binary`.
+
+    """
+
+    pass
@@ -32,9 +32,11 @@ The example below shows the most common fields and builtin validations::
         is_active = BooleanField(default=False)
 """
 
+from booby import datetimes
 from booby import validators as builtin_validators
-from booby.base import Field
-from booby.models import Model
+from booby.base import (Field, LazyField, LazyValue, _TrackedList,
+    _TrackedDict)
+from booby.models import Model, _check_keys
 from booby.errors import BoobyError
 import datetime
 import inspect
@@ -44,20 +46,26 @@ class StringField(Field):
     """:class:`Field` subclass with builtin `string` validation."""
 
     def __init__(self, *args, **kwargs):
-        super(StringField, self).__init__(builtin_validators.String(), *args, **kwargs)
+        super(StringField, self).__init__(
+            builtin_validators.shared(builtin_validators.String), *args, **kwargs)
 
 
 class IntegerField(Field):
     """:class:`Field` subclass with builtin `integer` validation."""
 
+    struct_format = 'q'
+
     def __init__(self, *args, **kwargs):
-        super(IntegerField, self).__init__(builtin_validators.Integer(), *args, **kwargs)
+        super(IntegerField, self).__init__(
+            builtin_validators.shared(builtin_validators.Integer), *args, **kwargs)
         min_value = kwargs.get('min_value')
         max_value = kwargs.get('max_value')
         if min_value:
-            self.validators.append(builtin_validators.Min(min_value))
+            self.validators.append(
+                builtin_validators.shared(builtin_validators.Min, min_value))
         if max_value:
-            self.validators.append(builtin_validators.Max(max_value))
+            self.validators.append(
+                builtin_validators.shared(builtin_validators.Max, max_value))
 
     def __set__(self, instance, value):
         try:
@@ -71,26 +79,34 @@ class IntegerField(Field):
 class FloatField(Field):
     """:class:`Field` subclass with builtin `float` validation."""
 
+    struct_format = 'd'
+
     def __init__(self, *args, **kwargs):
-        super(FloatField, self).__init__(builtin_validators.Float(), *args, **kwargs)
+        super(FloatField, self).__init__(
+            builtin_validators.shared(builtin_validators.Float), *args, **kwargs)
         min_value = kwargs.get('min_value')
         max_value = kwargs.get('max_value')
         if min_value:
-            self.validators.append(builtin_validators.Min(min_value))
+            self.validators.append(
+                builtin_validators.shared(builtin_validators.Min, min_value))
         if max_value:
-            self.validators.append(builtin_validators.Max(max_value))
+            self.validators.append(
+                builtin_validators.shared(builtin_validators.Max, max_value))
 
 
 class BooleanField(Field):
     """:class:`Field` subclass with builtin `bool` validation."""
 
+    struct_format = '?'
+
     def __init__(self, *args, **kwargs):
-        super(BooleanField, self).__init__(builtin_validators.Boolean(), *args, **kwargs)
+        super(BooleanField, self).__init__(
+            builtin_validators.shared(builtin_validators.Boolean), *args, **kwargs)
 
 
-class EmbeddedField(Field):
+class EmbeddedField(LazyField):
     """:class:`Field` subclass with builtin embedded :class:`models.Model`
-    validation.
+    validation. See :class:`base.LazyField` for the `lazy` option.
 
     """
 
@@ -102,19 +118,32 @@ class EmbeddedField(Field):
 
     def __set__(self, instance, value):
         if isinstance(value, dict):
-            value = self.model(**value)
+            value = build_model(self.model, value)
 
         super(EmbeddedField, self).__set__(instance, value)
 
     def to_plain(self, value):
+        if type(value) is LazyValue:
+            return value.plain
         return value and value.to_plain() or None
 
+    def load(self, value):
+        if isinstance(value, dict):
+            return build_model(self.model, value, plain=True)
+        return value
+
 
 def fetch_model(validators):
+    """Splits the given `validators` in the model validators and the inner
+    validators, returning a `(model, model_validators, inner_validators)`
+    tuple. Inner validators are instances of the classes registered with
+    :func:`validators.register`, or any other object with a callable
+    `validate` method.
+
+    """
+
     inner_validators, model_validators = [], []
     model = None
-    all_classes = tuple(v[1] for v in inspect.getmembers(
-        builtin_validators, inspect.isclass))
     for validator in validators:
         if inspect.isclass(validator) and issubclass(validator, Model):
             if model is not None:
@@ -128,11 +157,30 @@ def fetch_model(validators):
                     'be only one model validator')
             model = validator.model
             model_validators.append(validator)
-        elif isinstance(validator, all_classes):
+        elif builtin_validators.is_registered(validator):
+            inner_validators.append(validator)
+        elif (not inspect.isclass(validator) and
+                callable(getattr(validator, 'validate', None))):
             inner_validators.append(validator)
     return model, model_validators, inner_validators
 
 
+def build_model(model, value, plain=False):
+    """Builds a `model` instance from the `value` dict. If `plain` is
+    `True` the dict values are plain values and are loaded through
+    :func:`models.Model.from_plain_dict`. Either way, keys that aren't
+    fields of the `model` raise :class:`errors.FieldError`.
+
+    """
+
+    if plain:
+        result = model.from_plain_dict(value)
+        if result._stale is not None:
+            _check_keys(result)
+        return result
+    return model(**value)
+
+
 def ensure_iterable(value):
     if not value:
         return ()
@@ -141,8 +189,9 @@ def ensure_iterable(value):
     return value
 
 
-class ListField(Field):
+class ListField(LazyField):
     """:class:`Field` subclass validates a list of another fields or models.
+    See :class:`base.LazyField` for the `lazy` option.
 
     Parameters:
     ----------
@@ -162,41 +211,69 @@ class ListField(Field):
     def __set__(self, instance, value):
         if isinstance(value, (list, tuple)) and len(value) and self.model:
             if not isinstance(value[0], self.model):
-                value = self.to_python(value)
+                value = self._build(value)
 
         super(ListField, self).__set__(instance, value)
 
     def to_plain(self, value):
-        return value and map(lambda s: isinstance(s, Model) \
-            and s.to_plain() or s, value) or None
+        if type(value) is LazyValue:
+            return value.plain
+        if not value:
+            return None
+        return [item.to_plain() if isinstance(item, Model) else item
+            for item in value]
 
-    def to_python(self, value):
-        return value and map(lambda s: self.model and \
-            self.model(**s) or s, value) or value
+    def load(self, value):
+        if not value or not self.model:
+            return value
+        return self._build(value, plain=True)
+
+    def _build(self, value, plain=False):
+        if plain:
+            # Loaded lists track their changes, see Model.to_plain.
+            result = _TrackedList()
+            list.extend(result,
+                self.model._load_many(value, result, strict=True))
+            return result
+        return [build_model(self.model, item) for item in value]
 
 
 class DateTimeField(Field):
     """:class:`Field` subclass validates a list of another fields or models.
+
+    The default format and its ISO 8601 variants are parsed and formatted
+    through the fast paths in :mod:`datetimes`.
+
+    :param format: The :func:`datetime.datetime.strptime` format of the
+        plain values. Defaults to ``'%Y-%m-%d %H:%M:%S'``.
+    :param cache_size: If given, the last `cache_size` distinct parsed
+        strings are cached. See :func:`datetimes.parser`.
     """
     def __init__(self, *args, **kwargs):
-        super(DateTimeField, self).__init__(builtin_validators.DateTime(),
+        super(DateTimeField, self).__init__(
+            builtin_validators.shared(builtin_validators.DateTime),
             *args, **kwargs)
-        self.format = self.options.get('format', '%Y-%m-%d %H:%M:%S')
+        self.format = self.options.get('format', datetimes.DEFAULT_FORMAT)
+        self._parse = datetimes.parser(self.format,
+            self.options.get('cache_size'))
+        self._format = datetimes.formatter(self.format)
 
     def to_plain(self, value):
-        return value and value.strftime(self.format) or value
+        return value and self._format(value) or value
 
     def to_python(self, value):
         if(isinstance(value, datetime.datetime)):
             return value
-        return value and datetime.datetime.strptime(value, self.format) or None
+        return value and self._parse(value) or None
 
 
-class DictField(Field):
+class DictField(LazyField):
     """:class:`Field` subclass validates a dict of another fields or models.
+    See :class:`base.LazyField` for the `lazy` option.
     """
     def __init__(self, key=None, value=None, *args, **kwargs):
-        super(DictField, self).__init__(builtin_validators.Dict(),
+        super(DictField, self).__init__(
+            builtin_validators.shared(builtin_validators.Dict),
             *args, **kwargs)
         key = ensure_iterable(key)
         value = ensure_iterable(value)
@@ -209,7 +286,7 @@ class DictField(Field):
             first_key, first_value = value.iteritems().next()
             if (self.value_model and not isinstance(first_value, self.value_model)) \
             or (self.key_model and not isinstance(first_key, self.key_model)):
-                value = self.to_python(value)
+                value = self._build(value)
 
         super(DictField, self).__set__(instance, value)
 
@@ -222,25 +299,63 @@ class DictField(Field):
                 for validator in self.value_validators:
                     validator.validate(value)
 
+    def collect_errors(self, value, path, result):
+        if builtin_validators.collect_errors(self.validators, value, path,
+                result):
+            return True
+
+        failed = False
+        if value and (self.key_validators or self.value_validators):
+            for key, item in value.iteritems():
+                item_path = builtin_validators.item_path(path, key)
+                if builtin_validators.collect_errors(self.key_validators, key,
+                        item_path, result):
+                    failed = True
+                elif builtin_validators.collect_errors(self.value_validators,
+                        item, item_path, result):
+                    failed = True
+        return failed
+
     def to_plain(self, value):
+        if type(value) is LazyValue:
+            return value.plain
         if not value:
             return None
         result = {}
         for key, value in value.iteritems():
-            key = isinstance(key, Model) and key.to_plain() or key
-            value = isinstance(value, Model) and value.to_plain() or value
+            if isinstance(key, Model):
+                key = key.to_plain()
+            if isinstance(value, Model):
+                value = value.to_plain()
             result[key] = value
         return result
 
-    def to_python(self, value):
+    def load(self, value):
         if not value:
             return None
+        return self._build(value, plain=True)
+
+    def _build(self, value, plain=False):
+        if plain and not self.key_model:
+            # Loaded dicts track their changes, see Model.to_plain.
+            result = _TrackedDict()
+            values = value.values()
+            if self.value_model:
+                values = self.value_model._load_many(values, result,
+                    strict=True)
+            dict.update(result, zip(value, values))
+            return result
+
         result = {}
+        if plain:
+            result = _TrackedDict()
+            # Key `models` never serialize to their plain keys.
+            result._stale = True
         for key, value in value.iteritems():
             if self.key_model:
-                key = self.key_model(**key)
+                key = build_model(self.key_model, key, plain)
             if self.value_model:
-                value = self.value_model(**value)
+                value = build_model(self.value_model, value, plain)
             result[key] = value
         return result
 
@@ -249,4 +364,5 @@ class EmailField(Field):
     """:class:`Field` subclass with builtin `email` validation."""
 
     def __init__(self, *args, **kwargs):
-        super(EmailField, self).__init__(builtin_validators.Email(), *args, **kwargs)
+        super(EmailField, self).__init__(
+            builtin_validators.shared(builtin_validators.Email), *args, **kwargs)
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Jaime Gil de Sagredo Luna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The `instrument` module profiles the validation and the conversion of
+the `models` fields, to find out which field or validator makes a `model`
+slow to validate, load or serialize.
+
+While instrumentation is enabled, every field validator run by
+:func:`models.Model.validate` and :func:`models.Model.errors`, and every
+`to_python` and `to_plain` conversion run by
+:func:`models.Model.from_plain_dict` and :func:`models.Model.to_plain`,
+is counted and timed by `(model, field, validator, operation)`::
+
+    with instrumented():
+        User.from_plain_dict(plain).validate()
+
+    print to_prometheus()
+
+Instrumentation works replacing the compiled plans of the `model` classes
+with plans that wrap every call, so it costs nothing while it's disabled.
+Enabling and disabling it recompiles the plans of all the `models`, so
+it's meant to be switched rarely.
+"""
+
+import timeit
+import contextlib
+
+from booby import base, models
+
+_timer = timeit.default_timer
+
+# The statistics by `(model, field, validator, operation)`, as
+# `[calls, seconds, failures]` lists.
+_stats = {}
+
+
+def enable():
+    """Enables the instrumentation of all the `models`."""
+
+    base._plan_hook = _instrument_plan
+    _reset_models()
+
+
+def disable():
+    """Disables the instrumentation of all the `models`. The collected
+    statistics are kept until :func:`reset` is called.
+
+    """
+
+    base._plan_hook = None
+    _reset_models()
+
+
+def is_enabled():
+    """Returns `True` if the instrumentation is enabled."""
+
+    return base._plan_hook is _instrument_plan
+
+
+@contextlib.contextmanager
+def instrumented():
+    """A context manager that enables the instrumentation within its
+    block, and restores the previous state when leaving it.
+
+    """
+
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def reset():
+    """Discards the collected statistics."""
+
+    # The instrumented plans keep their entries, so they are zeroed.
+    for entry in _stats.itervalues():
+        entry[:] = [0, 0.0, 0]
+
+
+def stats():
+    """Returns a `dict` with the collected statistics. Keys are
+    `(model, field, validator, operation)` tuples, where `operation` is
+    ``'validate'``, ``'to_python'`` or ``'to_plain'`` and `validator` is
+    the name of the validator class, or of the field class for
+    conversions and fields that override :func:`Field.validate`. Values
+    are dicts with the number of `calls`, the cumulative `time` in seconds
+    and the number of `failures`: raised errors or, for embedded values,
+    calls that found errors. Entries that weren't called are left out.
+
+    """
+
+    return dict((key, {'calls': calls, 'time': seconds, 'failures': failures})
+        for key, (calls, seconds, failures) in _called())
+
+
+def to_prometheus(prefix='booby'):
+    """Returns the collected statistics in the Prometheus text exposition
+    format, as three counters with the `model`, `field`, `validator` and
+    `operation` labels: ``<prefix>_calls_total``,
+    ``<prefix>_seconds_total`` and ``<prefix>_failures_total``.
+
+    """
+
+    metrics = (
+        ('calls_total', 'Number of calls.', 0),
+        ('seconds_total', 'Cumulative time of the calls, in seconds.', 1),
+        ('failures_total', 'Number of failed calls.', 2),
+    )
+
+    items = sorted(_called())
+    lines = []
+    for name, help_, position in metrics:
+        name = '{}_{}'.format(prefix, name)
+        lines.append('# HELP {} {}'.format(name, help_))
+        lines.append('# TYPE {} counter'.format(name))
+        for key, values in items:
+            lines.append('{}{{{}}} {!r}'.format(name, _labels(key),
+                values[position]))
+    return '\n'.join(lines) + '\n'
+
+
+def _called():
+    return [(key, entry) for key, entry in _stats.iteritems() if entry[0]]
+
+
+def _labels(key):
+    return ','.join('{}="{}"'.format(label, _escape(value))
+        for label, value in zip(
+            ('model', 'field', 'validator', 'operation'), key))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n')
+
+
+def _reset_models():
+    pending = [models.Model]
+    while pending:
+        model = pending.pop()
+        base._reset(model)
+        pending.extend(model.__subclasses__())
+
+
+def _entry(key):
+    try:
+        return _stats[key]
+    except KeyError:
+        entry = _stats[key] = [0, 0.0, 0]
+        return entry
+
+
+def _timed(key, function):
+    """Returns a function that calls `function` recording its statistics
+    as `key`. Raised errors count as failures.
+
+    """
+
+    entry = _entry(key)
+
+    def wrapper(*args):
+        start = _timer()
+        try:
+            return function(*args)
+        except Exception:
+            entry[2] += 1
+            raise
+        finally:
+            entry[0] += 1
+            entry[1] += _timer() - start
+    return wrapper
+
+
+def _timed_collect(key, collect_errors):
+    """Like :func:`_timed` for :func:`Field.collect_errors`, which returns
+    `True` when it finds errors.
+
+    """
+
+    entry = _entry(key)
+
+    def wrapper(value, path, result):
+        start = _timer()
+        try:
+            failed = collect_errors(value, path, result)
+        finally:
+            entry[0] += 1
+            entry[1] += _timer() - start
+        if failed:
+            entry[2] += 1
+        return failed
+    return wrapper
+
+
+def _check_name(check):
+    owner = getattr(check, '__self__', None)
+    if owner is None:
+        return getattr(check, '__name__', type(check).__name__)
+    return type(owner).__name__
+
+
+def _instrument_plan(name, model, plan):
+    if name == '_validation_plan':
+        return tuple(_instrument_validation(model.__name__, entry)
+            for entry in plan)
+    if name == '_serialization_plan':
+        return tuple(_instrument_serialization(model.__name__, entry)
+            for entry in plan)
+    if name == '_loading_plan':
+        return dict((field_name, _instrument_loading(model.__name__,
+            field_name, entry)) for field_name, entry in plan.iteritems())
+    return plan
+
+
+def _instrument_validation(model_name, entry):
+    name, field, direct, none_checks, value_checks, collect_errors = entry
+
+    # The same check may be in both tuples, so they share their wrapper.
+    wrappers = {}
+
+    def wrap(check):
+        try:
+            return wrappers[check]
+        except KeyError:
+            wrapper = wrappers[check] = _timed(
+                (model_name, name, _check_name(check), 'validate'), check)
+            return wrapper
+
+    if collect_errors is not None:
+        collect_errors = _timed_collect(
+            (model_name, name, type(field).__name__, 'validate'),
+            collect_errors)
+
+    return (name, field, direct, tuple(wrap(c) for c in none_checks),
+        tuple(wrap(c) for c in value_checks), collect_errors)
+
+
+def _instrument_serialization(model_name, entry):
+    name, field, direct, _ = entry
+
+    # Fields returning their values unchanged are timed too, so every
+    # field shows up in the statistics.
+    return (name, field, direct, _timed(
+        (model_name, name, type(field).__name__, 'to_plain'),
+        field.to_plain))
+
+
+def _instrument_loading(model_name, name, entry):
+    field, direct, _, adopts = entry
+
+    return (field, direct, _timed(
+        (model_name, name, type(field).__name__, 'to_python'),
+        field.to_python), adopts)
@@ -38,10 +38,17 @@ Something like this::
     '{"owner": {"login": "jaimegildesagredo", "name": "Jaime Gil de Sagredo"}, "name": "Booby"}'
 """
 
-import anyjson as json
+import datetime
 
-from booby import errors
-from booby.base import ModelMeta
+from booby import binary, errors, serializers, streams, validators
+from booby.base import ModelMeta, LazyField, LazyValue, _adopt, _OTHER_KEYS
+
+# Validation results are cached only for values of immutable types, which
+# can't change without being assigned again.
+CACHEABLE_TYPES = frozenset([type(None), bool, int, long, float, str,
+    unicode, datetime.date, datetime.datetime])
+
+_MISSING = object()
 
 
 class Model(object):
@@ -68,10 +75,26 @@ class Model(object):
     """
 
     __metaclass__ = ModelMeta
+    # The `model` state lives in slots, so instances only get a `__dict__`
+    # when other attributes are set on them. See :class:`CompactModel`.
+    __slots__ = ('_data', '_changed', '_valid', '_source', '_stale',
+        '_parent')
+
+    #: The name of the json backend used by this `model` class, or
+    #: :keyword:`None` to use the default one. See :mod:`serializers`.
+    json_backend = None
 
     def __new__(cls, *args, **kwargs):
         model = super(Model, cls).__new__(cls)
         model._data = {}
+        model._changed = None
+        model._valid = None
+        model._source = None
+        # The fields whose values may no longer serialize to the plain ones
+        # this `model` was loaded from, and the `(model, field)` or the
+        # loaded container holding it. See Model.to_plain.
+        model._stale = None
+        model._parent = None
 
         return model
 
@@ -82,9 +105,40 @@ class Model(object):
 
             setattr(self, k, v)
 
+    def __getstate__(self):
+        # Values are keyed by field name, since the fields of the unpickled
+        # `model` class are not the pickled ones.
+        data = self._data
+        values = {}
+        for name, field, direct, _ in self._serialization_plan:
+            if direct:
+                value = data.get(field, _MISSING)
+                if value is not _MISSING:
+                    values[name] = value
+            else:
+                values[name] = getattr(self, name)
+
+        changed = None
+        if self._changed is not None:
+            changed = [name for name, field in self._fields.iteritems()
+                if field in self._changed]
+        return {'data': values, 'changed': changed}
+
+    def __setstate__(self, state):
+        fields = self._fields
+        self._data = dict((fields[name], value)
+            for name, value in state['data'].iteritems() if name in fields)
+        self._changed = None
+        if state['changed'] is not None:
+            self._changed = set(fields[name] for name in state['changed']
+                if name in fields)
+        self._valid = None
+        self._source = None
+        self._stale = None
+        self._parent = None
+
     def __raise_field_error(self, name):
-        raise errors.FieldError("'{}' model has no field '{}'".format(
-            type(self).__name__, name))
+        raise _field_error(type(self), name)
 
     def __contains__(self, k):
         return k in self._fields
@@ -138,29 +192,221 @@ class Model(object):
 
         """
 
-        for name, field in self._fields.iteritems():
-            field.validate(getattr(self, name))
+        data = self._data
+        valid = self._valid
+        if valid is None:
+            valid = self._valid = {}
+
+        for name, field, direct, none_checks, value_checks, _ in \
+                self._validation_plan:
+            if direct:
+                value = data.get(field, field.default)
+            else:
+                value = getattr(self, name)
+
+            if valid.get(field, _MISSING) is value:
+                continue
+
+            for check in none_checks if value is None else value_checks:
+                check(value)
+
+            if type(value) in CACHEABLE_TYPES:
+                valid[field] = value
+
+    def errors(self):
+        """This method validates the entire `model` like
+        :func:`Model.validate`, but instead of raising the first error it
+        returns a `list` of `(path, error)` tuples with the first
+        :class:`errors.ValidationError` of every invalid field.
+
+        Errors within embedded `models`, lists and dicts are collected too
+        and their `path` is the full path to the invalid value, as in
+        ``owner.token.key``, ``books[3].title`` or ``tags["x"]``. An empty
+        `list` means that the `model` is valid.
+
+        """
+
+        result = []
+        self._collect_errors('', result)
+        return result
+
+    def _collect_errors(self, path, result):
+        # Models overriding validate may check more than their fields.
+        if type(self).validate.__func__ is not Model.validate.__func__:
+            try:
+                self.validate()
+            except errors.ValidationError as error:
+                result.append((path, error))
+            return
+
+        data = self._data
+        valid = self._valid or {}
+        for name, field, direct, none_checks, value_checks, collect_errors in \
+                self._validation_plan:
+            if direct:
+                value = data.get(field, field.default)
+            else:
+                value = getattr(self, name)
+
+            if valid.get(field, _MISSING) is value:
+                continue
+
+            if collect_errors is not None:
+                collect_errors(value, validators.field_path(path, name),
+                    result)
+                continue
+
+            try:
+                for check in none_checks if value is None else value_checks:
+                    check(value)
+            except errors.ValidationError as error:
+                result.append((validators.field_path(path, name), error))
+
+    def changed_fields(self):
+        """This method returns a `set` with the names of the `fields`
+        assigned since this `model` was loaded with
+        :func:`Model.from_plain_dict` or since the last call to
+        :func:`Model.clear_changes`, including the fields holding
+        embedded `models`, or lists and dicts of `models`, with changes.
+
+        """
+
+        changed = self._changed or ()
+        data = self._data
+        result = set()
+        for name, field, direct, _ in self._serialization_plan:
+            if field in changed:
+                result.add(name)
+                continue
+
+            if direct:
+                value = data.get(field, field.default)
+            else:
+                value = getattr(self, name)
+
+            if _has_changes(value):
+                result.add(name)
+        return result
+
+    def clear_changes(self):
+        """This method forgets the changes of this `model` and its embedded
+        `models`, for example after saving them.
+
+        """
+
+        self._changed = None
+
+        data = self._data
+        for name, field, direct, _ in self._serialization_plan:
+            if direct:
+                value = data.get(field, field.default)
+            else:
+                value = getattr(self, name)
+
+            for model in _iter_models(value):
+                model.clear_changes()
+
+    def clear_validation(self):
+        """This method forgets the values already validated by this `model`
+        and its embedded `models`, so the next call to
+        :func:`Model.validate` runs the validators of every field again.
+
+        """
+
+        self._valid = None
+
+        data = self._data
+        for name, field, direct, _ in self._serialization_plan:
+            if direct:
+                value = data.get(field, field.default)
+            else:
+                value = getattr(self, name)
+
+            for model in _iter_models(value):
+                model.clear_validation()
 
     def to_dict(self):
         """This method returns the `model` as a `dict`."""
 
+        data = self._data
         result = {}
-        for field in self._fields:
-            value = getattr(self, field)
+        for name, field, direct, _ in self._serialization_plan:
+            if direct:
+                value = data.get(field, field.default)
+            else:
+                value = getattr(self, name)
+
+            if isinstance(value, LazyValue):
+                value = getattr(self, name)
 
             if isinstance(value, Model):
-                result[field] = value.to_dict()
+                result[name] = value.to_dict()
             else:
-                result[field] = value
+                result[name] = value
         return result
 
-    def to_plain(self):
-        """This method returns the `model` as a `dict`."""
+    def to_plain(self, only_changed=False):
+        """This method returns the `model` as a `dict`.
+
+        :param only_changed: If `True` only the fields returned by
+            :func:`Model.changed_fields` are included. Embedded `models`
+            that were changed but not assigned again return their changes
+            only, which makes a cheap payload for partial updates.
+
+        Embedded `models`, lists and dicts that weren't modified since the
+        `model` was loaded with :func:`Model.from_plain_dict` aren't built
+        again, the original plain values are returned instead. So they are
+        shared between the returned dict and the loaded one, and values
+        loaded in a non canonical form, like datetimes that aren't zero
+        padded, are returned as they were loaded. Modifications are tracked
+        as they are made, so the unmodified values are found without
+        walking them.
 
+        """
+
+        if only_changed:
+            return self._changes_to_plain()
+
+        data = self._data
+        source = self._source
+        stale = self._stale or ()
         result = {}
-        for field in self._fields:
-            value = getattr(self, field)
-            result[field] = self._fields[field].to_plain(value)
+        for name, field, direct, to_plain in self._serialization_plan:
+            if direct:
+                value = data.get(field, field.default)
+            else:
+                value = getattr(self, name)
+
+            if to_plain is None:
+                result[name] = value
+            elif (source is not None and field not in stale and
+                    isinstance(field, LazyField) and name in source):
+                result[name] = source[name]
+            else:
+                result[name] = to_plain(value)
+        return result
+
+    def _changes_to_plain(self):
+        changed = self._changed or ()
+        data = self._data
+        result = {}
+        for name, field, direct, to_plain in self._serialization_plan:
+            if direct:
+                value = data.get(field, field.default)
+            else:
+                value = getattr(self, name)
+
+            if field not in changed:
+                if not _has_changes(value):
+                    continue
+                if isinstance(value, Model):
+                    result[name] = value._changes_to_plain()
+                    continue
+
+            if to_plain is None:
+                result[name] = value
+            else:
+                result[name] = to_plain(value)
         return result
 
     def to_json(self):
@@ -171,14 +417,396 @@ class Model(object):
 
         """
 
-        return json.dumps(self.to_plain())
+        return serializers.get_backend(self.json_backend).dumps(
+            self.to_plain())
+
+    def to_json_bytes(self):
+        """This method returns the `model` as utf-8 encoded `json` bytes.
+        Backends that encode to bytes natively, like ``'orjson'``, skip the
+        text encoding step.
+
+        """
+
+        return serializers.get_backend(self.json_backend).dumps_bytes(
+            self.to_plain())
 
     @classmethod
     def from_plain_dict(cls, plain_dict):
-        obj = cls()
-        obj.update(dict_=plain_dict, plain_=True)
+        """This method returns a new `model` loaded from the given dict of
+        plain values, as returned by :func:`Model.to_plain`. Keys that
+        aren't fields of this `model` are ignored.
+
+        The `model` keeps a reference to `plain_dict`, so unmodified
+        embedded values can be serialized again without being rebuilt.
+
+        """
+
+        # The body of _load_many for a single record, inlined since
+        # embedded `models` are loaded one at a time.
+        loading_plan = cls._loading_plan
+        if _builds_bare(cls):
+            obj = _new(cls)
+            data = obj._data = {}
+            obj._changed = obj._valid = obj._source = obj._parent = None
+        else:
+            obj = cls()
+            data = obj._data
+
+        stale = None
+        for name, value in plain_dict.iteritems():
+            entry = loading_plan.get(name)
+            if entry is None:
+                stale = _marked(stale, _OTHER_KEYS)
+                continue
+
+            field, direct, to_python, adopts = entry
+            plain = value
+            if to_python is not None:
+                value = to_python(value)
+
+            if direct:
+                data[field] = value
+            else:
+                setattr(obj, name, value)
+                if value is plain and data.get(field) is not value:
+                    stale = _marked(stale, field)
+
+            if adopts and not _adopt(obj, field, value, plain):
+                stale = _marked(stale, field)
+
+        if len(plain_dict) != len(loading_plan):
+            # Some fields are missing.
+            stale = _marked(stale, _OTHER_KEYS)
+
+        obj._changed = None
+        obj._source = plain_dict
+        obj._stale = stale
         return obj
 
+    @classmethod
+    def from_plain_many(cls, plain_dicts):
+        """This method returns a `list` of new `models` loaded from the
+        given iterable of plain dicts, in the same order. See
+        :func:`Model.from_plain_dict`. The loading plan is looked up once
+        for all of them, so it's the fastest way to load many records,
+        and the way lists and dicts of embedded `models` are loaded.
+
+        """
+
+        return cls._load_many(plain_dicts)
+
+    @classmethod
+    def _load_many(cls, plain_dicts, container=None, strict=False):
+        # Loads the `models` of `plain_dicts` held by the loaded list or
+        # dict `container`, linking them to it and marking it as stale if
+        # some of them won't serialize to their plain dicts. If `strict`
+        # is `True` unknown keys raise FieldError, as in the constructor.
+        loading_plan = cls._loading_plan
+        get_entry = loading_plan.get
+        field_count = len(loading_plan)
+        bare = _builds_bare(cls)
+
+        result = []
+        for plain_dict in plain_dicts:
+            if bare:
+                obj = _new(cls)
+                data = obj._data = {}
+                obj._changed = obj._valid = obj._source = None
+            else:
+                obj = cls()
+                data = obj._data
+
+            # The fields whose values won't serialize to the loaded ones.
+            stale = None
+            for name, value in plain_dict.iteritems():
+                entry = get_entry(name)
+                if entry is None:
+                    if strict:
+                        raise _field_error(cls, name)
+                    stale = _marked(stale, _OTHER_KEYS)
+                    continue
+
+                field, direct, to_python, adopts = entry
+                plain = value
+                if to_python is not None:
+                    value = to_python(value)
+
+                if direct:
+                    data[field] = value
+                else:
+                    setattr(obj, name, value)
+                    if value is plain and data.get(field) is not value:
+                        stale = _marked(stale, field)
+
+                if adopts and not _adopt(obj, field, value, plain):
+                    stale = _marked(stale, field)
+
+            if len(plain_dict) != field_count:
+                stale = _marked(stale, _OTHER_KEYS)
+
+            obj._changed = None
+            obj._source = plain_dict
+            obj._stale = stale
+            obj._parent = container
+            if stale is not None and container is not None:
+                container._stale = True
+            result.append(obj)
+        return result
+
+    @classmethod
+    def validate_many(cls, records):
+        """This method validates all the given `records`, which can be
+        `models` or plain dicts to be loaded with
+        :func:`Model.from_plain_dict`. Unlike :func:`Model.validate` this
+        method doesn't stop at the first invalid record.
+
+        Returns a `list` of `(index, error)` tuples, in input order, with
+        the position and the :class:`errors.BoobyError` raised for every
+        record that failed to load or validate. An empty `list` means
+        that all the records are valid.
+
+        """
+
+        result = []
+        for index, record in enumerate(records):
+            try:
+                if not isinstance(record, Model):
+                    record = cls.from_plain_dict(record)
+                record.validate()
+            except errors.BoobyError as error:
+                result.append((index, error))
+        return result
+
+    @classmethod
+    def to_plain_many(cls, models):
+        """This method returns a `list` with the plain dicts of the given
+        `models`, in the same order. See :func:`Model.to_plain`.
+
+        """
+
+        return [model.to_plain() for model in models]
+
+    def to_bytes(self):
+        """This method returns the `model` encoded as bytes by the compact
+        :mod:`binary` codec. Unlike :func:`Model.to_json` the values aren't
+        converted to plain values first, so integers, floats, booleans and
+        datetimes keep their native encodings.
+
+        """
+
+        return binary.dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """This method returns a new `model` decoded from the bytes returned
+        by :func:`Model.to_bytes`. Raises :class:`errors.DecodeError` if
+        `data` isn't valid.
+
+        """
+
+        return binary.loads(cls, data)
+
+    def pack(self):
+        """This method returns the `model` packed as bytes with the fixed
+        layout of its class, which is only available for `models` whose
+        fields are all :class:`fields.IntegerField`,
+        :class:`fields.FloatField` or :class:`fields.BooleanField`
+        fields. See :class:`base.StructLayout`. Values aren't validated.
+
+        """
+
+        return self._struct().pack(self)
+
+    @classmethod
+    def unpack(cls, buf, offset=0):
+        """This method returns a new `model` unpacked from the given bytes,
+        `bytearray`, `mmap` or any other buffer, at `offset`. See
+        :func:`Model.pack`.
+
+        """
+
+        return cls._struct().unpack(cls, buf, offset)
+
+    @classmethod
+    def pack_many(cls, models):
+        """This method returns the given `models` packed as consecutive
+        records. See :func:`Model.pack`.
+
+        """
+
+        layout = cls._struct()
+        models = list(models)
+
+        buf = bytearray(layout.size * len(models))
+        for index, model in enumerate(models):
+            layout.pack_into(buf, index * layout.size, model)
+        return bytes(buf)
+
+    @classmethod
+    def unpack_many(cls, buf, offset=0, count=None):
+        """This method returns a `list` of new `models` unpacked from the
+        consecutive records in the given buffer, starting at `offset`. If
+        `count` is :keyword:`None` all the records until the end of the
+        buffer are unpacked. See :func:`Model.iter_unpack`.
+
+        """
+
+        return list(cls.iter_unpack(buf, offset, count))
+
+    @classmethod
+    def iter_unpack(cls, buf, offset=0, count=None):
+        """This method is a generator that yields new `models` unpacked
+        from the consecutive records in the given buffer, reading them
+        straight from the buffer, so a memory mapped file of records is
+        never copied. See :func:`Model.unpack_many`.
+
+        """
+
+        return cls._struct().iter_unpack(cls, buf, offset, count)
+
+    @classmethod
+    def _struct(cls):
+        if cls._struct_layout is None:
+            raise errors.BoobyError(
+                "'{}' model can't be packed, all its fields should have "
+                "a struct format".format(cls.__name__))
+        return cls._struct_layout
+
     @classmethod
     def from_json(cls, json_string):
-        return cls.from_plain_dict(json.loads(json_string))
+        """This method returns a new `model` loaded from the given `json`
+        string or utf-8 encoded bytes, which are decoded by the json
+        backend without being decoded to text first.
+
+        """
+
+        return cls.from_plain_dict(
+            serializers.get_backend(cls.json_backend).loads(json_string))
+
+    @classmethod
+    def iter_json(cls, fileobj, validate=False,
+            chunk_size=streams.DEFAULT_CHUNK_SIZE):
+        """This method is a generator that lazily yields `models` loaded
+        from the given file-like object, which should contain either
+        `json lines` or a top-level json array of plain dicts. Only one
+        record is kept in memory at a time. See
+        :func:`streams.iter_json_values`.
+
+        :param fileobj: A file-like object with a `read(size)` method.
+        :param validate: If `True` every `model` is validated before being
+            yielded, raising the first :class:`errors.ValidationError`.
+        :param chunk_size: The number of bytes read from `fileobj` at once.
+
+        """
+
+        for plain_dict in streams.iter_json_values(fileobj, chunk_size):
+            model = cls.from_plain_dict(plain_dict)
+            if validate:
+                model.validate()
+            yield model
+
+
+def _iter_models(value):
+    if isinstance(value, Model):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, Model):
+                yield item
+    elif isinstance(value, dict):
+        for key, item in value.iteritems():
+            if isinstance(key, Model):
+                yield key
+            if isinstance(item, Model):
+                yield item
+
+
+_new = object.__new__
+
+
+def _field_error(model, name):
+    return errors.FieldError("'{}' model has no field '{}'".format(
+        model.__name__, name))
+
+
+def _check_keys(model):
+    """Raises :class:`errors.FieldError` if the `model` was loaded from a
+    plain dict with keys that aren't its fields.
+
+    """
+
+    if model._stale is not None and _OTHER_KEYS in model._stale:
+        for name in model._source:
+            if name not in model._fields:
+                raise _field_error(type(model), name)
+
+
+def _builds_bare(model):
+    """Returns `True` if the instances of the `model` class can be built
+    without calling its `__new__` and `__init__` methods, because it
+    doesn't override the :class:`Model` ones.
+
+    """
+
+    return (model.__new__ is Model.__new__ and
+        model.__init__.__func__ is Model.__init__.__func__)
+
+
+def _marked(stale, field):
+    if stale is None:
+        return set([field])
+    stale.add(field)
+    return stale
+
+
+def _has_changes(value):
+    return any(model.changed_fields() for model in _iter_models(value))
+
+
+class CompactModel(Model):
+    """A :class:`Model` whose instances have no per-instance `__dict__`,
+    only the slots of the `model` state. Regular `models` keep their state
+    in slots too, but get a `__dict__` as soon as any other attribute is
+    set on them, which is around 40% of the memory of a small `model`.
+    Compact ones never do, which matters when keeping millions of them in
+    memory. The field values are still kept in the `_data` dict, so field
+    access is as fast as in a regular `model`.
+
+    Subclasses of `CompactModel` get an empty `__slots__` declaration
+    unless they declare their own, so they can't hold attributes other
+    than their :mod:`fields` or the `__slots__` they explicitly declare.
+    Mixins used with a `CompactModel` should declare empty `__slots__`
+    too, otherwise their instances have a `__dict__` again::
+
+        class Point(CompactModel):
+            x = IntegerField()
+            y = IntegerField()
+
+    """
+
+    __slots__ = ()
+    _compact = True
+
+
+def dump_many(models, fileobj, format='ndjson',
+        chunk_size=streams.DEFAULT_WRITE_CHUNK_SIZE, backend=None):
+    """This function writes the given `models` to a file-like object as
+    `json lines` or as a json array, encoding them one at a time with the
+    given json `backend`. The output is written to
+    `fileobj` every `chunk_size` models. See
+    :func:`streams.write_json_values`.
+
+    Returns the number of written `models`.
+
+    :param models: An iterable of `models`.
+    :param fileobj: A file-like object with a `write(data)` method.
+    :param format: Either ``'ndjson'`` or ``'array'``.
+    :param chunk_size: The number of `models` written to `fileobj` at once.
+    :param backend: The name of the json backend, or :keyword:`None` to
+        use the default one. See :mod:`serializers`.
+
+    """
+
+    return streams.write_json_values(
+        (model.to_plain() for model in models), fileobj, format=format,
+        dumps=serializers.get_backend(backend).dumps, chunk_size=chunk_size)
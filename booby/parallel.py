@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Jaime Gil de Sagredo Luna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The `parallel` module loads and validates large collections of plain
+dicts using a pool of worker processes or threads.
+
+The records are sent to the workers in chunks, and every worker loads
+its chunk with :func:`models.Model.from_plain_dict` and validates it. The
+`model` class should be importable by the worker processes, that is,
+declared at module level::
+
+    users, failed = parallel_load(User, records, workers=4)
+    for index, error in failed:
+        print index, error
+
+Services that can't block for a whole batch, like the ones driven by an
+event loop, can use :func:`iter_load` instead, which loads one chunk of
+records every time it's resumed::
+
+    for users, failed in iter_load(User, records):
+        save(users)
+
+Or runs the chunks in a pool and yields their pending results, which the
+caller polls without blocking, like in this generator based coroutine::
+
+    for result in iter_load(User, records, pool=pool):
+        while not result.ready():
+            yield
+        users, failed = result.get()
+"""
+
+import itertools
+import collections
+import multiprocessing
+import multiprocessing.pool
+
+from booby import errors
+
+DEFAULT_CHUNK_SIZE = 1000
+
+EXECUTORS = ('process', 'thread')
+
+
+def parallel_load(model, records, workers=None, executor='process',
+        chunk_size=DEFAULT_CHUNK_SIZE, validate=True, plain=False):
+    """Loads the given plain dicts as instances of the `model` class in a
+    pool of `workers`, validating them unless `validate` is `False`.
+
+    Returns a `(results, errors)` tuple. `results` is a `list` with the
+    loaded `models`, in input order, with :keyword:`None` in place of
+    records that failed to load. `errors` is a `list` of `(index, error)`
+    tuples with the :class:`errors.BoobyError` of every record that failed
+    to load or validate, as :func:`models.Model.validate_many` returns.
+
+    :param model: A subclass of :class:`models.Model`.
+    :param records: An iterable of plain dicts.
+    :param workers: The number of workers. Defaults to the number of
+        CPUs. With a single worker the records are loaded in the calling
+        thread.
+    :param executor: Either ``'process'`` or ``'thread'``. Threads avoid
+        pickling the records and the results, but only help when loading
+        releases the GIL, as when most of the time is spent in C code.
+    :param chunk_size: The number of records sent to a worker at once.
+    :param validate: If `True` every loaded `model` is validated.
+    :param plain: If `True` the results are the plain dicts of the loaded
+        `models`, as returned by :func:`models.Model.to_plain`, which are
+        cheaper to send back from worker processes.
+
+    """
+
+    if executor not in EXECUTORS:
+        raise ValueError('executor should be in {}'.format(EXECUTORS))
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    tasks = ((model, start, chunk, validate, plain)
+        for start, chunk in _chunks(records, chunk_size))
+
+    if workers == 1:
+        return _merge(itertools.imap(_load_chunk, tasks))
+
+    if executor == 'process':
+        pool = multiprocessing.Pool(workers)
+    else:
+        pool = multiprocessing.pool.ThreadPool(workers)
+
+    try:
+        result = _merge(pool.imap(_load_chunk, tasks))
+    except:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+
+    return result
+
+
+def iter_load(model, records, chunk_size=DEFAULT_CHUNK_SIZE, validate=True,
+        plain=False, pool=None, max_pending=2):
+    """A generator that loads the given plain dicts in chunks, yielding a
+    `(results, errors)` tuple for every chunk, in input order, as
+    :func:`parallel_load` returns for the whole input. Error indexes are
+    positions in the whole input.
+
+    Without a `pool` every chunk is loaded when the generator is resumed,
+    so the caller regains control after every `chunk_size` records. With a
+    `pool` the chunks are loaded in its workers and the generator yields
+    their :class:`multiprocessing.pool.AsyncResult` instead, whose `get`
+    method returns the tuple. `get` blocks until the chunk is loaded, so
+    callers that can't block should wait for `ready` to return `True`
+    first. Up to `max_pending` chunks are read from `records` and sent to
+    the `pool` ahead of the yielded one, so they are loaded while the
+    caller handles it, but a consumer that waits for every result before
+    resuming the generator doesn't pile up loaded `models`.
+
+    :param model: A subclass of :class:`models.Model`.
+    :param records: An iterable of plain dicts.
+    :param chunk_size: The number of records in every chunk.
+    :param validate: If `True` every loaded `model` is validated.
+    :param plain: If `True` the results are the plain dicts of the loaded
+        `models`.
+    :param pool: A :class:`multiprocessing.Pool` or
+        :class:`multiprocessing.pool.ThreadPool` where the chunks are
+        loaded.
+    :param max_pending: The number of chunks sent to the `pool` ahead of
+        the yielded one. Raises :class:`ValueError` if it's lower than 1.
+
+    """
+
+    if max_pending < 1:
+        raise ValueError('max_pending should be at least 1')
+    return _iter_load(model, records, chunk_size, validate, plain, pool,
+        max_pending)
+
+
+def _iter_load(model, records, chunk_size, validate, plain, pool,
+        max_pending):
+    tasks = ((model, start, chunk, validate, plain)
+        for start, chunk in _chunks(records, chunk_size))
+
+    if pool is None:
+        for task in tasks:
+            yield _load_chunk(task)
+        return
+
+    pending = collections.deque()
+    for task in tasks:
+        pending.append(pool.apply_async(_load_chunk, (task,)))
+        if len(pending) > max_pending:
+            yield pending.popleft()
+
+    while pending:
+        yield pending.popleft()
+
+
+def _chunks(records, chunk_size):
+    records = iter(records)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+
+        yield start, chunk
+        start += len(chunk)
+
+
+def _load_chunk(task):
+    model, start, chunk, validate, plain = task
+
+    results, failed = [], []
+    for index, record in enumerate(chunk, start):
+        try:
+            obj = model.from_plain_dict(record)
+        except errors.BoobyError as error:
+            results.append(None)
+            failed.append((index, error))
+            continue
+
+        if validate:
+            try:
+                obj.validate()
+            except errors.BoobyError as error:
+                failed.append((index, error))
+
+        results.append(obj.to_plain() if plain else obj)
+    return results, failed
+
+
+def _merge(chunks):
+    results, failed = [], []
+    for chunk_results, chunk_failed in chunks:
+        results.extend(chunk_results)
+        failed.extend(chunk_failed)
+    return results, failed
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Jaime Gil de Sagredo Luna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The `serializers` module contains the registry of json backends used by
+:func:`models.Model.to_json` and :func:`models.Model.from_json`.
+
+The stdlib ``json`` module is always available, as ``'json'``. The
+``'anyjson'``, ``'simplejson'``, ``'ujson'`` and ``'orjson'`` backends are
+registered only if their modules are installed. The default backend is
+``'anyjson'`` when installed and ``'json'`` otherwise.
+
+The default backend can be changed globally, or for a `model` class and its
+subclasses through its `json_backend` attribute::
+
+    set_default_backend('ujson')
+
+    class User(Model):
+        json_backend = 'json'
+
+        login = StringField()
+
+Backends with custom encoder options can be registered too::
+
+    register_backend('sorted', JSONBackend(
+        functools.partial(json.dumps, sort_keys=True), json.loads))
+"""
+
+import json
+
+from booby import errors
+
+try:
+    import anyjson
+except ImportError:
+    anyjson = None
+
+try:
+    import simplejson
+except ImportError:
+    simplejson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONBackend(object):
+    """A json encoder and decoder pair.
+
+    All the backends decode both text and bytes, but they may encode to
+    text or to bytes. The `dumps_bytes` function is used by
+    :func:`models.Model.to_json_bytes`, and defaults to encode the `dumps`
+    output as utf-8 when it's text. Backends that produce bytes natively
+    should pass it to avoid the encode and decode round-trip.
+
+    :param dumps: A function that encodes a plain value as a json string.
+    :param loads: A function that decodes a json string or bytes.
+    :param dumps_bytes: A function that encodes a plain value as json
+        bytes.
+
+    """
+
+    def __init__(self, dumps, loads, dumps_bytes=None):
+        self.dumps = dumps
+        self.loads = loads
+        if dumps_bytes is not None:
+            self.dumps_bytes = dumps_bytes
+
+    def dumps_bytes(self, value):
+        result = self.dumps(value)
+        if not isinstance(result, bytes):
+            result = result.encode('utf-8')
+        return result
+
+
+_backends = {}
+_default = None
+
+
+def register_backend(name, backend):
+    """Registers the given :class:`JSONBackend` as `name`, replacing any
+    backend with the same name.
+
+    """
+
+    _backends[name] = backend
+
+
+def set_default_backend(name):
+    """Sets the backend called `name` as the default one. Raises
+    :class:`errors.BoobyError` if there is no backend called `name`.
+
+    """
+
+    global _default
+    _default = get_backend(name)
+
+
+def available_backends():
+    """Returns a sorted `list` with the names of the registered backends."""
+
+    return sorted(_backends)
+
+
+def get_backend(backend=None):
+    """Returns the registered :class:`JSONBackend` called `backend`, or the
+    default backend if `backend` is :keyword:`None`. :class:`JSONBackend`
+    instances are returned as they are.
+
+    """
+
+    if backend is None:
+        return _default
+    if isinstance(backend, JSONBackend):
+        return backend
+
+    try:
+        return _backends[backend]
+    except KeyError:
+        raise errors.BoobyError("Unknown json backend '{}'".format(backend))
+
+
+def _orjson_dumps(value):
+    return orjson.dumps(value).decode('utf-8')
+
+
+register_backend('json', JSONBackend(json.dumps, json.loads))
+
+if anyjson is not None:
+    register_backend('anyjson', JSONBackend(anyjson.dumps, anyjson.loads))
+
+if simplejson is not None:
+    register_backend('simplejson',
+        JSONBackend(simplejson.dumps, simplejson.loads))
+
+if ujson is not None:
+    register_backend('ujson', JSONBackend(ujson.dumps, ujson.loads))
+
+if orjson is not None:
+    register_backend('orjson',
+        JSONBackend(_orjson_dumps, orjson.loads, dumps_bytes=orjson.dumps))
+
+set_default_backend('anyjson' if anyjson is not None else 'json')
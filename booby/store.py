@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Jaime Gil de Sagredo Luna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The `store` module contains the :class:`ModelStore`, a read-only
+memory mapped file of `models` packed with :func:`models.Model.pack`.
+
+Opening a store doesn't read its records: they are decoded from the
+mapped file only when their fields are accessed, so even huge stores are
+ready to use at once::
+
+    with open('points.store', 'wb') as fileobj:
+        write(Point, fileobj, points)
+
+    with ModelStore(Point, 'points.store') as points:
+        print points[0].x, len(points)
+        xs = points.column('x')
+"""
+
+import array
+import mmap
+import struct
+
+from booby import errors
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAGIC = b'BOOBYST1'
+
+DEFAULT_WRITE_CHUNK_SIZE = 1000
+
+_HEADER_SIZE = struct.Struct('<I')
+
+# The numpy types of the struct format characters used by the fields and
+# the null bitmasks.
+_NUMPY_TYPES = {'q': '<i8', 'd': '<f8', '?': '?', 'B': 'u1', 'H': '<u2',
+    'I': '<u4', 'Q': '<u8'}
+
+# The array typecodes of the columns, by struct format character.
+_ARRAY_TYPECODES = {'q': 'l', 'd': 'd', '?': 'B'}
+
+
+def write(model, fileobj, models, chunk_size=DEFAULT_WRITE_CHUNK_SIZE):
+    """Writes a store with the given `models` to `fileobj`. The records are
+    packed and written every `chunk_size` models.
+
+    Returns the number of written `models`.
+
+    :param model: A subclass of :class:`models.Model` with a struct layout.
+    :param fileobj: A binary file-like object with a `write(data)` method.
+    :param models: An iterable of instances of `model`.
+    :param chunk_size: The number of `models` written at once.
+
+    """
+
+    header = _header(model._struct())
+    fileobj.write(MAGIC)
+    fileobj.write(_HEADER_SIZE.pack(len(header)))
+    fileobj.write(header)
+
+    count = 0
+    chunk = []
+    for obj in models:
+        chunk.append(obj)
+        if len(chunk) == chunk_size:
+            fileobj.write(model.pack_many(chunk))
+            count += len(chunk)
+            chunk = []
+
+    if chunk:
+        fileobj.write(model.pack_many(chunk))
+        count += len(chunk)
+    return count
+
+
+def _header(layout):
+    return '{}\n{}'.format(layout.struct.format,
+        ','.join(layout.names)).encode('utf-8')
+
+
+class ModelStore(object):
+    """A read-only store of records of the given `model` class, mapped
+    from the file at `path`.
+
+    Items are lazy record views: instances of the `model` class whose field
+    values are decoded from the mapped file every time they are read, and
+    can't be assigned.
+
+    Raises :class:`errors.DecodeError` if the file isn't a store of
+    `model` records.
+
+    :param model: A subclass of :class:`models.Model` with a struct layout.
+    :param path: The path of a file written with :func:`write`.
+
+    """
+
+    def __init__(self, model, path):
+        self.model = model
+        self._layout = layout = model._struct()
+
+        with open(path, 'rb') as fileobj:
+            try:
+                self._buffer = mmap.mmap(fileobj.fileno(), 0,
+                    access=mmap.ACCESS_READ)
+            except ValueError:
+                raise errors.DecodeError("'{}' is empty".format(path))
+
+        try:
+            self._offset = self._read_header(path)
+        except Exception:
+            self.close()
+            raise
+
+        size = len(self._buffer) - self._offset
+        if size % layout.size:
+            self.close()
+            raise errors.DecodeError("'{}' has a truncated record".format(path))
+        self._length = size // layout.size
+
+        mask = struct.Struct('<' + layout.struct.format[1])
+        self._readers = {}
+        position = mask.size
+        for bit, field in enumerate(layout.fields):
+            reader = struct.Struct('<' + field.struct_format)
+            self._readers[field] = (1 << bit, reader.unpack_from, position)
+            position += reader.size
+        self._mask = mask.unpack_from
+
+    def _read_header(self, path):
+        buf = self._buffer
+        start = len(MAGIC) + _HEADER_SIZE.size
+
+        if buf[:len(MAGIC)] != MAGIC or len(buf) < start:
+            raise errors.DecodeError("'{}' is not a model store".format(path))
+
+        size = _HEADER_SIZE.unpack_from(buf, len(MAGIC))[0]
+        if buf[start:start + size] != _header(self._layout):
+            raise errors.DecodeError("'{}' is not a store of '{}' records"
+                .format(path, self.model.__name__))
+        return start + size
+
+    def close(self):
+        """Unmaps the store file. Record views can't be read anymore."""
+
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('store index out of range')
+
+        return self._view(index)
+
+    def __iter__(self):
+        for index in xrange(self._length):
+            yield self._view(index)
+
+    def _view(self, index):
+        view = self.model.__new__(self.model)
+        view._data = _RecordData(self._buffer, self._readers, self._mask,
+            self._offset + index * self._layout.size)
+        return view
+
+    def load(self, start=0, stop=None):
+        """Returns a `list` with regular, writable `models` unpacked from
+        the records between the `start` and `stop` indexes. See
+        :func:`models.Model.iter_unpack`.
+
+        """
+
+        start, stop, _ = slice(start, stop).indices(self._length)
+        return self.model.unpack_many(self._buffer,
+            self._offset + start * self._layout.size, max(stop - start, 0))
+
+    def column(self, name):
+        """Returns an :class:`array.array` with the values of the field
+        called `name` of all the records, with `0` in place of
+        :keyword:`None` values.
+
+        """
+
+        field = self._field(name)
+        _, unpack_from, position = self._readers[field]
+        size = self._layout.size
+        start = self._offset + position
+
+        typecode = _ARRAY_TYPECODES[field.struct_format]
+        return array.array(typecode, (unpack_from(self._buffer, offset)[0]
+            for offset in xrange(start, start + self._length * size, size)))
+
+    def to_numpy(self, name):
+        """Returns the values of the field called `name` of all the records
+        as a `numpy` array viewing the mapped file, without copying it,
+        with `0` in place of :keyword:`None` values. Requires `numpy` to
+        be installed.
+
+        """
+
+        if numpy is None:
+            raise errors.BoobyError('numpy is required to use to_numpy')
+
+        self._field(name)
+        layout = self._layout
+        formats = layout.struct.format[1:]
+        dtype = numpy.dtype({
+            'names': ('_mask',) + layout.names,
+            'formats': [_NUMPY_TYPES[fmt] for fmt in formats]})
+
+        records = numpy.ndarray(shape=(self._length,), dtype=dtype,
+            buffer=self._buffer, offset=self._offset)
+        return records[name]
+
+    def _field(self, name):
+        try:
+            return self.model._fields[name]
+        except KeyError:
+            raise errors.FieldError("'{}' model has no field '{}'".format(
+                self.model.__name__, name))
+
+
+class _RecordData(object):
+    """The fields values storage of a store record view."""
+
+    __slots__ = ('buffer', 'readers', 'mask', 'offset')
+
+    def __init__(self, buffer, readers, mask, offset):
+        self.buffer = buffer
+        self.readers = readers
+        self.mask = mask
+        self.offset = offset
+
+    def get(self, field, default=None):
+        bit, unpack_from, position = self.readers[field]
+        if self.mask(self.buffer, self.offset)[0] & bit:
+            return None
+        return unpack_from(self.buffer, self.offset + position)[0]
+
+    def __setitem__(self, field, value):
+        raise errors.BoobyError('Store records are read-only')
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Jaime Gil de Sagredo Luna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The `streams` module contains helpers to read and write large
+collections of json documents incrementally from and to file-like objects,
+keeping in memory only the records being processed.
+
+Both `json lines` (one document per line) and documents with a top-level
+json array are supported::
+
+    with open('users.json') as fileobj:
+        for plain in iter_json_values(fileobj):
+            print plain['login']
+"""
+
+import re
+import json
+import json.scanner
+import codecs
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_WRITE_CHUNK_SIZE = 1000
+
+FORMATS = ('ndjson', 'array')
+
+_WHITESPACE = re.compile(r'\s*')
+
+# The characters of a json number or literal.
+_TOKEN = re.compile(r'[-+.\w]*')
+
+# What can follow the position of a decoding error caused by a value
+# truncated at the end of the buffer: a truncated number or literal.
+_TRUNCATED_TAIL = re.compile(r'\s*[-+.\w]*')
+
+_ERROR_POSITION = re.compile(r'\(char (\d+)')
+
+# The errors of strings truncated at the end of the buffer.
+_TRUNCATED_STRING_ERRORS = ('Unterminated string', 'end is out of bounds')
+
+
+def iter_json_values(fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields the json values read from the given `fileobj`.
+
+    If the first non whitespace character is a ``[`` the document is read
+    as a json array and its items are yielded, otherwise every whitespace
+    separated json value is yielded, as in `json lines` files.
+
+    Raises :class:`ValueError` if the document is not valid json.
+
+    :param fileobj: A file-like object with a `read(size)` method.
+    :param chunk_size: The number of bytes read from `fileobj` at once.
+
+    """
+
+    decoder = json.JSONDecoder()
+    reader = _ChunkReader(fileobj, chunk_size)
+
+    pos = reader.skip_whitespace(0)
+    if reader.startswith('[', pos):
+        is_array = True
+        pos = reader.skip_whitespace(pos + 1)
+        if reader.startswith(']', pos):
+            return
+    else:
+        is_array = False
+
+    while not reader.at_end(pos):
+        value, pos = reader.decode(decoder, pos)
+        yield value
+
+        pos = reader.skip_whitespace(pos)
+        if not is_array:
+            continue
+
+        if reader.startswith(']', pos):
+            return
+        if not reader.startswith(',', pos):
+            raise ValueError("Expecting ',' delimiter or ']' at position "
+                '{}'.format(reader.offset + pos))
+        pos = reader.skip_whitespace(pos + 1)
+
+    if is_array:
+        raise ValueError("Expecting ']' at the end of the document")
+
+
+def write_json_values(values, fileobj, format='ndjson', dumps=json.dumps,
+        chunk_size=DEFAULT_WRITE_CHUNK_SIZE):
+    """Writes the given `values` to `fileobj` as json, either as
+    `json lines` or as a single json array. The encoded values are
+    buffered and written to `fileobj` every `chunk_size` values, so
+    the whole document is never built in memory.
+
+    Returns the number of written values.
+
+    :param values: An iterable of json serializable values.
+    :param fileobj: A file-like object with a `write(data)` method.
+    :param format: Either ``'ndjson'`` or ``'array'``.
+    :param dumps: The function used to encode every value.
+    :param chunk_size: The number of values written to `fileobj` at once.
+
+    """
+
+    if format not in FORMATS:
+        raise ValueError('format should be in {}'.format(FORMATS))
+
+    is_array = format == 'array'
+    if is_array:
+        separator, end = ', ', ']'
+        fileobj.write('[')
+    else:
+        separator, end = '\n', '\n'
+
+    count = 0
+    chunk = []
+    for value in values:
+        chunk.append(dumps(value))
+        count += 1
+
+        if len(chunk) == chunk_size:
+            _write_chunk(fileobj, chunk, separator, count == len(chunk))
+            chunk = []
+
+    if chunk:
+        _write_chunk(fileobj, chunk, separator, count == len(chunk))
+    if count or is_array:
+        fileobj.write(end)
+    return count
+
+
+def _write_chunk(fileobj, chunk, separator, first):
+    if not first:
+        fileobj.write(separator)
+    fileobj.write(separator.join(chunk))
+
+
+class _ChunkReader(object):
+    """A growing text buffer over a file-like object. Positions are
+    relative to the current buffer, which is compacted every time more
+    data is read.
+
+    """
+
+    def __init__(self, fileobj, chunk_size):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = u''
+        self.offset = 0
+        self.eof = False
+
+    def read_more(self, pos):
+        """Reads another chunk, discarding the buffer contents before
+        `pos`. Returns the new position of `pos`, or :keyword:`None` if
+        there is nothing else to read.
+
+        """
+
+        if self.eof:
+            return None
+
+        chunk = self.fileobj.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk, final=self.eof)
+
+        self.offset += pos
+        self.buffer = self.buffer[pos:] + chunk
+        return 0
+
+    def skip_whitespace(self, pos):
+        while True:
+            pos = _WHITESPACE.match(self.buffer, pos).end()
+            if pos < len(self.buffer):
+                return pos
+
+            pos = self.read_more(pos)
+            if pos is None:
+                return len(self.buffer)
+
+    def at_end(self, pos):
+        return self.eof and pos >= len(self.buffer)
+
+    def startswith(self, char, pos):
+        return self.buffer.startswith(char, pos)
+
+    def decode(self, decoder, pos):
+        # A value that ends with the buffer could be truncated (numbers,
+        # for example), so we only trust it once we have seen what follows.
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, pos)
+            except ValueError as error:
+                if self.eof or not self._truncated(error, pos):
+                    raise
+            else:
+                if self.eof or _TOKEN.match(self.buffer, end).end() < len(
+                        self.buffer):
+                    return value, end
+
+            pos = self.read_more(pos)
+
+    def _truncated(self, error, pos):
+        """Returns `True` if the given decoding `error` could be caused by
+        a value truncated at the end of the buffer, so reading more data
+        could fix it. Errors before the end of the buffer are raised at
+        once, without reading the rest of the document.
+
+        """
+
+        if str(error).startswith(_TRUNCATED_STRING_ERRORS):
+            return True
+
+        # The C scanner doesn't always report where the error is, so the
+        # value is decoded again with the Python one to find it out.
+        try:
+            _python_decoder().raw_decode(self.buffer, pos)
+        except ValueError as python_error:
+            error = python_error
+        else:
+            return True
+
+        if str(error).startswith(_TRUNCATED_STRING_ERRORS):
+            return True
+
+        position = _error_position(error)
+        if position is None:
+            position = pos
+
+        end = _TRUNCATED_TAIL.match(self.buffer, position).end()
+        return end >= len(self.buffer)
+
+
+def _error_position(error):
+    position = getattr(error, 'pos', None)
+    if position is None:
+        match = _ERROR_POSITION.search(str(error))
+        if match:
+            position = int(match.group(1))
+    return position
+
+
+_python_decoders = []
+
+
+def _python_decoder():
+    """Returns a json decoder that uses the pure Python scanner."""
+
+    if not _python_decoders:
+        decoder = json.JSONDecoder()
+        decoder.scan_once = json.scanner.py_make_scanner(decoder)
+        _python_decoders.append(decoder)
+    return _python_decoders[0]
@@ -24,14 +24,114 @@ exception with an error message.
 `Validators` are passed to :class:`fields.Field` and subclasses as possitional
 arguments.
 
+Validators can also have a :func:`validate_many` method which receives a
+sequence of `values`, for example a whole column of a
+:class:`batch.ModelBatch`, and returns a `list` of `(index, message)`
+tuples for the values that don't validate. The builtin validators
+implement it with tight loops, and check :mod:`array` and `numpy` arrays
+of the right type at once. Use the :func:`validate_many` function to
+validate a sequence with any validator.
+
+:mod:`fields` that hold inner validators, like :class:`fields.ListField`,
+find them checking the registry of validator classes first, and then
+looking for a callable `validate` method. The builtin validators are
+already registered, and custom validator classes can be registered with
+:func:`register` to take the faster check.
+
+The builtin validators don't keep any state other than their parameters,
+so the builtin :mod:`fields` share them through :func:`shared` instead of
+building new ones for every field.
+
 """
 
 import re
+import json
+import array
 import functools
 from datetime import datetime
 
 from booby import errors
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INTEGER_TYPECODES = 'bBhHiIlLqQ'
+FLOAT_TYPECODES = 'fd'
+
+EMAIL_PATTERN = re.compile('^\w+\@\w+\.[a-z]{2,3}$')
+
+_shared = {}
+
+_registered = ()
+
+
+def register(cls):
+    """Adds the validator class `cls` to the registry of validator classes.
+    Returns `cls`, so it can be used as a class decorator::
+
+        @register
+        class Even(object):
+            def validate(self, value):
+                if value % 2:
+                    raise errors.ValidationError('should be even')
+
+    """
+
+    global _registered
+
+    if cls not in _registered:
+        _registered += (cls,)
+    return cls
+
+
+def registered():
+    """Returns a `tuple` with the registered validator classes."""
+
+    return _registered
+
+
+def is_registered(validator):
+    """Returns `True` if `validator` is an instance of a registered
+    validator class.
+
+    """
+
+    return isinstance(validator, _registered)
+
+
+def shared(cls, *args):
+    """Returns an instance of the validator class `cls` built with the given
+    `args`, shared with every other call with the same class and equal
+    arguments of the same types, including the types of the items of
+    `list`, `set` and `tuple` arguments. A `list` or `set` argument is
+    copied, so changing it later doesn't change the shared validator.
+    Arguments that can't be hashed get a new validator every time.
+
+    """
+
+    if len(args) == 1:
+        arg = args[0]
+        if type(arg) in (list, set, tuple):
+            # Equal items of other types, like 1 and 1.0, validate
+            # differently, so they get their own validators.
+            key = (cls, type(arg), tuple((type(item), item) for item in arg))
+            if type(arg) is not tuple:
+                args = (type(arg)(arg),)
+        else:
+            key = (cls, type(arg), arg)
+    else:
+        key = (cls, args, tuple(map(type, args)))
+
+    try:
+        return _shared[key]
+    except KeyError:
+        validator = _shared[key] = cls(*args)
+        return validator
+    except TypeError:
+        return cls(*args)
+
 
 def nullable(method):
     """This is a helper validation decorator for validators that allow
@@ -57,9 +157,117 @@ def nullable(method):
         if value is not None:
             method(self, value)
 
+    # Let compiled validation plans skip the extra frame and the `None`
+    # check for non null values.
+    wrapper.nullable = True
+    wrapper.__wrapped__ = method
+
     return wrapper
 
 
+def validate_many(validator, values):
+    """Validates every value in the given sequence with the given
+    `validator`, using its :func:`validate_many` method if it has one.
+
+    Returns a `list` of `(index, message)` tuples, in `values` order, for
+    the values that don't validate.
+
+    """
+
+    try:
+        method = validator.validate_many
+    except AttributeError:
+        pass
+    else:
+        return method(values)
+
+    result = []
+    for index, value in enumerate(values):
+        try:
+            validator.validate(value)
+        except errors.ValidationError as error:
+            result.append((index, str(error)))
+    return result
+
+
+def collect_errors(validators, value, path, result):
+    """Validates the given `value` with the given `validators`, in order,
+    until one of them fails, and appends `(path, error)` tuples to the
+    `result` list for every found error.
+
+    Validators with a :func:`collect_errors` method, like :class:`Model`
+    and :class:`List`, are asked to collect all the errors of the inner
+    values instead, with paths relative to `path`.
+
+    Returns `True` if the `value` doesn't validate.
+
+    """
+
+    for validator in validators:
+        if getattr(type(validator), 'collect_errors', None) is not None:
+            if validator.collect_errors(value, path, result):
+                return True
+            continue
+
+        try:
+            validator.validate(value)
+        except errors.ValidationError as error:
+            result.append((path, error))
+            return True
+    return False
+
+
+def field_path(path, name):
+    """Returns the path of the field called `name` within the `model` at
+    the given `path`, as in ``owner.token``.
+
+    """
+
+    if path:
+        return u'{}.{}'.format(path, name)
+    return name
+
+
+def item_path(path, key):
+    """Returns the path of the item at the given `key` within the `list`
+    or `dict` at the given `path`, as in ``books[3]`` or ``tags["x"]``.
+    String keys are quoted as json strings, and byte string keys are
+    decoded as utf-8 first.
+
+    """
+
+    if isinstance(key, str):
+        key = key.decode('utf-8', 'replace')
+    if isinstance(key, unicode):
+        key = json.dumps(key, ensure_ascii=False)
+    return u'{}[{}]'.format(path, key)
+
+
+def is_typed_array(values, typecodes, kinds):
+    """Returns `True` if `values` is an :class:`array.array` with one of the
+    given `typecodes` or a `numpy` array with one of the given dtype
+    `kinds`, that is, if all its values have the same known type.
+
+    """
+
+    if isinstance(values, array.array):
+        return values.typecode in typecodes
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values.dtype.kind in kinds
+    return False
+
+
+def _as_numpy(values):
+    if isinstance(values, array.array):
+        return numpy.frombuffer(values, dtype=values.typecode)
+    return values
+
+
+def _failures(values, fails, message):
+    return [(index, message) for index, value in enumerate(values)
+        if value is not None and fails(value)]
+
+
 class Required(object):
     """This validator forces fields to have a value other than :keyword:`None`."""
 
@@ -67,6 +275,12 @@ class Required(object):
         if value is None:
             raise errors.ValidationError('is required')
 
+    def validate_many(self, values):
+        if is_typed_array(values, INTEGER_TYPECODES + FLOAT_TYPECODES, 'biuf'):
+            return []
+        return [(index, 'is required') for index, value in enumerate(values)
+            if value is None]
+
 
 class In(object):
     """This validator forces fields to have their value in the given list.
@@ -82,6 +296,24 @@ class In(object):
         if value not in self.choices:
             raise errors.ValidationError('should be in {}'.format(self.choices))
 
+    def validate_many(self, values):
+        try:
+            choices = frozenset(self.choices)
+        except TypeError:
+            choices = self.choices
+
+        message = 'should be in {}'.format(self.choices)
+        result = []
+        for index, value in enumerate(values):
+            try:
+                if value in choices:
+                    continue
+            except TypeError:
+                if value in self.choices:
+                    continue
+            result.append((index, message))
+        return result
+
 
 class String(object):
     """This validator forces fields values to be an instance of `basestring`."""
@@ -91,6 +323,10 @@ class String(object):
         if not isinstance(value, basestring):
             raise errors.ValidationError('should be a string')
 
+    def validate_many(self, values):
+        return _failures(values, lambda value: not isinstance(value, basestring),
+            'should be a string')
+
 
 class Min(object):
     r"""This validator forces Integer field to be more than or
@@ -104,6 +340,18 @@ class Min(object):
             raise errors.ValidationError('Should be more than or equal to '
                 'value {}'.format(self.min_value))
 
+    def validate_many(self, values):
+        message = 'Should be more than or equal to value {}'.format(
+            self.min_value)
+
+        if numpy is not None and is_typed_array(
+                values, INTEGER_TYPECODES + FLOAT_TYPECODES, 'iuf'):
+            indexes = numpy.flatnonzero(_as_numpy(values) < self.min_value)
+            return [(int(index), message) for index in indexes]
+
+        min_value = self.min_value
+        return _failures(values, lambda value: min_value > value, message)
+
 
 class Max(object):
     r"""This validator forces Integer field to be less than or
@@ -117,6 +365,18 @@ class Max(object):
             raise errors.ValidationError('Should be less than or equal to '
                 'value {}'.format(self.max_value))
 
+    def validate_many(self, values):
+        message = 'Should be less than or equal to value {}'.format(
+            self.max_value)
+
+        if numpy is not None and is_typed_array(
+                values, INTEGER_TYPECODES + FLOAT_TYPECODES, 'iuf'):
+            indexes = numpy.flatnonzero(_as_numpy(values) > self.max_value)
+            return [(int(index), message) for index in indexes]
+
+        max_value = self.max_value
+        return _failures(values, lambda value: max_value < value, message)
+
 
 class Integer(object):
     """This validator forces fields values to be an instance of `int`."""
@@ -126,6 +386,12 @@ class Integer(object):
         if not isinstance(value, int):
             raise errors.ValidationError('should be an integer')
 
+    def validate_many(self, values):
+        if is_typed_array(values, INTEGER_TYPECODES, 'iu'):
+            return []
+        return _failures(values, lambda value: not isinstance(value, int),
+            'should be an integer')
+
 
 class Float(object):
     """This validator forces fields values to be an instance of `float`."""
@@ -135,6 +401,12 @@ class Float(object):
         if not isinstance(value, float):
             raise errors.ValidationError('should be a float')
 
+    def validate_many(self, values):
+        if is_typed_array(values, FLOAT_TYPECODES, 'f'):
+            return []
+        return _failures(values, lambda value: not isinstance(value, float),
+            'should be a float')
+
 
 class Boolean(object):
     """This validator forces fields values to be an instance of `bool`."""
@@ -144,6 +416,12 @@ class Boolean(object):
         if not isinstance(value, bool):
             raise errors.ValidationError('should be a boolean')
 
+    def validate_many(self, values):
+        if is_typed_array(values, '', 'b'):
+            return []
+        return _failures(values, lambda value: not isinstance(value, bool),
+            'should be a boolean')
+
 
 class Model(object):
     """This validator forces fields values to be an instance of the given
@@ -160,11 +438,25 @@ class Model(object):
     @nullable
     def validate(self, value):
         if not isinstance(value, self.model):
-            raise errors.ValidationError(
-                "should be an instance of '{}'".format(self.model.__name__))
+            raise self._instance_error()
 
         value.validate()
 
+    def collect_errors(self, value, path, result):
+        if value is None:
+            return False
+        if not isinstance(value, self.model):
+            result.append((path, self._instance_error()))
+            return True
+
+        count = len(result)
+        value._collect_errors(path, result)
+        return len(result) > count
+
+    def _instance_error(self):
+        return errors.ValidationError(
+            "should be an instance of '{}'".format(self.model.__name__))
+
 
 class Email(String):
     """This validator forces fields values to be strings and match a
@@ -172,10 +464,7 @@ class Email(String):
 
     """
 
-    def __init__(self, *args, **kwargs):
-        super(Email, self).__init__(*args, **kwargs)
-
-        self.pattern = re.compile('^\w+\@\w+\.[a-z]{2,3}$')
+    pattern = EMAIL_PATTERN
 
     @nullable
     def validate(self, value):
@@ -184,6 +473,18 @@ class Email(String):
         if self.pattern.match(value) is None:
             raise errors.ValidationError('should be a valid email')
 
+    def validate_many(self, values):
+        match = self.pattern.match
+        result = []
+        for index, value in enumerate(values):
+            if value is None:
+                continue
+            if not isinstance(value, basestring):
+                result.append((index, 'should be a string'))
+            elif match(value) is None:
+                result.append((index, 'should be a valid email'))
+        return result
+
 
 class List(object):
     """This validator forces field values to be a :keyword:`list`.
@@ -208,6 +509,20 @@ class List(object):
             for validator in self.validators:
                 validator.validate(i)
 
+    def collect_errors(self, value, path, result):
+        if value is None:
+            return False
+        if not isinstance(value, list):
+            result.append((path, errors.ValidationError('should be a list')))
+            return True
+
+        failed = False
+        for index, item in enumerate(value):
+            if collect_errors(self.validators, item, item_path(path, index),
+                    result):
+                failed = True
+        return failed
+
 
 class DateTime(object):
     """This validator forces field values to be a :keyword:`datetime`.
@@ -226,3 +541,9 @@ class Dict(object):
     def validate(self, value):
         if not isinstance(value, dict):
             raise errors.ValidationError('should be a dict')
+
+
+for _cls in (Required, In, String, Min, Max, Integer, Float, Boolean, Model,
+        Email, List, DateTime, Dict):
+    register(_cls)
+del _cls
@@ -12,7 +12,7 @@ setup(
     url='https://github.com/jaimegildesagredo/booby',
     author='Jaime Gil de Sagredo Luna',
     author_email='jaimegildesagredo@gmail.com',
-    packages=find_packages(exclude=['tests', 'tests.*']),
+    packages=find_packages(exclude=['tests', 'tests.*', 'benchmarks']),
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
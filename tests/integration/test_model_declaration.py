@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 
+from hamcrest import *
 from nose.tools import assert_raises_regexp
 
 from booby import errors
 from booby.models import Model
-from booby.fields import StringField, IntegerField, EmbeddedField, EmailField
+from booby.fields import (StringField, IntegerField, EmbeddedField, EmailField,
+    ListField, DictField)
 
 
 class TestModelValidation(object):
@@ -33,6 +35,78 @@ class TestModelValidation(object):
             user.validate()
 
 
+class TestModelErrors(object):
+    def test_when_model_is_valid_then_returns_empty_list(self):
+        user = User(login=u'root', token=Token(key=u'foo'))
+
+        assert_that(user.errors(), equal_to([]))
+
+    def test_returns_first_error_of_every_invalid_field(self):
+        user = User(name=1, email='root@localhost')
+
+        assert_that(self.messages(user), contains_inanyorder(
+            ('login', 'is required'),
+            ('name', 'should be a string'),
+            ('email', 'should be a valid email')))
+
+    def test_when_embedded_model_is_invalid_then_returns_dotted_path(self):
+        repo = Repo(name=u'booby', owner=User(login=u'root', token=Token(key=1)))
+
+        assert_that(self.messages(repo), equal_to(
+            [('owner.token.key', 'should be a string')]))
+
+    def test_when_embedded_value_is_not_a_model_then_returns_field_path(self):
+        repo = Repo(name=u'booby', owner=object())
+
+        assert_that(self.messages(repo), equal_to(
+            [('owner', "should be an instance of 'User'")]))
+
+    def test_when_list_items_are_invalid_then_returns_indexed_paths(self):
+        repo = Repo(name=u'booby', collaborators=[
+            User(login=u'root'), User(), User(login=1)])
+
+        assert_that(self.messages(repo), contains_inanyorder(
+            ('collaborators[1].login', 'is required'),
+            ('collaborators[2].login', 'should be a string')))
+
+    def test_when_dict_values_are_invalid_then_returns_keyed_paths(self):
+        repo = Repo(name=u'booby', tokens={'x': Token(secret=1)})
+
+        assert_that(self.messages(repo), equal_to(
+            [('tokens["x"].secret', 'should be a string')]))
+
+    def test_when_dict_keys_are_not_ascii_then_returns_quoted_paths(self):
+        repo = Repo(name=u'booby', tokens={
+            'caf\xc3\xa9': Token(secret=1), u'a"b': Token(secret=2)})
+
+        assert_that(self.messages(repo), contains_inanyorder(
+            (u'tokens["caf\xe9"].secret', 'should be a string'),
+            (u'tokens["a\\"b"].secret', 'should be a string')))
+
+    def test_errors_match_the_error_raised_by_validate(self):
+        user = User(login=u'root', name=1)
+
+        with assert_raises_regexp(errors.ValidationError, 'should be a string'):
+            user.validate()
+        assert_that(self.messages(user), equal_to(
+            [('name', 'should be a string')]))
+
+    def test_when_model_overrides_validate_then_returns_its_error(self):
+        class Range(Model):
+            low = IntegerField()
+            high = IntegerField()
+
+            def validate(self):
+                if self.low > self.high:
+                    raise errors.ValidationError('low should be lower')
+
+        assert_that(self.messages(Range(low=2, high=1)), equal_to(
+            [('', 'low should be lower')]))
+
+    def messages(self, model):
+        return [(path, str(error)) for path, error in model.errors()]
+
+
 class Token(Model):
     key = StringField()
     secret = StringField()
@@ -44,3 +118,10 @@ class User(Model):
     name = StringField()
     karma = IntegerField()
     token = EmbeddedField(Token)
+
+
+class Repo(Model):
+    name = StringField(required=True)
+    owner = EmbeddedField(User)
+    collaborators = ListField(User)
+    tokens = DictField(value=Token)
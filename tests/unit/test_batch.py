@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+import array
+
+from hamcrest import *
+from nose.tools import assert_raises, assert_raises_regexp
+
+from booby import errors, fields, models
+from booby.batch import ModelBatch
+
+
+class TestModelBatchColumns(object):
+    def test_when_integer_float_and_boolean_fields_then_columns_are_arrays(self):
+        for name in ('karma', 'score', 'active'):
+            assert_that(self.batch.column(name), instance_of(array.array))
+
+    def test_when_string_field_then_column_is_list(self):
+        assert_that(self.batch.column('login'), equal_to([u'foo', u'bar', None]))
+
+    def test_when_value_is_none_then_typed_column_keeps_it_as_null(self):
+        assert_that(self.batch[2].karma, is_(None))
+        assert_that(self.batch.column('karma').tolist(), equal_to([1, 200, 0]))
+
+    def test_when_value_has_another_type_then_column_is_list(self):
+        self.batch.append({'score': u'max'})
+
+        assert_that(self.batch.column('score'), equal_to([0.5, 1.5, None, u'max']))
+
+    def test_when_integer_overflows_then_column_is_list(self):
+        self.batch.append({'karma': 2 ** 80})
+
+        assert_that(self.batch.column('karma'), equal_to([1, 200, None, 2 ** 80]))
+
+    def test_when_invalid_field_then_raises_field_error(self):
+        with assert_raises_regexp(errors.FieldError, 'foo'):
+            self.batch.column('foo')
+
+    def test_len_is_number_of_records(self):
+        assert_that(self.batch, has_length(3))
+
+    def setup(self):
+        self.batch = ModelBatch(User, RECORDS)
+
+
+class TestModelBatchRows(object):
+    def test_row_is_model_instance_with_record_values(self):
+        row = self.batch[0]
+
+        assert_that(row, instance_of(User))
+        assert_that(row.login, is_(u'foo'))
+        assert_that(row.score, is_(0.5))
+        assert_that(row.active, is_(True))
+
+    def test_when_negative_index_then_counts_from_the_end(self):
+        assert_that(self.batch[-2].login, is_(u'bar'))
+
+    def test_when_index_out_of_range_then_raises_index_error(self):
+        with assert_raises(IndexError):
+            self.batch[3]
+
+    def test_when_set_row_field_then_updates_column(self):
+        self.batch[1].karma = 7
+
+        assert_that(self.batch.column('karma')[1], is_(7))
+
+    def test_when_set_row_field_to_none_then_column_keeps_null(self):
+        self.batch[0].score = None
+
+        assert_that(self.batch[0].score, is_(None))
+
+    def test_iterates_over_rows_in_order(self):
+        assert_that([row.login for row in self.batch],
+            equal_to([u'foo', u'bar', None]))
+
+    def test_row_to_plain_returns_record_plain_dict(self):
+        assert_that(self.batch[0].to_plain(), equal_to(
+            User(**RECORDS[0]).to_plain()))
+
+    def setup(self):
+        self.batch = ModelBatch(User, RECORDS)
+
+
+class TestModelBatchValidate(object):
+    def test_when_all_records_are_valid_then_returns_empty_list(self):
+        batch = ModelBatch(User, [{'login': u'foo', 'karma': 5}])
+
+        assert_that(batch.validate(), equal_to([]))
+
+    def test_returns_first_error_of_every_invalid_field_sorted_by_index(self):
+        batch = ModelBatch(User, [
+            {'login': u'foo', 'karma': 5},
+            {'karma': 200, 'score': 1},
+            {'login': u'bar', 'score': u'max'}])
+
+        result = [(index, name, str(error))
+            for index, name, error in batch.validate()]
+
+        assert_that(result, equal_to([
+            (1, 'karma', 'Should be less than or equal to value 100'),
+            (1, 'login', 'is required'),
+            (1, 'score', 'should be a float'),
+            (2, 'score', 'should be a float')]))
+
+    def test_when_field_overrides_validate_then_uses_field_validate(self):
+        batch = ModelBatch(Group, [{'members': {'foo': {'login': 1}}}])
+
+        result = batch.validate()
+
+        assert_that([(index, name) for index, name, _ in result],
+            equal_to([(0, 'members')]))
+
+    def test_when_lazy_fields_then_validates_loaded_values(self):
+        batch = ModelBatch(Repo, [{'owner': {'login': u'foo'},
+            'members': [{'login': u'bar'}]}])
+
+        assert_that(batch.validate(), equal_to([]))
+        assert_that(batch.column('owner')[0], instance_of(User))
+        assert_that(batch.column('members')[0][0], instance_of(User))
+
+
+class TestModelBatchToPlain(object):
+    def test_returns_plain_dicts_of_all_records(self):
+        batch = ModelBatch(User, RECORDS)
+
+        assert_that(batch.to_plain(), equal_to(
+            [User(**record).to_plain() for record in RECORDS]))
+
+    def test_when_model_instances_then_returns_their_plain_dicts(self):
+        users = [User(login=u'foo', karma=1), User(login=u'bar')]
+
+        assert_that(ModelBatch(User, users).to_plain(), equal_to(
+            [user.to_plain() for user in users]))
+
+
+RECORDS = [
+    {'login': u'foo', 'karma': 1, 'score': 0.5, 'active': True},
+    {'login': u'bar', 'karma': 200, 'score': 1.5, 'active': False},
+    {'karma': None},
+]
+
+
+class User(models.Model):
+    login = fields.StringField(required=True)
+    karma = fields.IntegerField(max_value=100)
+    score = fields.FloatField()
+    active = fields.BooleanField()
+
+
+class Group(models.Model):
+    members = fields.DictField(value=User)
+
+
+class Repo(models.Model):
+    owner = fields.EmbeddedField(User, lazy=True)
+    members = fields.ListField(User, lazy=True)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+from hamcrest import *
+from nose.tools import assert_raises, assert_raises_regexp
+
+from booby import base, errors, fields, models
+
+
+class TestModelToBytes(object):
+    def test_round_trips_native_values(self):
+        event = Event(name=u'f\xf6o', raw='\x00\xff', count=-300,
+            score=0.1, active=False,
+            time=datetime.datetime(2013, 1, 19, 12, 30, 5, 123456),
+            extra={'day': datetime.date(1969, 7, 20), 'tags': [1, None]})
+
+        result = Event.from_bytes(event.to_bytes())
+
+        assert_that(result.to_dict(), equal_to(event.to_dict()))
+        assert_that(result.time, equal_to(event.time))
+        assert_that(result.raw, instance_of(str))
+
+    def test_round_trips_big_integers(self):
+        for count in (0, 127, 128, -128, 2 ** 70, -2 ** 70):
+            result = Event.from_bytes(Event(count=count).to_bytes())
+
+            assert_that(result.count, equal_to(count))
+
+    def test_round_trips_embedded_models(self):
+        user = User(name='foo', event=Event(count=1),
+            events=[Event(count=2)], by_name={'bar': Event(count=3)})
+
+        result = User.from_bytes(user.to_bytes())
+
+        assert_that(result.event, instance_of(Event))
+        assert_that(result.to_plain(), equal_to(user.to_plain()))
+
+    def test_when_default_values_then_leaves_them_out(self):
+        assert_that(len(Event().to_bytes()), equal_to(3))
+
+    def test_when_explicit_none_over_default_then_keeps_none(self):
+        result = Event.from_bytes(Event(active=None).to_bytes())
+
+        assert_that(result.active, is_(None))
+
+    def test_is_smaller_than_json(self):
+        event = Event(name=u'foo', count=10, score=0.5, active=True,
+            time=datetime.datetime(2013, 1, 19))
+
+        assert_that(len(event.to_bytes()), less_than(len(event.to_json())))
+
+    def test_loaded_model_has_no_changes(self):
+        result = Event.from_bytes(Event(count=1).to_bytes())
+
+        assert_that(result.changed_fields(), equal_to(set()))
+
+    def test_when_lazy_field_not_loaded_then_encodes_models(self):
+        user = LazyUser.from_plain_dict({'event': {'count': 1}})
+
+        result = LazyUser.from_bytes(user.to_bytes())
+
+        assert_that(result.event.count, equal_to(1))
+
+    def test_when_datetime_with_timezone_then_raises_booby_error(self):
+        event = Event(time=datetime.datetime(2013, 1, 19, tzinfo=UTC()))
+
+        with assert_raises_regexp(errors.BoobyError, 'timezone'):
+            event.to_bytes()
+
+    def test_when_unknown_type_then_raises_booby_error(self):
+        with assert_raises_regexp(errors.BoobyError, 'object'):
+            Event(extra=object()).to_bytes()
+
+
+class TestModelFromBytes(object):
+    def test_when_truncated_then_raises_decode_error(self):
+        data = Event(name=u'foo', score=0.5).to_bytes()
+
+        for end in range(len(data)):
+            with assert_raises(errors.DecodeError):
+                Event.from_bytes(data[:end])
+
+    def test_when_trailing_data_then_raises_decode_error(self):
+        with assert_raises_regexp(errors.DecodeError, 'after'):
+            Event.from_bytes(Event().to_bytes() + '\x00')
+
+    def test_when_unknown_version_then_raises_decode_error(self):
+        with assert_raises_regexp(errors.DecodeError, 'version'):
+            Event.from_bytes('\x02' + Event().to_bytes()[1:])
+
+    def test_when_model_class_reset_then_uses_its_new_fields(self):
+        class Growing(models.Model):
+            name = fields.StringField()
+
+        Growing.from_bytes(Growing(name=u'foo').to_bytes())
+        Growing.email = fields.StringField()
+        base._reset(Growing)
+
+        obj = Growing.from_bytes(Growing(name=u'foo', email=u'bar').to_bytes())
+
+        assert_that(obj.to_plain(), equal_to({'name': u'foo', 'email': u'bar'}))
+
+    def test_when_unknown_field_index_then_raises_decode_error(self):
+        data = User(name='foo').to_bytes()
+
+        with assert_raises_regexp(errors.DecodeError, 'index'):
+            Point.from_bytes(data)
+
+    def test_when_field_rejects_value_then_raises_decode_error(self):
+        data = Point(x=1).to_bytes().replace('\x03\x02', '\x06\x01a')
+
+        with assert_raises_regexp(errors.DecodeError, 'integer'):
+            Point.from_bytes(data)
+
+    def test_when_invalid_date_then_raises_decode_error(self):
+        data = Event(extra=datetime.date(1, 1, 1)).to_bytes()
+
+        with assert_raises_regexp(errors.DecodeError, 'ordinal'):
+            Event.from_bytes(data[:-1] + '\x00')
+
+
+class UTC(datetime.tzinfo):
+    def utcoffset(self, dt):
+        return datetime.timedelta(0)
+
+
+class Event(models.Model):
+    name = fields.StringField()
+    raw = fields.StringField()
+    count = fields.IntegerField()
+    score = fields.FloatField()
+    active = fields.BooleanField(default=True)
+    time = fields.DateTimeField()
+    extra = fields.Field()
+
+
+class User(models.Model):
+    name = fields.StringField()
+    event = fields.EmbeddedField(Event)
+    events = fields.ListField(Event)
+    by_name = fields.DictField(value=Event)
+
+
+class LazyUser(models.Model):
+    event = fields.EmbeddedField(Event, lazy=True)
+
+
+class Point(models.Model):
+    x = fields.IntegerField()
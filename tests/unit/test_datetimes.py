@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import datetime
+import threading
+
+from hamcrest import *
+from nose.tools import assert_raises_regexp
+
+from booby import datetimes
+
+FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S.%f', '%d/%m/%Y %H:%M')
+
+
+class TestParser(object):
+    def test_when_default_format_then_parses_datetime(self):
+        parse = datetimes.parser()
+
+        assert_that(parse('2013-01-19 14:30:55'),
+            equal_to(datetime.datetime(2013, 1, 19, 14, 30, 55)))
+
+    def test_when_iso_format_with_microseconds_then_parses_datetime(self):
+        parse = datetimes.parser('%Y-%m-%dT%H:%M:%S.%f')
+
+        assert_that(parse(u'2013-01-19T14:30:55.000123'),
+            equal_to(datetime.datetime(2013, 1, 19, 14, 30, 55, 123)))
+
+    def test_when_any_format_then_parses_as_strptime(self):
+        for format in FORMATS:
+            value = self.value.strftime(format)
+
+            assert_that(datetimes.parser(format)(value),
+                equal_to(datetime.datetime.strptime(value, format)))
+
+    def test_when_not_zero_padded_then_parses_as_strptime(self):
+        parse = datetimes.parser()
+
+        assert_that(parse('2013-1-9 1:2:3'),
+            equal_to(datetime.datetime(2013, 1, 9, 1, 2, 3)))
+
+    def test_when_invalid_value_then_raises_strptime_error(self):
+        parse = datetimes.parser()
+
+        with assert_raises_regexp(ValueError, 'does not match format'):
+            parse('2013-13-19 14:30:55')
+
+    def test_when_out_of_range_value_then_raises_strptime_error(self):
+        parse = datetimes.parser()
+
+        with assert_raises_regexp(ValueError, 'second must be in'):
+            parse('2013-01-19 14:30:60')
+
+    def test_when_cache_size_then_returns_cached_values(self):
+        parse = datetimes.parser(cache_size=2)
+
+        first = parse('2013-01-19 14:30:55')
+
+        assert_that(parse('2013-01-19 14:30:55'), same_instance(first))
+
+    def test_when_cache_is_full_then_evicts_least_recently_used(self):
+        parse = datetimes.parser(cache_size=2)
+        first = parse('2013-01-19 14:30:55')
+        second = parse('2013-01-20 14:30:55')
+
+        parse('2013-01-19 14:30:55')
+        parse('2013-01-21 14:30:55')
+
+        assert_that(parse('2013-01-19 14:30:55'), same_instance(first))
+        assert_that(parse('2013-01-20 14:30:55'), is_not(same_instance(second)))
+
+    def test_when_cache_shared_by_threads_then_returns_parsed_values(self):
+        parse = datetimes.parser(cache_size=4)
+        values = ['2013-01-{:02d} 14:30:55'.format(day) for day in range(1, 29)]
+        expected = dict((value, parse(value)) for value in values)
+        failures = []
+
+        def load():
+            try:
+                for _ in range(200):
+                    for value in values:
+                        assert parse(value) == expected[value]
+            except Exception as error:
+                failures.append(error)
+
+        interval = sys.getcheckinterval()
+        sys.setcheckinterval(1)
+        try:
+            threads = [threading.Thread(target=load) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setcheckinterval(interval)
+
+        assert_that(failures, equal_to([]))
+
+    def setup(self):
+        self.value = datetime.datetime(2013, 1, 19, 14, 30, 55, 123)
+
+
+class TestFormatter(object):
+    def test_when_any_format_then_formats_as_strftime(self):
+        for format in FORMATS:
+            for value in self.values:
+                assert_that(datetimes.formatter(format)(value),
+                    equal_to(value.strftime(format)))
+
+    def test_when_date_then_formats_as_strftime(self):
+        value = datetime.date(2013, 1, 2)
+
+        for format in FORMATS:
+            assert_that(datetimes.formatter(format)(value),
+                equal_to(value.strftime(format)))
+
+    def test_when_iso_format_then_formats_iso_string(self):
+        format = datetimes.formatter('%Y-%m-%dT%H:%M:%S')
+
+        assert_that(format(self.values[0]), equal_to('2013-01-19T14:30:55'))
+
+    def setup(self):
+        self.values = [
+            datetime.datetime(2013, 1, 19, 14, 30, 55),
+            datetime.datetime(2013, 1, 19, 14, 30, 55, 123),
+            datetime.datetime(2013, 1, 19, 14, 30, 55, 123, tzinfo=UTC()),
+            datetime.datetime(2013, 1, 19, tzinfo=UTC())
+        ]
+
+
+class TestBatchHelpers(object):
+    def test_parse_many_returns_parsed_values(self):
+        value = datetime.datetime(2013, 1, 19, 14, 30, 55)
+
+        result = datetimes.parse_many(['2013-01-19 14:30:55', value, None,
+            ''])
+
+        assert_that(result, equal_to([value, value, None, None]))
+
+    def test_parse_many_with_format_returns_parsed_values(self):
+        result = datetimes.parse_many(['2013', '2014'], format='%Y')
+
+        assert_that(result, equal_to([datetime.datetime(2013, 1, 1),
+            datetime.datetime(2014, 1, 1)]))
+
+    def test_format_many_returns_formatted_values(self):
+        result = datetimes.format_many(
+            [datetime.datetime(2013, 1, 19, 14, 30, 55), None])
+
+        assert_that(result, equal_to(['2013-01-19 14:30:55', None]))
+
+
+class UTC(datetime.tzinfo):
+    def utcoffset(self, value):
+        return datetime.timedelta(0)
+
+    def dst(self, value):
+        return datetime.timedelta(0)
@@ -169,11 +169,46 @@ class TestDateFieldToPlain(object):
     def test_when_value_is_None(self):
         assert_that(self.format_field.to_plain(None), equal_to(None))
 
+    def test_when_value_is_date(self):
+        assert_that(self.field.to_plain(datetime.date(2013, 1, 2)),
+            equal_to('2013-01-02 00:00:00'))
+
     def setup(self):
         self.field = fields.DateTimeField()
         self.format_field = fields.DateTimeField(format="%Y")
 
 
+class TestDateFieldToPython(object):
+    def test_when_format_is_not_set(self):
+        assert_that(self.field.to_python('2013-01-19 14:30:55'),
+            equal_to(datetime.datetime(2013, 1, 19, 14, 30, 55)))
+
+    def test_when_iso_format_is_set(self):
+        field = fields.DateTimeField(format='%Y-%m-%dT%H:%M:%S')
+
+        assert_that(field.to_python('2013-01-19T14:30:55'),
+            equal_to(datetime.datetime(2013, 1, 19, 14, 30, 55)))
+
+    def test_when_format_is_set(self):
+        field = fields.DateTimeField(format='%Y')
+
+        assert_that(field.to_python('2013'),
+            equal_to(datetime.datetime(2013, 1, 1)))
+
+    def test_when_value_is_None(self):
+        assert_that(self.field.to_python(None), equal_to(None))
+
+    def test_when_cache_size_is_set_then_reuses_parsed_values(self):
+        field = fields.DateTimeField(cache_size=10)
+        value = field.to_python('2013-01-19 14:30:55')
+
+        assert_that(field.to_python('2013-01-19 14:30:55'),
+            same_instance(value))
+
+    def setup(self):
+        self.field = fields.DateTimeField()
+
+
 class TestDictField(object):
     def test_when_no_key_validators(self):
         m = SimpleDictModel(data={})
@@ -229,6 +264,36 @@ class TestListField(object):
         f = fields.ListField(validators.Integer)
         assert_that(f.to_plain([1, 2, 3]), equal_to([1, 2, 3]))
 
+    def test_when_registered_custom_validator_then_validates_items(self):
+        f = fields.ListField(Even())
+
+        with assert_raises_regexp(errors.ValidationError, 'should be even'):
+            f.validate([2, 3])
+
+    def test_when_not_registered_validator_then_validates_items(self):
+        f = fields.ListField(Odd())
+
+        with assert_raises_regexp(errors.ValidationError, 'should be odd'):
+            f.validate([1, 2])
+
+    def test_when_object_without_validate_then_ignores_it(self):
+        f = fields.ListField(object())
+
+        f.validate([1, 2])
+
+
+@validators.register
+class Even(object):
+    def validate(self, value):
+        if value % 2:
+            raise errors.ValidationError('should be even')
+
+
+class Odd(object):
+    def validate(self, value):
+        if not value % 2:
+            raise errors.ValidationError('should be odd')
+
 
 class ListIntFieldModel(models.Model):
     d = fields.ListField(validators.Integer)
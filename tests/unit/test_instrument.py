@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+from hamcrest import *
+from nose.tools import assert_raises
+
+from booby import errors, fields, models, instrument
+
+
+class TestInstrument(object):
+    def setup(self):
+        instrument.reset()
+        self.plain = {'name': u'foo', 'email': u'foo@example.com',
+            'tokens': [{'key': u'bar'}]}
+
+    def teardown(self):
+        instrument.disable()
+
+    def test_when_enabled_then_records_validators_calls(self):
+        with instrument.instrumented():
+            User.from_plain_dict(self.plain).validate()
+
+        stats = instrument.stats()
+
+        assert_that(stats[('User', 'name', 'Required', 'validate')],
+            has_entries(calls=1, failures=0))
+        assert_that(stats[('User', 'email', 'Email', 'validate')],
+            has_entries(calls=1, failures=0))
+        assert_that(stats[('User', 'email', 'Email', 'validate')]['time'],
+            greater_than_or_equal_to(0))
+
+    def test_when_validation_fails_then_records_failure(self):
+        user = User(email=u'foo@example.com')
+
+        with instrument.instrumented():
+            with assert_raises(errors.ValidationError):
+                user.validate()
+
+        assert_that(instrument.stats()[('User', 'name', 'Required',
+            'validate')], has_entries(calls=1, failures=1))
+
+    def test_when_errors_then_records_embedded_failures(self):
+        user = User(name=u'foo', tokens=[Token()])
+
+        with instrument.instrumented():
+            user.errors()
+
+        assert_that(instrument.stats()[('User', 'tokens', 'ListField',
+            'validate')], has_entries(calls=1, failures=1))
+
+    def test_when_loading_and_serializing_then_records_conversions(self):
+        with instrument.instrumented():
+            User.from_plain_dict(self.plain).to_plain()
+
+        stats = instrument.stats()
+
+        assert_that(stats[('User', 'tokens', 'ListField', 'to_python')],
+            has_entries(calls=1))
+        assert_that(stats[('User', 'name', 'StringField', 'to_plain')],
+            has_entries(calls=1))
+        assert_that(stats[('Token', 'key', 'StringField', 'to_python')],
+            has_entries(calls=1))
+
+    def test_when_serializing_embedded_models_then_records_conversions(self):
+        with instrument.instrumented():
+            User(name=u'foo', tokens=[Token(key=u'bar')]).to_plain()
+
+        stats = instrument.stats()
+
+        assert_that(stats[('User', 'tokens', 'ListField', 'to_plain')],
+            has_entries(calls=1))
+        assert_that(stats[('Token', 'key', 'StringField', 'to_plain')],
+            has_entries(calls=1))
+
+    def test_when_instrumented_then_models_behave_the_same(self):
+        with instrument.instrumented():
+            user = User.from_plain_dict(self.plain)
+
+            assert_that(user.tokens[0].key, equal_to(u'bar'))
+            assert_that(user.to_plain(), equal_to(self.plain))
+            assert_that(user.errors(), equal_to([]))
+
+    def test_when_disabled_then_stops_recording(self):
+        with instrument.instrumented():
+            pass
+
+        User.from_plain_dict(self.plain).validate()
+
+        assert_that(instrument.stats(), equal_to({}))
+        assert_that(instrument.is_enabled(), is_(False))
+
+    def test_when_enabled_then_instruments_already_compiled_models(self):
+        User.from_plain_dict(self.plain)
+
+        instrument.enable()
+        User.from_plain_dict(self.plain)
+
+        assert_that(instrument.stats(),
+            has_key(('User', 'name', 'StringField', 'to_python')))
+
+    def test_when_reset_then_discards_statistics(self):
+        with instrument.instrumented():
+            User(name=u'foo').validate()
+            instrument.reset()
+            User(name=u'bar').validate()
+
+        assert_that(instrument.stats()[('User', 'name', 'Required',
+            'validate')], has_entries(calls=1))
+
+    def test_when_nested_context_then_keeps_outer_state(self):
+        instrument.enable()
+
+        with instrument.instrumented():
+            pass
+
+        assert_that(instrument.is_enabled(), is_(True))
+
+    def test_to_prometheus_returns_counters_by_labels(self):
+        with instrument.instrumented():
+            User(name=u'foo').validate()
+
+        text = instrument.to_prometheus()
+
+        assert_that(text, contains_string('# TYPE booby_calls_total counter'))
+        assert_that(text, contains_string(
+            'booby_calls_total{model="User",field="name",'
+            'validator="Required",operation="validate"} 1\n'))
+        assert_that(text, contains_string(
+            'booby_failures_total{model="User",field="name",'
+            'validator="Required",operation="validate"} 0\n'))
+
+
+class Token(models.Model):
+    key = fields.StringField(required=True)
+
+
+class User(models.Model):
+    name = fields.StringField(required=True)
+    email = fields.EmailField()
+    tokens = fields.ListField(Token)
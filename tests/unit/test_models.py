@@ -3,13 +3,19 @@
 import anyjson as json
 
 from hamcrest import *
-from nose.tools import assert_raises_regexp
+from nose.tools import assert_raises, assert_raises_regexp
 
-from booby import errors, fields, models
+from booby import errors, fields, models, validators
+from booby import base
+from booby.base import LazyValue
 import datetime
+import pickle
 
 
 class TestDefaultModelInit(object):
+    def test_when_base_model_then_builds_empty_model(self):
+        assert_that(models.Model().to_plain(), equal_to({}))
+
     def test_when_pass_kwargs_then_set_fields_values(self):
         user = User(name=u'foo', email=u'foo@example.com')
 
@@ -132,6 +138,250 @@ class TestDictModel(object):
         self.user = User(name=u'foo', email='roo@example.com')
 
 
+class TestModelValidationPlan(object):
+    def test_when_value_is_none_then_only_runs_not_nullable_validators(self):
+        user = UserWithRequiredName()
+
+        with assert_raises_regexp(errors.ValidationError, 'required'):
+            user.validate()
+
+    def test_when_several_validators_fail_then_raises_first_error(self):
+        class Choice(models.Model):
+            value = fields.Field(validators.String(), validators.In([u'foo']))
+
+        with assert_raises_regexp(errors.ValidationError, 'should be a string'):
+            Choice(value=1).validate()
+
+    def test_when_field_overrides_validate_then_calls_field_validate(self):
+        class FailingField(fields.Field):
+            def validate(self, value):
+                raise errors.ValidationError('always fails')
+
+        class Failing(models.Model):
+            value = FailingField()
+
+        with assert_raises_regexp(errors.ValidationError, 'always fails'):
+            Failing().validate()
+
+    def test_when_field_overrides_get_then_validates_descriptor_value(self):
+        class UpperField(fields.StringField):
+            def __get__(self, instance, owner):
+                if instance is None:
+                    return self
+                return 1
+
+        class Upper(models.Model):
+            value = UpperField()
+
+        with assert_raises_regexp(errors.ValidationError, 'should be a string'):
+            Upper(value=u'foo').validate()
+
+
+class TestModelFinalization(object):
+    def test_when_class_defined_then_defers_plans(self):
+        class Deferred(models.Model):
+            name = fields.StringField()
+
+        assert_that(Deferred.__dict__['_validation_plan'],
+            instance_of(base._Deferred))
+
+    def test_when_plans_needed_then_computes_them_once(self):
+        class Deferred(models.Model):
+            name = fields.StringField(required=True)
+
+        with assert_raises(errors.ValidationError):
+            Deferred().validate()
+
+        plan = Deferred.__dict__['_validation_plan']
+        assert_that(plan, instance_of(tuple))
+        assert_that(Deferred._validation_plan, same_instance(plan))
+
+    def test_when_base_finalized_first_then_subclass_has_own_plans(self):
+        class Base(models.Model):
+            name = fields.StringField()
+
+        class Child(Base):
+            email = fields.StringField()
+
+        base.finalize(Base)
+
+        assert_that(sorted(Child._fields), equal_to(['email', 'name']))
+        assert_that(Child().to_plain(), equal_to({'name': None, 'email': None}))
+
+    def test_finalize_computes_all_plans(self):
+        class Deferred(models.Model):
+            name = fields.StringField()
+
+        base.finalize(Deferred)
+
+        for name in ('_fields', '_validation_plan', '_serialization_plan',
+                '_loading_plan', '_struct_layout', '_binary_schema'):
+            assert_that(Deferred.__dict__[name],
+                is_not(instance_of(base._Deferred)))
+
+
+class TestCompactModel(object):
+    def test_instances_dont_have_dict(self):
+        point = Point(x=1, y=2)
+
+        assert_that(hasattr(point, '__dict__'), is_(False))
+
+    def test_subclasses_instances_dont_have_dict(self):
+        point = Point3D(x=1, y=2, z=3)
+
+        assert_that(hasattr(point, '__dict__'), is_(False))
+        assert_that(point.to_plain(), equal_to({'x': 1, 'y': 2, 'z': 3}))
+
+    def test_when_set_not_field_attribute_then_raises_attribute_error(self):
+        with assert_raises(AttributeError):
+            Point().foo = 1
+
+    def test_fields_values_are_not_shared_between_instances(self):
+        point, another = Point(x=1), Point(x=2)
+
+        assert_that(point.x, is_(1))
+        assert_that(another.x, is_(2))
+
+    def test_when_load_from_plain_dict_then_sets_fields_values(self):
+        point = Point3D.from_plain_dict({'x': 1, 'y': 2, 'z': '3'})
+
+        point.validate()
+        assert_that(point.z, is_(3))
+
+    def test_when_subclass_declares_slots_then_keeps_them(self):
+        class LabeledPoint(Point):
+            __slots__ = ('label',)
+
+        point = LabeledPoint(x=1)
+        point.label = u'foo'
+
+        assert_that(point.label, is_(u'foo'))
+        assert_that(hasattr(point, '__dict__'), is_(False))
+
+
+class TestModelChanges(object):
+    def test_when_model_is_built_with_kwargs_then_they_are_changed(self):
+        user = User(name=u'foo')
+
+        assert_that(user.changed_fields(), equal_to(set(['name'])))
+
+    def test_when_model_is_loaded_from_plain_dict_then_has_no_changes(self):
+        obj = ModelWithUser.from_plain_dict({'age': '18', 'user': {'name': 'foo'}})
+
+        assert_that(obj.changed_fields(), equal_to(set()))
+
+    def test_when_field_is_set_then_is_changed(self):
+        obj = ModelWithUser.from_plain_dict({'age': 18})
+        obj.age = 19
+
+        assert_that(obj.changed_fields(), equal_to(set(['age'])))
+        assert_that(obj.to_plain(only_changed=True), equal_to({'age': 19}))
+
+    def test_when_embedded_model_changes_then_returns_its_changes(self):
+        obj = ModelWithUser.from_plain_dict({'age': 18,
+            'user': {'name': 'foo', 'email': 'foo@example.com'}})
+        obj.user.name = u'bar'
+
+        assert_that(obj.changed_fields(), equal_to(set(['user'])))
+        assert_that(obj.to_plain(only_changed=True), equal_to(
+            {'user': {'name': u'bar'}}))
+
+    def test_when_model_in_list_changes_then_returns_the_whole_list(self):
+        obj = ModelWithDates.from_plain_dict({'times': [{'time': '2013'}]})
+        obj.times[0].time = datetime.datetime(2014, 1, 1)
+
+        assert_that(obj.to_plain(only_changed=True), equal_to(
+            {'times': [{'time': '2014'}]}))
+
+    def test_when_clear_changes_then_clears_embedded_models_changes(self):
+        obj = ModelWithUser(age=18, user=User(name=u'foo'))
+
+        obj.clear_changes()
+
+        assert_that(obj.changed_fields(), equal_to(set()))
+        assert_that(obj.user.changed_fields(), equal_to(set()))
+
+
+class TestModelIncrementalValidation(object):
+    def test_when_field_is_not_changed_then_is_not_validated_again(self):
+        obj = self.model(name=u'foo')
+
+        obj.validate()
+        obj.validate()
+
+        assert_that(self.calls, equal_to([u'foo']))
+
+    def test_when_field_is_changed_then_is_validated_again(self):
+        obj = self.model(name=u'foo')
+
+        obj.validate()
+        obj.name = u'bar'
+        obj.validate()
+
+        assert_that(self.calls, equal_to([u'foo', u'bar']))
+
+    def test_when_field_is_changed_to_invalid_value_then_raises(self):
+        user = UserWithRequiredName(name=u'foo')
+
+        user.validate()
+        user.name = None
+
+        with assert_raises_regexp(errors.ValidationError, 'required'):
+            user.validate()
+
+    def test_when_value_is_mutable_then_is_validated_again(self):
+        obj = self.model(tags=[u'foo'])
+
+        obj.validate()
+        obj.tags.append(1)
+
+        with assert_raises_regexp(errors.ValidationError, 'string'):
+            obj.validate()
+
+    def test_when_embedded_model_changes_then_is_validated_again(self):
+        obj = ModelWithUser(user=UserWithRequiredName(name=u'foo'))
+
+        obj.validate()
+        obj.user.name = None
+
+        with assert_raises_regexp(errors.ValidationError, 'required'):
+            obj.validate()
+
+    def test_when_validation_cleared_then_is_validated_again(self):
+        obj = self.model(name=u'foo')
+
+        obj.validate()
+        obj.clear_validation()
+        obj.validate()
+
+        assert_that(self.calls, equal_to([u'foo', u'foo']))
+
+    def test_when_validation_cleared_then_embedded_models_are_validated_again(self):
+        class Owner(models.Model):
+            tagged = fields.EmbeddedField(self.model)
+
+        obj = Owner(tagged=self.model(name=u'foo'))
+
+        obj.validate()
+        obj.clear_validation()
+        obj.validate()
+
+        assert_that(self.calls, equal_to([u'foo', u'foo']))
+
+    def setup(self):
+        calls = self.calls = []
+
+        class Recorder(object):
+            def validate(self, value):
+                calls.append(value)
+
+        class Tagged(models.Model):
+            name = fields.StringField(Recorder())
+            tags = fields.Field(validators.List(validators.String()))
+
+        self.model = Tagged
+
+
 class TestModelToDict(object):
     def test_when_model_has_single_fields_then_returns_dict_with_fields_values(self):
         user = User(name=u'foo', email='roo@example.com')
@@ -178,6 +428,27 @@ class TestModelToPlainDict(object):
             ))
 
 
+    def test_when_model_has_list_of_models_then_returns_list_of_dicts(self):
+        obj = ModelWithDates(times=[AnotherModelWithDate(time=self.now)])
+
+        assert_that(obj.to_plain(), has_entries(
+            times=[{'time': str(self.now.year)}]))
+
+    def test_when_model_has_dict_of_models_then_returns_dict_of_dicts(self):
+        obj = ModelWithDates(by_name={'foo': AnotherModelWithDate(time=self.now)})
+
+        assert_that(obj.to_plain(), has_entries(
+            by_name={'foo': {'time': str(self.now.year)}}))
+
+    def test_when_field_is_not_set_then_returns_default(self):
+        obj = ModelWithDates()
+
+        assert_that(obj.to_plain(), has_entries(times=None, by_name=None))
+
+    def setup(self):
+        self.now = datetime.datetime.utcnow()
+
+
 class TestModelFromPlainDict(object):
 
     def test_user_from_plain_dict(self):
@@ -202,6 +473,361 @@ class TestModelFromPlainDict(object):
         assert_that(obj.user.name, equal_to('joe'))
 
 
+    def test_from_plain_dict_when_embedded_date(self):
+        now = datetime.datetime(2013, 1, 1)
+        obj = ModelWithDate.from_plain_dict(
+            ModelWithDate(time=now, another=AnotherModelWithDate(time=now)).to_plain())
+
+        assert_that(obj.another.time, equal_to(now))
+        obj.validate()
+
+    def test_from_plain_dict_when_list_and_dict_of_models_with_dates(self):
+        now = datetime.datetime(2013, 1, 1)
+        obj = ModelWithDates.from_plain_dict({
+            'times': [{'time': '2013'}],
+            'by_name': {'foo': {'time': '2013'}}})
+
+        assert_that(obj.times[0].time, equal_to(now))
+        assert_that(obj.by_name['foo'].time, equal_to(now))
+        obj.validate()
+
+    def test_from_plain_dict_when_unknown_keys_then_ignores_them(self):
+        user = User.from_plain_dict({'name': 'joe', 'foo': 'bar'})
+
+        assert_that(user.to_plain(), has_entries(name='joe', email=None))
+
+    def test_from_plain_dict_when_field_overrides_set_then_uses_descriptor(self):
+        obj = ModelWithUser.from_plain_dict({'age': '18'})
+
+        assert_that(obj.age, is_(18))
+
+
+class TestModelLazyFields(object):
+    def setup(self):
+        self.plain = {
+            'user': {'name': 'joe', 'email': 'joe@gmail.com'},
+            'times': [{'time': '2013'}],
+            'by_name': {'foo': {'time': '2013'}}}
+
+    def test_when_not_accessed_then_to_plain_returns_original_values(self):
+        obj = LazyModel.from_plain_dict(self.plain)
+
+        result = obj.to_plain()
+
+        assert_that(result['user'], same_instance(self.plain['user']))
+        assert_that(result['times'], same_instance(self.plain['times']))
+        assert_that(result['by_name'], same_instance(self.plain['by_name']))
+
+    def test_when_accessed_then_loads_models(self):
+        obj = LazyModel.from_plain_dict(self.plain)
+
+        assert_that(obj.user, instance_of(User))
+        assert_that(obj.user.name, equal_to('joe'))
+        assert_that(obj.times[0].time, equal_to(datetime.datetime(2013, 1, 1)))
+        assert_that(obj.by_name['foo'], instance_of(AnotherModelWithDate))
+
+    def test_when_accessed_twice_then_loads_once(self):
+        obj = LazyModel.from_plain_dict(self.plain)
+
+        assert_that(obj.user, same_instance(obj.user))
+
+    def test_when_modified_then_to_plain_returns_new_values(self):
+        obj = LazyModel.from_plain_dict(self.plain)
+
+        obj.user.name = 'jack'
+
+        assert_that(obj.to_plain()['user'], has_entries(name='jack'))
+        assert_that(self.plain['user'], has_entries(name='joe'))
+
+    def test_when_not_accessed_then_validates_nested_models(self):
+        obj = LazyModel.from_plain_dict({'user': {'name': 1}})
+
+        assert_raises(errors.ValidationError, obj.validate)
+
+    def test_to_dict_loads_values(self):
+        obj = LazyModel.from_plain_dict(self.plain)
+
+        assert_that(obj.to_dict()['user'], has_entries(name='joe'))
+
+    def test_when_null_then_value_is_none(self):
+        obj = LazyModel.from_plain_dict({'user': None})
+
+        assert_that(obj.user, is_(None))
+
+
+class TestModelPlainPassthrough(object):
+    def setup(self):
+        self.plain = {
+            'times': [{'time': '2013'}],
+            'by_name': {'foo': {'time': '2013'}}}
+
+    def test_when_not_modified_then_to_plain_reuses_original_values(self):
+        obj = ModelWithDates.from_plain_dict(self.plain)
+
+        result = obj.to_plain()
+
+        assert_that(result['times'], same_instance(self.plain['times']))
+        assert_that(result['by_name'], same_instance(self.plain['by_name']))
+
+    def test_when_embedded_model_not_modified_then_reuses_original_value(self):
+        plain = {'age': 18, 'user': {'name': 'joe', 'email': None}}
+        obj = ModelWithUser.from_plain_dict(plain)
+
+        obj.age = 19
+
+        assert_that(obj.to_plain()['user'], same_instance(plain['user']))
+
+    def test_when_item_modified_then_to_plain_returns_new_values(self):
+        obj = ModelWithDates.from_plain_dict(self.plain)
+
+        obj.times[0].time = datetime.datetime(2014, 1, 1)
+
+        result = obj.to_plain()
+        assert_that(result['times'], equal_to([{'time': '2014'}]))
+        assert_that(result['by_name'], same_instance(self.plain['by_name']))
+        assert_that(self.plain['times'], equal_to([{'time': '2013'}]))
+
+    def test_when_item_removed_then_to_plain_returns_new_values(self):
+        obj = ModelWithDates.from_plain_dict(self.plain)
+
+        del obj.by_name['foo']
+
+        assert_that(obj.to_plain()['by_name'], is_(None))
+
+    def test_when_item_replaced_then_to_plain_returns_new_values(self):
+        obj = ModelWithDates.from_plain_dict(self.plain)
+
+        obj.times[0] = AnotherModelWithDate(time=datetime.datetime(2014, 1, 1))
+
+        assert_that(obj.to_plain()['times'], equal_to([{'time': '2014'}]))
+
+    def test_when_embedded_plain_has_unknown_keys_then_raises_field_error(self):
+        plain = {'user': {'name': 'joe', 'email': None, 'foo': 'bar'}}
+
+        with assert_raises_regexp(errors.FieldError, "'User' model has no field 'foo'"):
+            ModelWithUser.from_plain_dict(plain)
+
+    def test_when_list_item_plain_has_unknown_keys_then_raises_field_error(self):
+        plain = {'times': [{'time': '2013'}, {'time': '2013', 'foo': 'bar'}]}
+
+        with assert_raises_regexp(errors.FieldError, "'AnotherModelWithDate' model has no field 'foo'"):
+            ModelWithDates.from_plain_dict(plain)
+
+    def test_when_dict_value_plain_has_unknown_keys_then_raises_field_error(self):
+        plain = {'by_name': {'foo': {'time': '2013', 'foo': 'bar'}}}
+
+        with assert_raises_regexp(errors.FieldError, "'AnotherModelWithDate' model has no field 'foo'"):
+            ModelWithDates.from_plain_dict(plain)
+
+    def test_when_lazy_plain_has_unknown_keys_then_raises_field_error_on_access(self):
+        obj = LazyModel.from_plain_dict({'user': {'name': 'joe', 'foo': 'bar'}})
+
+        with assert_raises_regexp(errors.FieldError, "'User' model has no field 'foo'"):
+            obj.user
+
+    def test_when_embedded_plain_has_missing_keys_then_adds_them(self):
+        plain = {'user': {'name': 'joe'}}
+        obj = ModelWithUser.from_plain_dict(plain)
+
+        assert_that(obj.to_plain()['user'], equal_to(
+            {'name': 'joe', 'email': None}))
+
+    def test_when_changes_cleared_then_compares_values(self):
+        obj = ModelWithDates.from_plain_dict(self.plain)
+
+        obj.times[0].time = datetime.datetime(2014, 1, 1)
+        obj.clear_changes()
+
+        assert_that(obj.to_plain()['times'], equal_to([{'time': '2014'}]))
+
+    def test_when_item_appended_then_to_plain_returns_new_values(self):
+        obj = ModelWithDates.from_plain_dict(self.plain)
+
+        obj.times.append(AnotherModelWithDate(
+            time=datetime.datetime(2014, 1, 1)))
+
+        assert_that(obj.to_plain()['times'], equal_to(
+            [{'time': '2013'}, {'time': '2014'}]))
+
+    def test_when_item_added_then_to_plain_returns_new_values(self):
+        obj = ModelWithDates.from_plain_dict(self.plain)
+
+        obj.by_name['bar'] = AnotherModelWithDate(
+            time=datetime.datetime(2014, 1, 1))
+
+        assert_that(obj.to_plain()['by_name'], equal_to(
+            {'foo': {'time': '2013'}, 'bar': {'time': '2014'}}))
+
+    def test_when_deeply_nested_model_modified_then_rebuilds_its_parents(self):
+        plain = {'dates': [{'time': '2013', 'another': {'time': '2013'}}]}
+        obj = ModelWithNestedDates.from_plain_dict(plain)
+
+        obj.dates[0].another.time = datetime.datetime(2014, 1, 1)
+
+        assert_that(obj.to_plain()['dates'], equal_to(
+            [{'time': '2013', 'another': {'time': '2014'}}]))
+
+    def test_when_lazy_item_modified_then_to_plain_returns_new_values(self):
+        obj = LazyModel.from_plain_dict(self.plain)
+
+        obj.times[0].time = datetime.datetime(2014, 1, 1)
+
+        assert_that(obj.to_plain()['times'], equal_to([{'time': '2014'}]))
+        assert_that(obj.to_plain()['by_name'],
+            same_instance(self.plain['by_name']))
+
+    def test_when_embedded_value_coerced_then_returns_coerced_value(self):
+        plain = {'users': [{'user': None, 'age': '18'}]}
+        obj = ModelWithUsers.from_plain_dict(plain)
+
+        assert_that(obj.to_plain()['users'], equal_to(
+            [{'user': None, 'age': 18}]))
+
+    def test_when_other_field_modified_then_skips_unmodified_values(self):
+        plain = {'age': 18, 'dates': [{'time': '2013'}] * 100}
+        obj = ModelWithCountedDates.from_plain_dict(plain)
+        CountingDateTimeField.calls = 0
+
+        obj.age = 19
+        result = obj.to_plain()
+
+        assert_that(result['dates'], same_instance(plain['dates']))
+        assert_that(CountingDateTimeField.calls, equal_to(0))
+
+    def test_when_pickled_then_loaded_lists_are_plain_lists(self):
+        obj = ModelWithDates.from_plain_dict(self.plain)
+
+        result = pickle.loads(pickle.dumps(obj))
+
+        assert_that(type(result.times), same_instance(list))
+        assert_that(result.to_plain(), equal_to(self.plain))
+
+
+class TestModelBatches(object):
+    def test_from_plain_many_returns_models_in_input_order(self):
+        users = User.from_plain_many([{'name': 'foo'}, {'name': 'bar'}])
+
+        assert_that([user.name for user in users], equal_to(['foo', 'bar']))
+        assert_that(users[0], instance_of(User))
+
+    def test_from_plain_many_accepts_any_iterable(self):
+        users = User.from_plain_many({'name': name} for name in 'ab')
+
+        assert_that(users, has_length(2))
+
+    def test_validate_many_returns_errors_of_all_invalid_records(self):
+        result = UserWithRequiredName.validate_many([
+            UserWithRequiredName(),
+            UserWithRequiredName(name=u'foo'),
+            {'email': u'foo@example.com'}])
+
+        assert_that([index for index, _ in result], equal_to([0, 2]))
+        assert_that(result[0][1], instance_of(errors.ValidationError))
+
+    def test_validate_many_when_record_fails_to_load_then_returns_error(self):
+        result = ModelWithUser.validate_many([{'age': 'foo'}, {'age': 1}])
+
+        assert_that([index for index, _ in result], equal_to([0]))
+
+    def test_validate_many_when_all_records_are_valid_then_returns_empty_list(self):
+        assert_that(User.validate_many([User(), {'name': 'foo'}]), equal_to([]))
+
+    def test_to_plain_many_returns_plain_dicts_in_input_order(self):
+        result = User.to_plain_many([User(name=u'foo'), User(name=u'bar')])
+
+        assert_that(result, equal_to([
+            {'name': u'foo', 'email': None},
+            {'name': u'bar', 'email': None}]))
+
+
+class TestModelPacking(object):
+    def test_when_flat_model_then_derives_struct_layout(self):
+        layout = Sample._struct_layout
+
+        assert_that(layout.names, equal_to(('active', 'count', 'score')))
+        assert_that(layout.size, equal_to(1 + 1 + 8 + 8))
+
+    def test_when_not_flat_model_then_has_no_struct_layout(self):
+        assert_that(User._struct_layout, is_(None))
+
+    def test_round_trips_values(self):
+        sample = Sample(count=-3, score=0.25, active=True)
+
+        result = Sample.unpack(sample.pack())
+
+        assert_that(result.to_plain(), equal_to(sample.to_plain()))
+
+    def test_round_trips_none_values(self):
+        sample = Sample(count=None, score=0.25)
+
+        result = Sample.unpack(sample.pack())
+
+        assert_that(result.count, is_(None))
+        assert_that(result.active, is_(None))
+
+    def test_unpack_from_offset(self):
+        data = 'xx' + Sample(count=3).pack()
+
+        assert_that(Sample.unpack(bytearray(data), 2).count, equal_to(3))
+
+    def test_unpacked_model_has_no_changes(self):
+        result = Sample.unpack(Sample(count=3).pack())
+
+        assert_that(result.changed_fields(), equal_to(set()))
+
+    def test_pack_many_and_unpack_many_round_trip_records(self):
+        samples = [Sample(count=i, score=i / 2.0, active=i % 2 == 0)
+            for i in range(5)]
+
+        data = Sample.pack_many(samples)
+        result = Sample.unpack_many(memoryview(data))
+
+        assert_that(len(data), equal_to(5 * Sample._struct_layout.size))
+        assert_that([sample.to_plain() for sample in result],
+            equal_to([sample.to_plain() for sample in samples]))
+
+    def test_unpack_many_with_offset_and_count(self):
+        data = Sample.pack_many(Sample(count=i) for i in range(5))
+
+        result = Sample.unpack_many(data, Sample._struct_layout.size, 2)
+
+        assert_that([sample.count for sample in result], equal_to([1, 2]))
+
+    def test_when_value_doesnt_fit_then_raises_booby_error(self):
+        with assert_raises_regexp(errors.BoobyError, "'Sample'"):
+            Sample(count=2 ** 64).pack()
+
+    def test_when_not_flat_model_then_raises_booby_error(self):
+        with assert_raises_regexp(errors.BoobyError, 'struct format'):
+            User().pack()
+
+
+class TestModelPickling(object):
+    def test_round_trips_values_and_changes(self):
+        user = ModelWithUser.from_plain_dict({'age': 18, 'user': {'name': 'foo'}})
+        user.age = 19
+
+        result = pickle.loads(pickle.dumps(user))
+
+        assert_that(result.to_plain(), equal_to(user.to_plain()))
+        assert_that(result.changed_fields(), equal_to(set(['age'])))
+        result.validate()
+
+    def test_round_trips_compact_models_with_every_protocol(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            result = pickle.loads(pickle.dumps(Point3D(x=1, z=3), protocol))
+
+            assert_that(result.to_plain(), equal_to({'x': 1, 'y': None, 'z': 3}))
+
+    def test_round_trips_lazy_values_without_loading_them(self):
+        obj = LazyModel.from_plain_dict({'user': {'name': 'foo'}})
+
+        result = pickle.loads(pickle.dumps(obj))
+
+        assert_that(result._data[LazyModel.user], instance_of(LazyValue))
+        assert_that(result.user.name, equal_to('foo'))
+
+
 class TestModelToJSON(object):
     def test_when_model_has_single_fields_then_returns_json_with_fields_values(self):
         user = User(name=u'Jack', email=u'jack@example.com')
@@ -242,3 +868,54 @@ class ModelWithDate(models.Model):
 class ModelWithUser(models.Model):
     user = fields.EmbeddedField(User)
     age = fields.IntegerField()
+
+
+class ModelWithDates(models.Model):
+    times = fields.ListField(AnotherModelWithDate)
+    by_name = fields.DictField(value=AnotherModelWithDate)
+
+
+class ModelWithNestedDates(models.Model):
+    dates = fields.ListField(ModelWithDate)
+
+
+class ModelWithUsers(models.Model):
+    users = fields.ListField(ModelWithUser)
+
+
+class CountingDateTimeField(fields.DateTimeField):
+    calls = 0
+
+    def to_plain(self, value):
+        CountingDateTimeField.calls += 1
+        return super(CountingDateTimeField, self).to_plain(value)
+
+
+class DateWithCount(models.Model):
+    time = CountingDateTimeField(format='%Y')
+
+
+class ModelWithCountedDates(models.Model):
+    age = fields.IntegerField()
+    dates = fields.ListField(DateWithCount)
+
+
+class Point(models.CompactModel):
+    x = fields.IntegerField()
+    y = fields.IntegerField()
+
+
+class Point3D(Point):
+    z = fields.IntegerField()
+
+
+class LazyModel(models.Model):
+    user = fields.EmbeddedField(User, lazy=True)
+    times = fields.ListField(AnotherModelWithDate, lazy=True)
+    by_name = fields.DictField(value=AnotherModelWithDate, lazy=True)
+
+
+class Sample(models.Model):
+    count = fields.IntegerField()
+    score = fields.FloatField()
+    active = fields.BooleanField()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing.pool
+import threading
+
+from hamcrest import *
+from nose.tools import assert_raises, assert_raises_regexp
+
+from booby import errors, fields, models, parallel
+
+
+class TestParallelLoad(object):
+    def setup(self):
+        self.records = [{'name': 'user{}'.format(i), 'karma': i}
+            for i in range(25)]
+        self.records[3] = {'name': 3}
+        self.records[7] = {'karma': 'foo'}
+
+    def test_when_processes_then_loads_models_in_order(self):
+        self.assert_loads(executor='process')
+
+    def test_when_threads_then_loads_models_in_order(self):
+        self.assert_loads(executor='thread')
+
+    def test_when_single_worker_then_loads_models_in_order(self):
+        self.assert_loads(workers=1)
+
+    def assert_loads(self, **kwargs):
+        users, failed = parallel.parallel_load(User, self.records,
+            workers=kwargs.pop('workers', 2), chunk_size=4, **kwargs)
+
+        assert_that(len(users), equal_to(25))
+        assert_that(users[10], instance_of(User))
+        assert_that(users[10].name, equal_to('user10'))
+        assert_that(users[7], is_(None))
+        assert_that([index for index, _ in failed], equal_to([3, 7]))
+        assert_that(failed[0][1], instance_of(errors.ValidationError))
+
+    def test_when_not_validate_then_returns_load_errors_only(self):
+        users, failed = parallel.parallel_load(User, self.records,
+            workers=2, executor='thread', validate=False)
+
+        assert_that([index for index, _ in failed], equal_to([7]))
+
+    def test_when_plain_then_returns_plain_dicts(self):
+        users, _ = parallel.parallel_load(User, self.records[:2], workers=2,
+            plain=True)
+
+        assert_that(users, equal_to([{'name': 'user0', 'karma': 0},
+            {'name': 'user1', 'karma': 1}]))
+
+    def test_when_loaded_in_processes_then_models_keep_working(self):
+        users, _ = parallel.parallel_load(User, self.records[:2], workers=2)
+
+        users[0].karma = 10
+
+        assert_that(users[0].changed_fields(), equal_to(set(['karma'])))
+        assert_that(users[0].to_plain(), has_entries(karma=10))
+
+    def test_when_no_records_then_returns_empty_lists(self):
+        assert_that(parallel.parallel_load(User, [], workers=2),
+            equal_to(([], [])))
+
+    def test_when_unknown_executor_then_raises_value_error(self):
+        with assert_raises(ValueError):
+            parallel.parallel_load(User, [], executor='foo')
+
+
+class TestIterLoad(object):
+    def setup(self):
+        self.records = [{'name': 'user{}'.format(i), 'karma': i}
+            for i in range(10)]
+        self.records[5] = {'karma': 'foo'}
+
+    def test_yields_every_chunk_in_order(self):
+        chunks = list(parallel.iter_load(User, self.records, chunk_size=4))
+
+        assert_that([len(users) for users, _ in chunks], equal_to([4, 4, 2]))
+        assert_that(chunks[1][1][0][0], equal_to(5))
+        assert_that(chunks[2][0][1].name, equal_to('user9'))
+
+    def test_loads_chunks_only_when_resumed(self):
+        records = self.consumed(self.records)
+
+        chunks = parallel.iter_load(User, records, chunk_size=4)
+        next(chunks)
+
+        assert_that(self.count, equal_to(4))
+
+    def test_when_pool_then_reads_max_pending_chunks_ahead(self):
+        records = self.consumed(self.records)
+        pool = multiprocessing.pool.ThreadPool(2)
+
+        try:
+            chunks = parallel.iter_load(User, records, chunk_size=2,
+                pool=pool, max_pending=2)
+            users, _ = next(chunks).get()
+
+            assert_that(self.count, equal_to(6))
+            assert_that([user.name for user in users],
+                equal_to(['user0', 'user1']))
+            assert_that(len(list(chunks)), equal_to(4))
+        finally:
+            pool.close()
+            pool.join()
+
+    def test_when_max_pending_is_one_then_reads_one_chunk_ahead(self):
+        records = self.consumed(self.records)
+        pool = multiprocessing.pool.ThreadPool(2)
+
+        try:
+            chunks = parallel.iter_load(User, records, chunk_size=2,
+                pool=pool, max_pending=1)
+            next(chunks).get()
+
+            assert_that(self.count, equal_to(4))
+        finally:
+            pool.close()
+            pool.join()
+
+    def test_when_max_pending_is_lower_than_one_then_raises_value_error(self):
+        with assert_raises_regexp(ValueError, 'max_pending'):
+            parallel.iter_load(User, self.records, max_pending=0)
+
+    def test_when_pool_then_yields_results_without_waiting_for_them(self):
+        pool = multiprocessing.pool.ThreadPool(1)
+        event = threading.Event()
+
+        try:
+            pool.apply_async(event.wait)
+            result = next(parallel.iter_load(User, self.records,
+                chunk_size=4, pool=pool, max_pending=1))
+
+            assert_that(result.ready(), is_(False))
+
+            event.set()
+            users, _ = result.get()
+
+            assert_that([user.name for user in users],
+                equal_to(['user0', 'user1', 'user2', 'user3']))
+        finally:
+            event.set()
+            pool.close()
+            pool.join()
+
+    def consumed(self, records):
+        self.count = 0
+        for record in records:
+            self.count += 1
+            yield record
+
+
+class User(models.Model):
+    name = fields.StringField()
+    karma = fields.IntegerField()
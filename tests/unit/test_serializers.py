@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import json
+from io import BytesIO
+
+from hamcrest import *
+from nose.tools import assert_raises_regexp
+
+from booby import errors, fields, models, serializers
+
+
+class TestBackendsRegistry(object):
+    def test_json_backend_is_always_available(self):
+        assert_that(serializers.available_backends(), has_item('json'))
+
+    def test_when_no_name_then_returns_default_backend(self):
+        assert_that(serializers.get_backend(),
+            instance_of(serializers.JSONBackend))
+
+    def test_when_backend_then_returns_it(self):
+        backend = serializers.JSONBackend(json.dumps, json.loads)
+
+        assert_that(serializers.get_backend(backend), same_instance(backend))
+
+    def test_when_unknown_name_then_raises_booby_error(self):
+        with assert_raises_regexp(errors.BoobyError, "'foo'"):
+            serializers.get_backend('foo')
+
+    def test_when_unknown_default_then_raises_booby_error(self):
+        with assert_raises_regexp(errors.BoobyError, "'foo'"):
+            serializers.set_default_backend('foo')
+
+    def test_when_text_backend_then_dumps_bytes_encodes_as_utf8(self):
+        backend = serializers.JSONBackend(
+            lambda value: json.dumps(value, ensure_ascii=False), json.loads)
+
+        assert_that(backend.dumps_bytes({'name': u'f\xf6o'}),
+            equal_to(b'{"name": "f\xc3\xb6o"}'))
+
+    def test_every_available_backend_round_trips_plain_values(self):
+        plain = {'name': u'f\xf6o', 'karma': 1, 'score': 0.5,
+            'active': True, 'tags': ['a', None]}
+
+        for name in serializers.available_backends():
+            backend = serializers.get_backend(name)
+
+            assert_that(backend.loads(backend.dumps(plain)), equal_to(plain))
+            assert_that(backend.loads(backend.dumps_bytes(plain)),
+                equal_to(plain))
+
+
+class TestModelJSONBackends(object):
+    def setup(self):
+        self.default = serializers.get_backend()
+        self.calls = []
+        serializers.register_backend('tracked', serializers.JSONBackend(
+            self.tracked(json.dumps), self.tracked(json.loads)))
+
+    def teardown(self):
+        del serializers._backends['tracked']
+        serializers._default = self.default
+
+    def tracked(self, function):
+        def wrapper(value):
+            self.calls.append(function.__name__)
+            return function(value)
+        return wrapper
+
+    def test_when_default_backend_set_then_models_use_it(self):
+        serializers.set_default_backend('tracked')
+
+        User(name='foo').to_json()
+
+        assert_that(self.calls, equal_to(['dumps']))
+
+    def test_when_class_backend_then_to_json_uses_it(self):
+        result = TrackedUser(name='foo').to_json()
+
+        assert_that(json.loads(result), equal_to({'name': 'foo'}))
+        assert_that(self.calls, equal_to(['dumps']))
+
+    def test_when_class_backend_then_from_json_uses_it(self):
+        user = TrackedUser.from_json('{"name": "foo"}')
+
+        assert_that(user.name, equal_to('foo'))
+        assert_that(self.calls, equal_to(['loads']))
+
+    def test_when_class_backend_then_subclasses_use_it(self):
+        TrackedUserWithEmail(name='foo').to_json()
+
+        assert_that(self.calls, equal_to(['dumps']))
+
+    def test_to_json_bytes_returns_utf8_bytes(self):
+        result = User(name=u'f\xf6o').to_json_bytes()
+
+        assert_that(result, instance_of(bytes))
+        assert_that(json.loads(result.decode('utf-8')),
+            equal_to({'name': u'f\xf6o'}))
+
+    def test_from_json_loads_utf8_bytes(self):
+        user = User.from_json(b'{"name": "f\xc3\xb6o"}')
+
+        assert_that(user.name, equal_to(u'f\xf6o'))
+
+    def test_dump_many_uses_given_backend(self):
+        models.dump_many([User(name='foo')], BytesIO(), backend='tracked')
+
+        assert_that(self.calls, equal_to(['dumps']))
+
+
+class User(models.Model):
+    name = fields.StringField()
+
+
+class TrackedUser(models.Model):
+    json_backend = 'tracked'
+
+    name = fields.StringField()
+
+
+class TrackedUserWithEmail(TrackedUser):
+    email = fields.StringField()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+
+from hamcrest import *
+from nose.plugins.skip import SkipTest
+from nose.tools import assert_raises, assert_raises_regexp
+
+from booby import errors, fields, models, store
+
+
+class TestModelStore(object):
+    def setup(self):
+        self.points = [Point(x=i, y=i / 2.0, visible=i % 2 == 0)
+            for i in range(10)]
+        self.points[3].x = None
+        self.path = self.write(Point, self.points)
+        self.store = store.ModelStore(Point, self.path)
+
+    def teardown(self):
+        self.store.close()
+        os.remove(self.path)
+
+    def write(self, model, records, header=None):
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as fileobj:
+            if header is None:
+                store.write(model, fileobj, records, chunk_size=3)
+            else:
+                fileobj.write(header)
+        return path
+
+    def test_length_is_number_of_records(self):
+        assert_that(len(self.store), equal_to(10))
+
+    def test_items_are_model_views(self):
+        point = self.store[5]
+
+        assert_that(point, instance_of(Point))
+        assert_that(point.to_plain(), equal_to(self.points[5].to_plain()))
+
+    def test_when_none_value_then_view_returns_none(self):
+        assert_that(self.store[3].x, is_(None))
+
+    def test_negative_index_counts_from_the_end(self):
+        assert_that(self.store[-1].x, equal_to(9))
+
+    def test_when_index_out_of_range_then_raises_index_error(self):
+        with assert_raises(IndexError):
+            self.store[10]
+
+    def test_views_are_read_only(self):
+        with assert_raises_regexp(errors.BoobyError, 'read-only'):
+            self.store[0].x = 1
+
+    def test_views_can_be_validated(self):
+        self.store[0].validate()
+
+    def test_iteration_yields_all_records(self):
+        assert_that([point.x for point in self.store],
+            equal_to([point.x for point in self.points]))
+
+    def test_load_returns_writable_models(self):
+        points = self.store.load(2, 4)
+
+        points[0].x = 20
+
+        assert_that([point.x for point in points], equal_to([20, None]))
+
+    def test_column_returns_field_values(self):
+        assert_that(self.store.column('y').tolist(),
+            equal_to([point.y for point in self.points]))
+        assert_that(self.store.column('x')[3], equal_to(0))
+
+    def test_to_numpy_returns_field_values(self):
+        if store.numpy is None:
+            raise SkipTest('numpy is not installed')
+
+        result = self.store.to_numpy('visible')
+
+        assert_that(result.tolist(),
+            equal_to([point.visible for point in self.points]))
+
+    def test_when_unknown_column_then_raises_field_error(self):
+        with assert_raises(errors.FieldError):
+            self.store.column('z')
+
+    def test_when_store_of_other_model_then_raises_decode_error(self):
+        with assert_raises_regexp(errors.DecodeError, "'Point3D'"):
+            store.ModelStore(Point3D, self.path)
+
+    def test_when_not_a_store_then_raises_decode_error(self):
+        path = self.write(Point, (), header='foo bar baz')
+
+        try:
+            with assert_raises_regexp(errors.DecodeError, 'not a model'):
+                store.ModelStore(Point, path)
+        finally:
+            os.remove(path)
+
+    def test_when_empty_file_then_raises_decode_error(self):
+        path = self.write(Point, (), header='')
+
+        try:
+            with assert_raises(errors.DecodeError):
+                store.ModelStore(Point, path)
+        finally:
+            os.remove(path)
+
+    def test_when_truncated_record_then_raises_decode_error(self):
+        with open(self.path, 'rb') as fileobj:
+            data = fileobj.read()
+        path = self.write(Point, (), header=data[:-1])
+
+        try:
+            with assert_raises_regexp(errors.DecodeError, 'truncated'):
+                store.ModelStore(Point, path)
+        finally:
+            os.remove(path)
+
+
+class Point(models.Model):
+    x = fields.IntegerField()
+    y = fields.FloatField()
+    visible = fields.BooleanField()
+
+
+class Point3D(Point):
+    z = fields.IntegerField()
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+from io import BytesIO
+
+from hamcrest import *
+from nose.tools import assert_raises, assert_raises_regexp
+
+from booby import errors, fields, models, streams
+
+
+class TestIterJSONValues(object):
+    def test_when_json_lines_then_yields_every_line(self):
+        values = self.values('{"name": "foo"}\n{"name": "bar"}\n')
+
+        assert_that(values, equal_to([{'name': 'foo'}, {'name': 'bar'}]))
+
+    def test_when_json_array_then_yields_every_item(self):
+        values = self.values(' [{"name": "foo"} , {"name": "bar"}] ')
+
+        assert_that(values, equal_to([{'name': 'foo'}, {'name': 'bar'}]))
+
+    def test_when_empty_json_array_then_yields_nothing(self):
+        assert_that(self.values('[ ]'), equal_to([]))
+
+    def test_when_empty_document_then_yields_nothing(self):
+        assert_that(self.values('\n'), equal_to([]))
+
+    def test_when_values_cross_chunk_boundaries_then_yields_whole_values(self):
+        document = '[{"name": "f\xc3\xb6o", "n": 12345}, 678, "bar"]'
+
+        for chunk_size in (1, 2, 3, 7):
+            assert_that(self.values(document, chunk_size), equal_to(
+                [{'name': u'f\xf6o', 'n': 12345}, 678, 'bar']))
+
+    def test_when_json_lines_end_with_number_then_yields_whole_number(self):
+        assert_that(self.values('1\n23', chunk_size=3), equal_to([1, 23]))
+
+    def test_when_number_fraction_crosses_chunks_then_yields_whole_number(self):
+        assert_that(self.values('[-0.5, 1e3]', chunk_size=3),
+            equal_to([-0.5, 1000.0]))
+
+    def test_when_array_is_not_closed_then_raises_value_error(self):
+        with assert_raises(ValueError):
+            self.values('[1, 2')
+
+    def test_when_array_items_are_not_delimited_then_raises_value_error(self):
+        with assert_raises_regexp(ValueError, 'delimiter'):
+            self.values('[1 2]')
+
+    def test_when_invalid_json_then_raises_value_error(self):
+        with assert_raises(ValueError):
+            self.values('{"name": }')
+
+    def test_when_invalid_record_then_raises_without_reading_the_rest(self):
+        fileobj = ReadCountingFile('{bad}\n' + '{"name": "foo"}\n' * 1000)
+
+        with assert_raises(ValueError):
+            list(streams.iter_json_values(fileobj, chunk_size=16))
+
+        assert_that(fileobj.reads, less_than(3))
+
+    def test_when_invalid_array_item_then_raises_without_reading_the_rest(self):
+        fileobj = ReadCountingFile('[1, tru, ' + '2, ' * 1000 + '3]')
+
+        with assert_raises(ValueError):
+            list(streams.iter_json_values(fileobj, chunk_size=16))
+
+        assert_that(fileobj.reads, less_than(3))
+
+    def test_when_truncated_literal_crosses_chunks_then_yields_value(self):
+        assert_that(self.values('[1, true, "a b c"]', chunk_size=6),
+            equal_to([1, True, 'a b c']))
+
+    def values(self, document, chunk_size=streams.DEFAULT_CHUNK_SIZE):
+        return list(streams.iter_json_values(BytesIO(document), chunk_size))
+
+
+class TestModelIterJSON(object):
+    def test_yields_models_in_document_order(self):
+        users = User.iter_json(BytesIO('[{"name": "foo"}, {"name": "bar"}]'))
+
+        assert_that([user.name for user in users], equal_to(['foo', 'bar']))
+
+    def test_is_lazy(self):
+        users = User.iter_json(BytesIO('{"name": "foo"}\n{"name": '))
+
+        assert_that(next(users).name, is_('foo'))
+
+    def test_when_validate_and_invalid_record_then_raises_validation_error(self):
+        users = User.iter_json(BytesIO('{"name": "foo"}\n{"name": 1}'),
+            validate=True)
+
+        assert_that(next(users).name, is_('foo'))
+        with assert_raises_regexp(errors.ValidationError, 'should be a string'):
+            next(users)
+
+
+class TestWriteJSONValues(object):
+    def test_when_ndjson_then_writes_one_value_per_line(self):
+        self.write([{'a': 1}, [2], 3])
+
+        assert_that(self.fileobj.getvalue(), is_('{"a": 1}\n[2]\n3\n'))
+
+    def test_when_array_then_writes_json_array(self):
+        self.write([{'a': 1}, [2], 3], format='array')
+
+        assert_that(self.fileobj.getvalue(), is_('[{"a": 1}, [2], 3]'))
+
+    def test_when_array_and_no_values_then_writes_empty_array(self):
+        self.write([], format='array')
+
+        assert_that(self.fileobj.getvalue(), is_('[]'))
+
+    def test_when_ndjson_and_no_values_then_writes_nothing(self):
+        self.write([])
+
+        assert_that(self.fileobj.getvalue(), is_(''))
+
+    def test_writes_in_chunks_of_given_size(self):
+        self.write(range(5), format='array', chunk_size=2)
+
+        assert_that(self.fileobj.writes, equal_to(
+            ['[', '0, 1', ', ', '2, 3', ', ', '4', ']']))
+
+    def test_returns_number_of_written_values(self):
+        assert_that(self.write(iter(range(3))), is_(3))
+
+    def test_when_invalid_format_then_raises_value_error(self):
+        with assert_raises_regexp(ValueError, 'format'):
+            self.write([], format='xml')
+
+    def test_written_values_can_be_read_back(self):
+        for format in streams.FORMATS:
+            self.setup()
+            self.write(range(3), format=format, chunk_size=2)
+
+            assert_that(list(streams.iter_json_values(
+                BytesIO(self.fileobj.getvalue()))), equal_to([0, 1, 2]))
+
+    def write(self, values, **kwargs):
+        return streams.write_json_values(values, self.fileobj, **kwargs)
+
+    def setup(self):
+        self.fileobj = RecordingFile()
+
+
+class TestDumpMany(object):
+    def test_writes_models_as_json_lines(self):
+        fileobj = BytesIO()
+
+        models.dump_many([User(name=u'foo'), User(name=u'bar')], fileobj)
+
+        users = list(User.iter_json(BytesIO(fileobj.getvalue())))
+        assert_that([user.name for user in users], equal_to(['foo', 'bar']))
+
+    def test_when_array_then_writes_models_as_json_array(self):
+        fileobj = BytesIO()
+
+        count = models.dump_many((User(name=name) for name in u'ab'),
+            fileobj, format='array', chunk_size=1)
+
+        assert_that(count, is_(2))
+        assert_that(fileobj.getvalue(), is_(
+            '[{"name": "a"}, {"name": "b"}]'))
+
+
+class ReadCountingFile(BytesIO):
+    def __init__(self, data):
+        BytesIO.__init__(self, data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return BytesIO.read(self, size)
+
+
+class RecordingFile(BytesIO):
+    def __init__(self):
+        BytesIO.__init__(self)
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(data)
+        return BytesIO.write(self, data)
+
+
+class User(models.Model):
+    name = fields.StringField()
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import array
+
+from hamcrest import *
 from doublex import Mimic, Stub
+from nose.plugins.skip import SkipTest
 from nose.tools import assert_raises, assert_raises_regexp
 
 from booby import validators, fields, models, errors
@@ -224,6 +228,163 @@ class TestEmail(StringMixin):
         self.validator = validators.Email()
 
 
+class TestSharedValidators(object):
+    def test_when_same_class_then_returns_same_instance(self):
+        assert_that(validators.shared(validators.String),
+            same_instance(validators.shared(validators.String)))
+
+    def test_when_equal_arguments_then_returns_same_instance(self):
+        assert_that(validators.shared(validators.Min, 2),
+            same_instance(validators.shared(validators.Min, 2)))
+
+    def test_when_arguments_of_other_types_then_returns_other_instance(self):
+        validator = validators.shared(validators.Min, 1.0)
+
+        assert_that(validator,
+            is_not(same_instance(validators.shared(validators.Min, 1))))
+        assert_that(validator.min_value, instance_of(float))
+
+    def test_when_list_arguments_then_copies_them(self):
+        choices = ['foo', 'bar']
+        validator = validators.shared(validators.In, choices)
+
+        choices.append('baz')
+
+        assert_that(validator.choices, equal_to(['foo', 'bar']))
+        assert_that(validator, same_instance(
+            validators.shared(validators.In, ['foo', 'bar'])))
+        assert_that(validator, is_not(same_instance(
+            validators.shared(validators.In, ('foo', 'bar')))))
+
+    def test_when_list_items_of_other_types_then_returns_other_instance(self):
+        validator = validators.shared(validators.In, [1.0, 2.0])
+
+        assert_that(validator, is_not(same_instance(
+            validators.shared(validators.In, [1, 2]))))
+        assert_that(validator.choices[0], instance_of(float))
+
+    def test_when_tuple_items_of_other_types_then_returns_other_instance(self):
+        validator = validators.shared(validators.In, (1.0, 2.0))
+
+        assert_that(validator, is_not(same_instance(
+            validators.shared(validators.In, (1, 2)))))
+
+    def test_when_unhashable_arguments_then_returns_new_instance(self):
+        choices = [{'foo': 1}]
+
+        assert_that(validators.shared(validators.In, choices),
+            is_not(same_instance(validators.shared(validators.In, choices))))
+
+    def test_fields_share_builtin_validators(self):
+        first = fields.IntegerField(required=True, max_value=10)
+        second = fields.IntegerField(required=True, max_value=10)
+
+        for validator, other in zip(first.validators, second.validators):
+            assert_that(validator, same_instance(other))
+
+    def test_email_validators_share_pattern(self):
+        assert_that(validators.Email().pattern,
+            same_instance(validators.EMAIL_PATTERN))
+
+
+class TestValidatorsRegistry(object):
+    def test_builtin_validators_are_registered(self):
+        assert_that(validators.registered(), has_items(validators.String,
+            validators.Integer, validators.Email, validators.List))
+
+    def test_when_instance_of_registered_class_then_is_registered(self):
+        assert_that(validators.is_registered(validators.Email()), is_(True))
+
+    def test_when_class_then_is_not_registered(self):
+        assert_that(validators.is_registered(validators.Email), is_(False))
+
+    def test_register_returns_the_class(self):
+        class Custom(object):
+            pass
+
+        assert_that(validators.register(Custom), same_instance(Custom))
+        assert_that(validators.is_registered(Custom()), is_(True))
+
+
+class TestValidateMany(object):
+    def test_required_returns_indexes_of_none_values(self):
+        assert_that(validators.Required().validate_many([1, None, 0, None]),
+            equal_to([(1, 'is required'), (3, 'is required')]))
+
+    def test_in_returns_indexes_of_values_not_in_choices(self):
+        validator = validators.In(['foo', 'bar'])
+
+        assert_that(validator.validate_many(['foo', 'baz', None, ['foo']]),
+            equal_to([(1, "should be in ['foo', 'bar']"),
+                (2, "should be in ['foo', 'bar']"),
+                (3, "should be in ['foo', 'bar']")]))
+
+    def test_string_returns_indexes_of_not_string_not_none_values(self):
+        assert_that(validators.String().validate_many(['foo', 1, None, u'bar']),
+            equal_to([(1, 'should be a string')]))
+
+    def test_integer_returns_indexes_of_not_integer_values(self):
+        assert_that(validators.Integer().validate_many([1, 'foo', None, 2.0]),
+            equal_to([(1, 'should be an integer'), (3, 'should be an integer')]))
+
+    def test_integer_when_integer_array_then_returns_empty_list(self):
+        assert_that(validators.Integer().validate_many(array.array('l', [1, 2])),
+            equal_to([]))
+
+    def test_float_returns_indexes_of_not_float_values(self):
+        assert_that(validators.Float().validate_many([1.0, 1, None]),
+            equal_to([(1, 'should be a float')]))
+
+    def test_float_when_float_array_then_returns_empty_list(self):
+        assert_that(validators.Float().validate_many(array.array('d', [1])),
+            equal_to([]))
+
+    def test_boolean_returns_indexes_of_not_boolean_values(self):
+        assert_that(validators.Boolean().validate_many([True, 1, None]),
+            equal_to([(1, 'should be a boolean')]))
+
+    def test_min_returns_indexes_of_lower_values(self):
+        assert_that(validators.Min(2).validate_many([1, 2, None, 3, 0]),
+            equal_to([(0, 'Should be more than or equal to value 2'),
+                (4, 'Should be more than or equal to value 2')]))
+
+    def test_max_returns_indexes_of_greater_values(self):
+        assert_that(validators.Max(2).validate_many(array.array('l', [1, 2, 3])),
+            equal_to([(2, 'Should be less than or equal to value 2')]))
+
+    def test_min_and_max_when_numpy_array_then_returns_same_indexes(self):
+        numpy = self.numpy()
+        values = [1, 5, 2, 7]
+
+        for validator in (validators.Min(2), validators.Max(4)):
+            assert_that(validator.validate_many(numpy.array(values)),
+                equal_to(validator.validate_many(values)))
+
+    def test_integer_when_numpy_integer_array_then_returns_empty_list(self):
+        numpy = self.numpy()
+
+        assert_that(validators.Integer().validate_many(numpy.arange(3)),
+            equal_to([]))
+
+    def test_email_returns_indexes_and_messages_of_invalid_values(self):
+        assert_that(validators.Email().validate_many(
+            ['foo@example.com', 'foo@example', 1, None]),
+            equal_to([(1, 'should be a valid email'), (2, 'should be a string')]))
+
+    def test_when_validator_without_validate_many_then_validates_each_value(self):
+        assert_that(validators.validate_many(validators.DateTime(),
+            [None, 'foo']), equal_to([(1, 'should be a datetime')]))
+
+    def test_when_validator_has_validate_many_then_uses_it(self):
+        assert_that(validators.validate_many(validators.Integer(), ['foo']),
+            equal_to([(0, 'should be an integer')]))
+
+    def numpy(self):
+        if validators.numpy is None:
+            raise SkipTest('numpy is not installed')
+        return validators.numpy
+
+
 class User(models.Model):
     name = fields.StringField()
 